@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+# Seuil de proximité pour le mode "time" (secondes) - fenêtre DRS
+TIME_GAP_THRESHOLD = 1.0
+
+
+def build_lap_matrix(laps: pd.DataFrame, column: str, drivers: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Construit une matrice pilotes × tours pour une colonne des laps.
+
+    Les tours manquants valent NaN. Les pilotes sont identifiés par leur
+    DriverNumber (même convention que session.drivers).
+
+    Returns:
+        (matrice float de forme (len(drivers), n_laps), numéros de tours)
+    """
+    values = laps[column]
+    if pd.api.types.is_timedelta64_dtype(values):
+        values = values.dt.total_seconds()
+
+    frame = pd.DataFrame({
+        'DriverNumber': laps['DriverNumber'].astype(str).values,
+        'LapNumber': laps['LapNumber'].values,
+        'Value': pd.to_numeric(values, errors='coerce').values,
+    }).dropna(subset=['LapNumber'])
+
+    matrix = frame.pivot_table(index='DriverNumber', columns='LapNumber', values='Value', aggfunc='first')
+    matrix = matrix.reindex(index=drivers)
+    return matrix.to_numpy(dtype=float), matrix.columns.to_numpy()
+
+
+def pairwise_battles(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcule en une passe (broadcasting) les dépassements et l'écart minimum
+    pour toutes les paires de pilotes.
+
+    Un dépassement = changement de signe de l'écart entre deux tours
+    consécutifs où les deux pilotes ont une valeur valide.
+
+    Returns:
+        (i, j, overtakes, min_gap) pour chaque paire i < j.
+        min_gap vaut inf si aucune paire de tours consécutifs n'est valide.
+    """
+    diff = matrix[:, None, :] - matrix[None, :, :]
+    prev, curr = diff[:, :, :-1], diff[:, :, 1:]
+    valid = ~np.isnan(prev) & ~np.isnan(curr)
+
+    with np.errstate(invalid='ignore'):
+        crossings = valid & (np.sign(prev) * np.sign(curr) < 0)
+    overtakes = crossings.sum(axis=2)
+    min_gap = np.where(valid, np.abs(curr), np.inf).min(axis=2, initial=np.inf)
+
+    i, j = np.triu_indices(matrix.shape[0], k=1)
+    return i, j, overtakes[i, j], min_gap[i, j]
+
+
+def close_laps(matrix: np.ndarray, threshold: float) -> np.ndarray:
+    """Nombre de tours passés sous `threshold` d'écart, pour chaque paire i < j"""
+    gap = np.abs(matrix[:, None, :] - matrix[None, :, :])
+    with np.errstate(invalid='ignore'):
+        counts = (gap <= threshold).sum(axis=2)
+    i, j = np.triu_indices(matrix.shape[0], k=1)
+    return counts[i, j]
+
+
+def score_battles(overtakes: np.ndarray, min_gap: np.ndarray, mode: str = 'position') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score d'intensité vectorisé (0 → 10) et masque des paires retenues.
+
+    - position : écart en places, bataille si dépassement ou écart <= 2
+    - time     : écart en secondes, bataille si dépassement ou écart <= 1s
+    """
+    if mode == 'time':
+        proximity = np.clip(3 * (1 - min_gap / TIME_GAP_THRESHOLD), 0, 3)
+        is_battle = (overtakes > 0) | (min_gap <= TIME_GAP_THRESHOLD)
+    else:
+        proximity = np.where(min_gap < 3, 3 - min_gap, 0)
+        is_battle = (overtakes > 0) | (min_gap <= 2)
+
+    intensity = np.minimum(overtakes * 2 + proximity, 10)
+    return intensity, is_battle
+
+
+def detect_battles(laps: pd.DataFrame, drivers: List[str], mode: str = 'position') -> List[dict]:
+    """
+    Détecte les batailles entre toutes les paires de pilotes d'une course.
+
+    Le mode "position" compare les classements tour par tour, le mode "time"
+    compare les temps cumulés (colonne Time = temps session en fin de tour).
+
+    Returns:
+        Liste triée par intensité décroissante de dicts
+        {driver1, driver2, overtakes, min_gap, intensity[, close_laps]}
+    """
+    drivers = [str(d) for d in drivers]
+    if len(drivers) < 2 or laps.empty:
+        return []
+
+    column = 'Time' if mode == 'time' else 'Position'
+    matrix, _ = build_lap_matrix(laps, column, drivers)
+
+    i, j, overtakes, min_gap = pairwise_battles(matrix)
+    intensity, is_battle = score_battles(overtakes, min_gap, mode)
+    near = close_laps(matrix, TIME_GAP_THRESHOLD) if mode == 'time' else None
+
+    selected = np.flatnonzero(is_battle)
+    selected = selected[np.argsort(-intensity[selected], kind='stable')]
+
+    battles = []
+    for k in selected:
+        battle = {
+            'driver1': drivers[i[k]],
+            'driver2': drivers[j[k]],
+            'overtakes': int(overtakes[k]),
+            'min_gap': float(min_gap[k]) if np.isfinite(min_gap[k]) else 0,
+            'intensity': float(intensity[k]),
+        }
+        if near is not None:
+            battle['close_laps'] = int(near[k])
+        battles.append(battle)
+
+    return battles
@@ -0,0 +1,247 @@
+import numpy as np
+from typing import List, Optional
+
+from app.utils.analytics.head_to_head import is_finished
+
+DEFAULT_SCENARIOS = 100_000
+MAX_SCENARIOS = 500_000
+
+# Forme récente : Grands Prix pris en compte et poids de l'a priori (milieu de grille)
+RECENT_ROUNDS = 6
+PRIOR_RACES = 2
+
+# Écart de force par place moyenne (modèle de Plackett-Luce : w = exp(-k * place))
+STRENGTH_SCALE = 0.35
+
+# Abandons : a priori bêta (1 abandon sur DNF_PRIOR_STARTS départs)
+DNF_PRIOR_STARTS = 10
+
+# Résultats simulés par type d'épreuve : chaque scénario tire ensuite, pour
+# chaque manche, l'un de ces résultats (même loi, sans refaire le tri)
+EVENT_POOL = 20_000
+
+
+def points_system(year: int) -> dict:
+    """Barème course / sprint d'une saison (le point du meilleur tour n'est pas simulé)"""
+    if year >= 2010:
+        race = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+    elif year >= 2003:
+        race = [10, 8, 6, 5, 4, 3, 2, 1]
+    else:
+        race = [10, 6, 4, 3, 2, 1]
+
+    if year >= 2022:
+        sprint = [8, 7, 6, 5, 4, 3, 2, 1]
+    elif year == 2021:
+        sprint = [3, 2, 1]
+    else:
+        sprint = []
+    return {'race': race, 'sprint': sprint}
+
+
+def recent_form(rows: List[dict], driver_ids: List[str], rounds: int = RECENT_ROUNDS) -> dict:
+    """
+    Force (Plackett-Luce) et taux d'abandon de chaque pilote d'après ses
+    derniers Grands Prix, lissés vers le milieu de grille.
+
+    Ergast classe tous les engagés, abandons compris : un résultat compte
+    comme arrivée d'après son statut (même règle que head_to_head).
+
+    Args:
+        rows: résultats {'round', 'kind', 'driver_id', 'position', 'status'} (voir ErgastMirror.season_points)
+    """
+    races = [row for row in rows if row['kind'] == 'race']
+    recent_rounds = sorted({row['round'] for row in races})[-rounds:]
+    field_mean = (len(driver_ids) + 1) / 2
+
+    results = {driver_id: [] for driver_id in driver_ids}
+    for row in races:
+        if row['round'] in recent_rounds and row['driver_id'] in results:
+            results[row['driver_id']].append(row)
+
+    mean_position = np.empty(len(driver_ids))
+    dnf_rate = np.empty(len(driver_ids))
+    for i, driver_id in enumerate(driver_ids):
+        finished = [row['position'] for row in results[driver_id] if row['position'] is not None and is_finished(row['status'] or '')]
+        starts = len(results[driver_id])
+        mean_position[i] = (sum(finished) + PRIOR_RACES * field_mean) / (len(finished) + PRIOR_RACES)
+        dnf_rate[i] = (starts - len(finished) + 1) / (starts + DNF_PRIOR_STARTS)
+
+    return {
+        'strength': np.exp(-STRENGTH_SCALE * (mean_position - mean_position.min())),
+        'dnfRate': dnf_rate,
+        'meanPosition': mean_position,
+    }
+
+
+def _outcome_pool(rng, strength: np.ndarray, dnf_rate: np.ndarray, table: list, size: int) -> np.ndarray:
+    """
+    `size` résultats d'une épreuve : points de chaque pilote (size, D).
+
+    Plackett-Luce vectorisé : l'ordre d'arrivée suit des temps exponentiels
+    de taux `strength` ; les abandons sont renvoyés en fond de classement.
+    """
+    drivers = len(strength)
+    times = rng.standard_exponential((size, drivers), dtype=np.float32) / strength.astype(np.float32)
+    retired = rng.random((size, drivers), dtype=np.float32) < dnf_rate.astype(np.float32)
+    times[retired] = np.inf
+
+    points = np.zeros(drivers, dtype=np.float32)
+    points[:min(len(table), drivers)] = table[:drivers]
+
+    order = times.argsort(axis=1)
+    gains = np.empty((size, drivers), dtype=np.float32)
+    np.put_along_axis(gains, order, points, axis=1)
+    gains[retired] = 0
+    return gains
+
+
+def _max_event_points(system: dict, sprint: bool, cars: int) -> float:
+    points = sum(system['race'][:cars])
+    if sprint:
+        points += sum(system['sprint'][:cars])
+    return float(points)
+
+
+def _conditions(points: np.ndarray, remaining: float, next_event: float) -> List[dict]:
+    """
+    Conditions exactes de titre (hors départage) :
+    - eliminated : ne peut plus atteindre le total actuel du leader
+    - clinched : aucun adversaire ne peut plus l'atteindre
+    - clinchMarginNextRound (leader) : points à prendre de plus que chaque
+      adversaire à la prochaine manche pour être titré, None si impossible
+    """
+    leader = int(points.argmax())
+    rivals = np.delete(points, leader)
+    best_rival = float(rivals.max()) if len(rivals) else 0.0
+    lead = float(points[leader]) - best_rival
+
+    conditions = []
+    for i, total in enumerate(points):
+        condition = {
+            'maxPoints': float(total + remaining),
+            'eliminated': bool(total + remaining < points[leader]),
+            'clinched': bool(i == leader and lead > remaining),
+        }
+        if i == leader and not condition['clinched']:
+            margin = (remaining - next_event) - lead + 1
+            condition['clinchMarginNextRound'] = max(0.0, float(margin)) if margin <= next_event else None
+        conditions.append(condition)
+    return conditions
+
+
+def simulate_championship(
+    drivers: List[dict],
+    constructors: List[dict],
+    form: dict,
+    remaining_events: List[dict],
+    system: dict,
+    scenarios: int = DEFAULT_SCENARIOS,
+    seed: Optional[int] = None,
+) -> dict:
+    """
+    Monte Carlo du reste de la saison.
+
+    Args:
+        drivers: [{'driverId', 'code', 'team', 'points', 'active'}] classement actuel
+                 (ordre = départage des égalités) ; seuls les pilotes actifs marquent
+        constructors: [{'team', 'points'}] classement actuel
+        form: recent_form() des pilotes actifs, dans l'ordre de `drivers` filtré
+        remaining_events: [{'round', 'sprint'}] épreuves restantes
+        system: points_system()
+
+    Returns:
+        {'drivers': [...], 'constructors': [...]} avec titleProbability,
+        expectedPoints et conditions de titre / d'élimination
+    """
+    rng = np.random.default_rng(seed)
+    active = [i for i, d in enumerate(drivers) if d['active']]
+    teams = [c['team'] for c in constructors]
+    team_index = {team: j for j, team in enumerate(teams)}
+
+    driver_points = np.array([d['points'] for d in drivers], dtype=float)
+    team_points = np.array([c['points'] for c in constructors], dtype=float)
+
+    # Points gagnés par les pilotes actifs sur tout le reste de saison (S, A)
+    pool_size = min(scenarios, EVENT_POOL)
+    pools = {kind: _outcome_pool(rng, form['strength'], form['dnfRate'], system[kind], pool_size)
+             for kind in ('race', 'sprint') if system[kind]}
+
+    gains = np.zeros((scenarios, len(active)), dtype=np.float32)
+    for event in remaining_events:
+        for kind in ('race', 'sprint'):
+            if kind in pools and (kind == 'race' or event['sprint']):
+                gains += pools[kind][rng.integers(0, pool_size, scenarios)]
+
+    driver_totals = np.repeat(driver_points[None, :], scenarios, axis=0).astype(np.float32)
+    driver_totals[:, active] += gains
+
+    membership = np.zeros((len(active), len(teams)), dtype=np.float32)
+    for k, i in enumerate(active):
+        if drivers[i]['team'] in team_index:
+            membership[k, team_index[drivers[i]['team']]] = 1
+    team_totals = team_points[None, :].astype(np.float32) + gains @ membership
+
+    driver_titles = np.bincount(driver_totals.argmax(axis=1), minlength=len(drivers)) / scenarios
+    team_titles = np.bincount(team_totals.argmax(axis=1), minlength=len(teams)) / scenarios if teams else np.array([])
+
+    # Maximum théorique restant : un pilote gagne tout ; une écurie fait 1-2
+    driver_remaining = sum(_max_event_points(system, e['sprint'], 1) for e in remaining_events)
+    team_remaining = sum(_max_event_points(system, e['sprint'], 2) for e in remaining_events)
+    next_driver = _max_event_points(system, remaining_events[0]['sprint'], 1) if remaining_events else 0.0
+    next_team = _max_event_points(system, remaining_events[0]['sprint'], 2) if remaining_events else 0.0
+
+    driver_conditions = _conditions(driver_points, driver_remaining, next_driver)
+    team_conditions = _conditions(team_points, team_remaining, next_team) if teams else []
+
+    return {
+        'drivers': [
+            {
+                **driver,
+                'titleProbability': round(float(driver_titles[i]), 4),
+                'expectedPoints': round(float(driver_totals[:, i].mean()), 1),
+                **driver_conditions[i],
+            }
+            for i, driver in enumerate(drivers)
+        ],
+        'constructors': [
+            {
+                **constructor,
+                'titleProbability': round(float(team_titles[j]), 4),
+                'expectedPoints': round(float(team_totals[:, j].mean()), 1),
+                **team_conditions[j],
+            }
+            for j, constructor in enumerate(constructors)
+        ],
+    }
+
+
+if __name__ == "__main__":
+    # Benchmark : mi-saison, 20 pilotes, 12 manches dont 3 sprints
+    import time
+
+    codes = [f"D{i:02d}" for i in range(20)]
+    rng = np.random.default_rng(0)
+    # Comme Ergast : une position pour chaque engagé, abandons compris (statut)
+    rows = [
+        {'round': r, 'kind': 'race', 'driver_id': code, 'position': int(p) + 1,
+         'status': 'Finished' if rng.random() > 0.08 else 'Engine'}
+        for r in range(1, 13)
+        for p, code in zip(np.argsort(np.arange(20) + rng.normal(0, 4, 20)).argsort(), codes)
+    ]
+    drivers = [{'driverId': c, 'code': c, 'team': f"T{i // 2}", 'points': float(200 - 9 * i), 'active': True}
+               for i, c in enumerate(codes)]
+    constructors = [{'team': f"T{j}", 'points': float(380 - 35 * j)} for j in range(10)]
+    events = [{'round': r, 'sprint': r % 4 == 0} for r in range(13, 25)]
+    form = recent_form(rows, codes)
+    prior_rate = 1 / (RECENT_ROUNDS + DNF_PRIOR_STARTS)
+    assert (form['dnfRate'] > prior_rate).any(), "retirements must raise DNF rates above the prior"
+    print(f"DNF rates {form['dnfRate'].min():.3f}..{form['dnfRate'].max():.3f} (prior {prior_rate:.3f})")
+
+    for scenarios in (10_000, 100_000):
+        start = time.perf_counter()
+        result = simulate_championship(drivers, constructors, form, events, points_system(2024), scenarios, seed=1)
+        elapsed = time.perf_counter() - start
+        top = sorted(result['drivers'], key=lambda d: -d['titleProbability'])[:3]
+        print(f"{scenarios:>7,} scenarios in {elapsed * 1000:.0f} ms - "
+              + ", ".join(f"{d['code']} {d['titleProbability']:.1%}" for d in top))
@@ -0,0 +1,161 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+# Fenêtre de recherche du point de freinage avant l'entrée du virage (m)
+BRAKING_LOOKBACK = 250.0
+
+# Seuil de frein (canal interpolé 0..1) et d'accélérateur (%) pour les points clés
+BRAKE_ON = 0.5
+THROTTLE_PICKUP = 20.0
+
+
+def _corner_indices(grid: dict, catalogue: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Indices de grille (entrée, apex, sortie, début de recherche du freinage) par virage"""
+    distance = grid['distance']
+    scale = grid['lapLength'] / catalogue['lapLength']
+    corners = catalogue['corners']
+
+    entry = np.array([c['entryDistance'] for c in corners]) * scale
+    apex = np.array([c['apexDistance'] for c in corners]) * scale
+    exit_ = np.array([c['exitDistance'] for c in corners]) * scale
+
+    # Le freinage se cherche après l'apex du virage précédent
+    previous_apex = np.concatenate([[0.0], apex[:-1]])
+    braking_start = np.maximum(entry - BRAKING_LOOKBACK, previous_apex)
+
+    def to_index(values):
+        return np.searchsorted(distance, values).clip(0, len(distance) - 1)
+
+    return to_index(entry), to_index(apex), to_index(exit_), to_index(braking_start)
+
+
+def _gather(channel: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fenêtres [start, end] d'un canal (D, P) pour chaque pilote et virage.
+
+    starts / ends : (K,) ou (D, K). Retourne valeurs (D, K, W), indices et masque de validité.
+    """
+    n_drivers, n_points = channel.shape
+    starts = np.broadcast_to(starts, (n_drivers, starts.shape[-1]))
+    ends = np.broadcast_to(ends, starts.shape)
+    width = int((ends - starts).max()) + 1 if starts.size else 1
+
+    idx = starts[..., None] + np.arange(max(width, 1))
+    valid = idx <= ends[..., None]
+    idx = idx.clip(0, n_points - 1)
+    values = np.take_along_axis(channel[:, None, :], idx, axis=2)
+    return values, idx, valid
+
+
+def corner_metrics(grid: dict, catalogue: dict) -> Dict[str, np.ndarray]:
+    """
+    Métriques virage par virage pour TOUS les pilotes de la grille, en une passe
+    de tableaux (D pilotes × K virages) :
+
+        entrySpeed, minSpeed, exitSpeed (km/h), apexDistance,
+        brakingPoint (distance où le frein est enfoncé, NaN si virage à fond),
+        throttlePickup (distance où l'accélérateur repasse THROTTLE_PICKUP % après l'apex),
+        cornerTime (s, entrée → sortie), timeLost (s, vs meilleur temps du virage)
+    """
+    distance = grid['distance']
+    channels = grid['channels']
+    entry, apex, exit_, braking_start = _corner_indices(grid, catalogue)
+    rows = np.arange(len(grid['drivers']))[:, None]
+
+    speed = channels['Speed']
+    time = channels['Time']
+
+    # Vitesse minimale et apex propre à chaque pilote
+    window_speed, window_idx, valid = _gather(speed, entry, np.maximum(exit_, entry))
+    window_speed = np.where(valid, window_speed, np.inf)
+    apex_pos = window_speed.argmin(axis=2)
+    driver_apex = np.take_along_axis(window_idx, apex_pos[..., None], axis=2)[..., 0]
+
+    # Point de freinage : premier point freiné entre braking_start et l'apex
+    brake, brake_idx, valid = _gather(channels['Brake'], braking_start, np.maximum(apex, braking_start))
+    braking = (brake >= BRAKE_ON) & valid
+    braking_point = np.where(
+        braking.any(axis=2),
+        distance[np.take_along_axis(brake_idx, braking.argmax(axis=2)[..., None], axis=2)[..., 0]],
+        np.nan
+    )
+
+    # Reprise des gaz : premier point >= THROTTLE_PICKUP après l'apex du pilote
+    pickup_end = np.maximum(np.broadcast_to(exit_, driver_apex.shape), driver_apex)
+    throttle, throttle_idx, valid = _gather(channels['Throttle'], driver_apex, pickup_end)
+    on_throttle = (throttle >= THROTTLE_PICKUP) & valid
+    throttle_pickup = np.where(
+        on_throttle.any(axis=2),
+        distance[np.take_along_axis(throttle_idx, on_throttle.argmax(axis=2)[..., None], axis=2)[..., 0]],
+        np.nan
+    )
+
+    corner_time = time[:, exit_] - time[:, entry]
+    with np.errstate(invalid='ignore'):
+        time_lost = corner_time - np.nanmin(corner_time, axis=0, keepdims=True)
+
+    return {
+        'entrySpeed': speed[:, entry],
+        'minSpeed': speed[rows, driver_apex],
+        'exitSpeed': speed[:, exit_],
+        'apexDistance': distance[driver_apex],
+        'brakingPoint': braking_point,
+        'throttlePickup': throttle_pickup,
+        'cornerTime': corner_time,
+        'timeLost': time_lost,
+    }
+
+
+def corner_comparison(grid: dict, catalogue: dict) -> dict:
+    """
+    Tableau pilotes × virages (format API) + meilleur pilote par virage.
+    """
+    corners = catalogue['corners']
+    drivers: List[str] = grid['drivers']
+    if not corners:
+        return {'corners': [], 'drivers': []}
+
+    metrics = corner_metrics(grid, catalogue)
+
+    def value(name, row, col, digits=1):
+        v = metrics[name][row, col]
+        return round(float(v), digits) if np.isfinite(v) else None
+
+    fastest = np.where(np.isfinite(metrics['cornerTime']), metrics['cornerTime'], np.inf).argmin(axis=0)
+
+    driver_rows = []
+    for row, driver in enumerate(drivers):
+        driver_rows.append({
+            'driver': driver,
+            'totalTimeLost': round(float(np.nansum(metrics['timeLost'][row])), 3),
+            'corners': [
+                {
+                    'name': corner['name'],
+                    'entrySpeed': value('entrySpeed', row, col),
+                    'minSpeed': value('minSpeed', row, col),
+                    'exitSpeed': value('exitSpeed', row, col),
+                    'apexDistance': value('apexDistance', row, col),
+                    'brakingPoint': value('brakingPoint', row, col),
+                    'throttlePickup': value('throttlePickup', row, col),
+                    'cornerTime': value('cornerTime', row, col, 3),
+                    'timeLost': value('timeLost', row, col, 3),
+                }
+                for col, corner in enumerate(corners)
+            ]
+        })
+    driver_rows.sort(key=lambda r: r['totalTimeLost'])
+
+    return {
+        'corners': [
+            {
+                'name': corner['name'],
+                'entryDistance': corner['entryDistance'],
+                'apexDistance': corner['apexDistance'],
+                'exitDistance': corner['exitDistance'],
+                'fastestDriver': drivers[fastest[col]],
+                'bestTime': value('cornerTime', fastest[col], col, 3),
+            }
+            for col, corner in enumerate(corners)
+        ],
+        'drivers': driver_rows,
+    }
@@ -0,0 +1,320 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from scipy.signal import find_peaks, peak_widths
+
+from app.utils.analytics.track_projection import build_centerline
+
+# Pas de la grille en distance sur laquelle la détection travaille (m)
+CORNER_STEP = 2.0
+
+# Fenêtres de lissage (m) : vitesse et position GPS
+SPEED_SMOOTHING = 20.0
+POSITION_SMOOTHING = 30.0
+
+# Chute de vitesse minimale pour un virage (km/h) = proéminence du pic
+MIN_SPEED_DROP = 15.0
+
+# Distance minimale entre deux apex (m)
+MIN_CORNER_SPACING = 80.0
+
+# Changement de cap cumulé minimal entre entrée et sortie (degrés)
+MIN_HEADING_CHANGE = 20.0
+
+# Hauteur relative (fraction de la proéminence) où sont lues l'entrée et la sortie
+CORNER_REL_HEIGHT = 0.8
+
+# Demi-largeur d'un virage du catalogue sans fenêtre détectée (virage à fond) (m)
+DEFAULT_CORNER_HALF_WIDTH = 50.0
+
+
+def telemetry_arrays(telemetry: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Canaux x / y / speed / distance des points GPS valides (X, Y et Speed non nuls)"""
+    valid = telemetry[['X', 'Y', 'Speed']].notna().all(axis=1).to_numpy()
+    frame = telemetry[valid]
+    return {
+        'x': frame['X'].to_numpy(dtype=float),
+        'y': frame['Y'].to_numpy(dtype=float),
+        'speed': frame['Speed'].to_numpy(dtype=float),
+        'distance': frame['Distance'].fillna(0.0).to_numpy(dtype=float),
+    }
+
+
+def gps_points(arrays: Dict[str, np.ndarray], indices: Optional[np.ndarray] = None) -> List[dict]:
+    """Format gps_data historique de /racing-line-analyzer (tous les points, ou `indices`)"""
+    if indices is not None:
+        arrays = {channel: values[indices] for channel, values in arrays.items()}
+    return [
+        {"x": x, "y": y, "speed": speed, "distance": distance}
+        for x, y, speed, distance in zip(
+            arrays['x'].tolist(), arrays['y'].tolist(),
+            arrays['speed'].tolist(), arrays['distance'].tolist()
+        )
+    ]
+
+
+def _smooth(values: np.ndarray, window: int) -> np.ndarray:
+    """Moyenne glissante centrée, bords répliqués"""
+    if window <= 1:
+        return values
+    padded = np.pad(values, window // 2, mode='edge')
+    return np.convolve(padded, np.ones(window) / window, mode='valid')[:len(values)]
+
+
+def detect_corners(arrays: Dict[str, np.ndarray]) -> List[dict]:
+    """
+    Détection des virages par traitement du signal, indépendante de la fréquence
+    d'échantillonnage : tout est calculé sur une grille en distance (CORNER_STEP).
+
+    - apex      : minima de vitesse lissée (find_peaks sur -vitesse) avec
+                  proéminence MIN_SPEED_DROP et espacement MIN_CORNER_SPACING
+    - entrée/sortie : largeur du pic à CORNER_REL_HEIGHT de sa proéminence
+    - validation : le cap (courbure intégrée) doit tourner d'au moins
+                   MIN_HEADING_CHANGE degrés, ce qui écarte les freinages en ligne droite
+
+    Returns:
+        [{'id', 'name', 'startIdx', 'endIdx', 'apexIdx', 'avgSpeed', 'minSpeed'}]
+        (indices dans les points GPS d'entrée)
+    """
+    speed = arrays['speed']
+    if len(speed) < 10:
+        return []
+
+    distance = np.maximum.accumulate(arrays['distance'])
+    grid = np.arange(distance[0], distance[-1], CORNER_STEP)
+    if len(grid) < 10:
+        return []
+
+    grid_speed = _smooth(np.interp(grid, distance, speed), int(SPEED_SMOOTHING / CORNER_STEP))
+    position_window = int(POSITION_SMOOTHING / CORNER_STEP)
+    grid_x = _smooth(np.interp(grid, distance, arrays['x']), position_window)
+    grid_y = _smooth(np.interp(grid, distance, arrays['y']), position_window)
+
+    # Courbure intégrée : cumul des variations de cap le long du tour
+    heading = np.unwrap(np.arctan2(np.gradient(grid_y), np.gradient(grid_x)))
+    cumulative_turn = np.concatenate([[0.0], np.cumsum(np.abs(np.diff(heading)))])
+
+    apexes, properties = find_peaks(
+        -grid_speed,
+        prominence=MIN_SPEED_DROP,
+        distance=max(1, int(MIN_CORNER_SPACING / CORNER_STEP))
+    )
+    if len(apexes) == 0:
+        return []
+
+    _, _, left, right = peak_widths(
+        -grid_speed, apexes, rel_height=CORNER_REL_HEIGHT,
+        prominence_data=(properties['prominences'], properties['left_bases'], properties['right_bases'])
+    )
+    left = np.floor(left).astype(int)
+    right = np.ceil(right).astype(int).clip(max=len(grid) - 1)
+
+    turned = np.degrees(cumulative_turn[right] - cumulative_turn[left])
+    keep = turned >= MIN_HEADING_CHANGE
+
+    # Retour aux indices des points GPS bruts
+    starts = np.searchsorted(distance, grid[left[keep]])
+    ends = np.searchsorted(distance, grid[right[keep]]).clip(max=len(speed) - 1)
+
+    corners = []
+    for corner_id, (start_idx, end_idx) in enumerate(zip(starts.tolist(), ends.tolist()), start=1):
+        window = speed[start_idx:end_idx + 1]
+        apex_idx = start_idx + int(window.argmin())
+        corners.append({
+            "id": corner_id,
+            "name": f"T{corner_id}",
+            "startIdx": start_idx,
+            "endIdx": end_idx,
+            "apexIdx": apex_idx,
+            "avgSpeed": float(speed[start_idx:end_idx].mean()) if end_idx > start_idx else float(speed[start_idx]),
+            "minSpeed": float(speed[apex_idx]),
+        })
+
+    return corners
+
+
+def build_corner_catalogue(arrays: Dict[str, np.ndarray], official: Optional[pd.DataFrame] = None) -> dict:
+    """
+    Catalogue canonique des virages d'un circuit, construit sur UN tour de référence.
+
+    - official : table circuit_info.corners de FastF1 (Number, Letter, Distance, X, Y).
+      Les apex et noms officiels sont conservés, l'entrée/sortie vient de la
+      fenêtre détectée (detect_corners) qui contient l'apex.
+    - sans table officielle : virages détectés, nommés T1..Tn.
+
+    Les fenêtres sont bornées à mi-chemin des apex voisins (chicanes).
+
+    Returns:
+        {'lapLength', 'source', 'centerline' (trajectoire de référence, voir TrackIndex),
+         'corners': [{'number', 'name', 'entryDistance', 'apexDistance', 'exitDistance', 'x', 'y'}]}
+    """
+    distance = np.maximum.accumulate(arrays['distance'])
+    lap_length = float(distance[-1])
+    detected = detect_corners(arrays)
+    windows = np.array([[distance[c['startIdx']], distance[c['endIdx']]] for c in detected]).reshape(-1, 2)
+
+    if official is not None and not official.empty:
+        official = official.sort_values('Distance')
+        apex = official['Distance'].to_numpy(dtype=float)
+        numbers = official['Number'].astype(int).tolist()
+        letters = official['Letter'].fillna('').astype(str).tolist() if 'Letter' in official else [''] * len(apex)
+        names = [f"T{number}{letter}" for number, letter in zip(numbers, letters)]
+        source = 'circuit_info'
+    else:
+        apex = np.array([distance[c['apexIdx']] for c in detected], dtype=float)
+        numbers = [c['id'] for c in detected]
+        names = [c['name'] for c in detected]
+        source = 'telemetry'
+
+    if len(apex) == 0:
+        return {'lapLength': lap_length, 'source': source, 'centerline': build_centerline(arrays['x'], arrays['y']), 'corners': []}
+
+    entry = apex - DEFAULT_CORNER_HALF_WIDTH
+    exit_ = apex + DEFAULT_CORNER_HALF_WIDTH
+    inside = (windows[None, :, 0] <= apex[:, None]) & (windows[None, :, 1] >= apex[:, None])
+    has_window = inside.any(axis=1)
+    first = inside.argmax(axis=1)
+    entry[has_window] = windows[first[has_window], 0]
+    exit_[has_window] = windows[first[has_window], 1]
+
+    midpoints = np.concatenate([[0.0], (apex[1:] + apex[:-1]) / 2, [lap_length]])
+    entry = np.maximum(entry, midpoints[:-1])
+    exit_ = np.minimum(exit_, midpoints[1:])
+
+    apex_points = np.searchsorted(distance, apex).clip(max=len(distance) - 1)
+
+    return {
+        'lapLength': round(lap_length, 1),
+        'source': source,
+        'centerline': build_centerline(arrays['x'], arrays['y']),
+        'corners': [
+            {
+                'number': int(numbers[i]),
+                'name': names[i],
+                'entryDistance': round(float(entry[i]), 1),
+                'apexDistance': round(float(apex[i]), 1),
+                'exitDistance': round(float(exit_[i]), 1),
+                'x': float(arrays['x'][apex_points[i]]),
+                'y': float(arrays['y'][apex_points[i]]),
+            }
+            for i in range(len(apex))
+        ]
+    }
+
+
+def slice_corners(catalogue: dict, arrays: Dict[str, np.ndarray]) -> List[dict]:
+    """
+    Applique le catalogue à un tour quelconque : simple découpage par distance
+    (mise à l'échelle de la longueur du tour). Même schéma que detect_corners.
+    """
+    corners = catalogue['corners']
+    speed = arrays['speed']
+    if not corners or len(speed) < 2:
+        return []
+
+    distance = np.maximum.accumulate(arrays['distance'])
+    scale = distance[-1] / catalogue['lapLength']
+    entries = np.array([c['entryDistance'] for c in corners]) * scale
+    exits = np.array([c['exitDistance'] for c in corners]) * scale
+
+    starts = np.searchsorted(distance, entries).clip(max=len(speed) - 1)
+    ends = np.maximum(np.searchsorted(distance, exits).clip(max=len(speed) - 1), starts)
+
+    result = []
+    for corner, start_idx, end_idx in zip(corners, starts.tolist(), ends.tolist()):
+        window = speed[start_idx:end_idx + 1]
+        apex_idx = start_idx + int(window.argmin())
+        result.append({
+            "id": corner['number'],
+            "name": corner['name'],
+            "startIdx": start_idx,
+            "endIdx": end_idx,
+            "apexIdx": apex_idx,
+            "avgSpeed": float(speed[start_idx:end_idx].mean()) if end_idx > start_idx else float(speed[start_idx]),
+            "minSpeed": float(speed[apex_idx]),
+        })
+
+    return result
+
+
+if __name__ == "__main__":
+    # Benchmark : tour synthétique (lignes droites + arcs), plusieurs fréquences
+    # d'échantillonnage, comparaison avec l'ancienne boucle while
+    import time
+
+    def synthetic_lap(hz: float, seed: int = 0) -> Dict[str, np.ndarray]:
+        rng = np.random.default_rng(seed)
+        # (longueur m, rayon m ou 0 pour une ligne droite, sens)
+        layout = [(800, 0, 1), (60, 25, 1), (300, 0, 1), (150, 120, -1), (400, 0, 1),
+                  (90, 40, 1), (120, 0, 1), (70, 35, -1), (600, 0, 1), (200, 300, 1),
+                  (350, 0, 1), (80, 20, 1), (500, 0, 1), (120, 60, -1), (700, 0, 1)]
+        ds = 0.5
+        curvature = np.concatenate([
+            np.full(int(length / ds), (direction / radius) if radius else 0.0)
+            for length, radius, direction in layout
+        ])
+        # Vitesse limitée par l'adhérence latérale, freinage / accélération bornés
+        v_max = np.minimum(90.0, np.sqrt(35.0 / np.maximum(np.abs(curvature), 1e-9)))
+        v = v_max.copy()
+        for i in range(1, len(v)):
+            v[i] = min(v[i], np.sqrt(v[i - 1] ** 2 + 2 * 12.0 * ds))
+        for i in range(len(v) - 2, -1, -1):
+            v[i] = min(v[i], np.sqrt(v[i + 1] ** 2 + 2 * 45.0 * ds))
+        s = np.arange(len(v)) * ds
+        heading = np.cumsum(curvature) * ds
+        x, y = np.cumsum(np.cos(heading)) * ds, np.cumsum(np.sin(heading)) * ds
+        t = np.concatenate([[0.0], np.cumsum(ds / v[:-1])])
+        samples = np.arange(0, t[-1], 1 / hz)
+        return {
+            'x': np.interp(samples, t, x) * 10 + rng.normal(0, 5, len(samples)),
+            'y': np.interp(samples, t, y) * 10 + rng.normal(0, 5, len(samples)),
+            'speed': np.interp(samples, t, v) * 3.6 + rng.normal(0, 1.5, len(samples)),
+            'distance': np.interp(samples, t, s),
+        }
+
+    def legacy_pipeline(telemetry: pd.DataFrame) -> List[int]:
+        gps_data = []
+        for _, row in telemetry.iterrows():
+            if pd.notna(row['X']) and pd.notna(row['Y']) and pd.notna(row['Speed']):
+                gps_data.append({"speed": float(row['Speed'])})
+        corners, threshold, i = [], 15, 20
+        while i < len(gps_data) - 20:
+            prev_speed, current_speed, next_speed = (gps_data[i + k]['speed'] for k in (-10, 0, 10))
+            if prev_speed - current_speed > threshold and current_speed < next_speed:
+                end_idx = i
+                for j in range(i, min(i + 30, len(gps_data))):
+                    if gps_data[j]['speed'] > current_speed + threshold:
+                        end_idx = j
+                        break
+                corners.append(i)
+                i = min(len(gps_data) - 1, end_idx + 20)
+            else:
+                i += 1
+        return corners
+
+    def new_pipeline(telemetry: pd.DataFrame) -> List[dict]:
+        arrays = telemetry_arrays(telemetry)
+        gps_points(arrays)
+        return detect_corners(arrays)
+
+    def best_of(fn, runs=5):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - start)
+        return result, min(timings) * 1000
+
+    print("expected corners: 6 (the 300 m radius sweeper is taken flat out)")
+    print("corner counts over 10 noisy laps, timings = gps_data + detection")
+    for hz in (4, 8, 10, 20):
+        legacy_counts, new_counts = [], []
+        for seed in range(10):
+            lap = synthetic_lap(hz, seed)
+            telemetry = pd.DataFrame({'X': lap['x'], 'Y': lap['y'], 'Speed': lap['speed'], 'Distance': lap['distance']})
+            legacy, legacy_ms = best_of(lambda: legacy_pipeline(telemetry))
+            corners, new_ms = best_of(lambda: new_pipeline(telemetry))
+            legacy_counts.append(len(legacy))
+            new_counts.append(len(corners))
+        print(f"{hz:>3} Hz ({len(telemetry):>5} pts): legacy {min(legacy_counts)}-{max(legacy_counts)} corners {legacy_ms:6.2f} ms | "
+              f"find_peaks {min(new_counts)}-{max(new_counts)} corners {new_ms:6.2f} ms")
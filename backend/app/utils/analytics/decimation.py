@@ -0,0 +1,146 @@
+import numpy as np
+from typing import Iterable, Optional
+
+# Tolérance RDP par défaut en unités FastF1 (1/10 m) : 1 m, invisible à l'échelle du SVG
+DEFAULT_TOLERANCE = 10.0
+
+# Nombre de points LTTB conservés pour la trace de vitesse
+DEFAULT_SPEED_POINTS = 400
+
+
+def rdp_mask(x: np.ndarray, y: np.ndarray, epsilon: float) -> np.ndarray:
+    """
+    Ramer-Douglas-Peucker vectorisé : à chaque itération, TOUS les segments
+    courants sont évalués d'un coup (distance perpendiculaire + max par segment),
+    et chaque segment trop éloigné de la trajectoire est coupé à son point le plus loin.
+
+    Returns:
+        masque bool des points conservés
+    """
+    n = len(x)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    if n < 3 or epsilon <= 0:
+        keep[:] = True
+        return keep
+
+    keep[[0, n - 1]] = True
+    points = np.arange(n)
+
+    while True:
+        kept = np.flatnonzero(keep)
+        segment = (np.searchsorted(kept, points, side='right') - 1).clip(max=len(kept) - 2)
+        a, b = kept[segment], kept[segment + 1]
+
+        dx, dy = x[b] - x[a], y[b] - y[a]
+        length = np.hypot(dx, dy)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            distance = np.where(
+                length > 0,
+                np.abs(dx * (y[a] - y) - dy * (x[a] - x)) / length,
+                np.hypot(x - x[a], y - y[a])
+            )
+        distance[keep] = 0.0
+
+        segment_max = np.maximum.reduceat(distance, kept[:-1])
+        split = segment_max > epsilon
+        if not split.any():
+            return keep
+
+        # Point le plus éloigné de chaque segment à couper
+        candidates = np.flatnonzero((distance == segment_max[segment]) & split[segment])
+        _, first = np.unique(segment[candidates], return_index=True)
+        keep[candidates[first]] = True
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, target: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets : `target` points qui préservent la forme
+    visuelle d'une trace (ex: vitesse en fonction de la distance).
+    """
+    n = len(x)
+    if target <= 0 or target >= n or n < 3:
+        return np.arange(n)
+    if target < 3:
+        return np.array([0, n - 1])
+
+    edges = np.linspace(1, n - 1, target - 1).astype(int)
+    selected = np.empty(target, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(target - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean() if next_end > next_start else x[-1]
+        avg_y = y[next_start:next_end].mean() if next_end > next_start else y[-1]
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(area.argmax()) if end > start else start
+        selected[i + 1] = previous
+
+    return np.unique(selected)
+
+
+def decimate_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    distance: Optional[np.ndarray] = None,
+    speed: Optional[np.ndarray] = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+    target_points: int = DEFAULT_SPEED_POINTS,
+    protected: Optional[Iterable[int]] = None,
+) -> np.ndarray:
+    """
+    Indices conservés d'une trajectoire : union de
+    - RDP sur la géométrie XY (tolerance, 0 = désactivé)
+    - LTTB sur la trace vitesse / distance (target_points, 0 = désactivé)
+    - points protégés (entrée / apex / sortie des virages...)
+
+    tolerance=0 et target_points=0 renvoient tous les points.
+    """
+    n = len(x)
+    if tolerance <= 0 and target_points <= 0:
+        return np.arange(n)
+
+    keep = rdp_mask(x, y, tolerance) if tolerance > 0 else np.zeros(n, dtype=bool)
+
+    if speed is not None and target_points > 0:
+        axis = distance if distance is not None else np.arange(n, dtype=float)
+        keep[lttb_indices(axis, speed, target_points)] = True
+
+    if protected is not None:
+        protected = np.asarray(list(protected), dtype=int)
+        keep[protected[(protected >= 0) & (protected < n)]] = True
+
+    keep[[0, n - 1]] = n > 0
+    return np.flatnonzero(keep)
+
+
+def remap_indices(indices: np.ndarray, kept: np.ndarray) -> np.ndarray:
+    """Position dans la liste décimée d'indices d'origine (protégés, donc conservés)"""
+    return np.searchsorted(kept, indices)
+
+
+if __name__ == "__main__":
+    # Benchmark : tour de ~5 km échantillonné à 20 Hz
+    import time
+
+    s = np.linspace(0, 2 * np.pi, 1800)
+    rng = np.random.default_rng(0)
+    x = 8000 * np.cos(s) + 1500 * np.cos(5 * s) + rng.normal(0, 2, len(s))
+    y = 5000 * np.sin(s) + 800 * np.sin(7 * s) + rng.normal(0, 2, len(s))
+    speed = 220 + 80 * np.sin(9 * s) + rng.normal(0, 2, len(s))
+    distance = np.concatenate([[0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))]) / 10
+
+    for tolerance, target in ((5.0, 300), (DEFAULT_TOLERANCE, DEFAULT_SPEED_POINTS), (25.0, 200)):
+        runs = []
+        for _ in range(10):
+            start = time.perf_counter()
+            kept = decimate_indices(x, y, distance, speed, tolerance, target)
+            runs.append(time.perf_counter() - start)
+        print(f"tolerance={tolerance:>4} target={target}: {len(x)} → {len(kept)} points in {min(runs) * 1000:.2f} ms")
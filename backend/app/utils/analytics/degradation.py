@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+from app.utils.analytics.outliers import compute_outlier_masks
+
+# Gain de temps par tour dû à l'allègement en carburant (~1.7 kg/tour × ~0.035 s/kg)
+FUEL_EFFECT_PER_LAP = 0.06
+
+# Nombre minimum de tours propres pour ajuster un relais
+MIN_FIT_LAPS = 3
+
+DEGRADATION_COLUMNS = [
+    'Driver', 'Team', 'Stint', 'Compound', 'StartLap', 'EndLap',
+    'FitLaps', 'Slope', 'Intercept', 'R2',
+]
+
+
+def _clean_laps(laps: pd.DataFrame, stints: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tours utilisables pour l'ajustement, rattachés à leur relais.
+
+    Exclut : tour 1 (départ arrêté), tours de stands, tours neutralisés,
+    temps aberrants (médiane + 20s) et temps manquants.
+    """
+    frame = pd.DataFrame({
+        'Driver': laps['Driver'].astype(str).values,
+        'LapNumber': pd.to_numeric(laps['LapNumber'], errors='coerce').values,
+        'LapTime': laps['LapTime'].dt.total_seconds().values,
+        'TyreLife': pd.to_numeric(laps['TyreLife'], errors='coerce').values,
+    }).dropna()
+    frame['LapNumber'] = frame['LapNumber'].astype(int)
+
+    # Masques outliers de la session (stands/SC + médiane)
+    masks = [compute_outlier_masks(laps, strategy)['LapTime'] for strategy in ('pit_sc', 'median')]
+    flagged = (masks[0] | masks[1]).stack()
+    flagged = flagged[flagged].index
+    is_outlier = pd.MultiIndex.from_arrays([frame['Driver'], frame['LapNumber']]).isin(flagged)
+    frame = frame[~is_outlier & (frame['LapNumber'] > 1)]
+
+    # Rattacher chaque tour au relais qui le contient (StartLap <= LapNumber)
+    frame = pd.merge_asof(
+        frame.sort_values('LapNumber'),
+        stints[['Driver', 'Stint', 'StartLap']].astype({'StartLap': int}).sort_values('StartLap'),
+        left_on='LapNumber', right_on='StartLap', by='Driver', direction='backward'
+    )
+    return frame.dropna(subset=['Stint'])
+
+
+def fit_degradation(
+    laps: pd.DataFrame,
+    stints: pd.DataFrame,
+    fuel_correction: bool = True,
+    fuel_effect: float = FUEL_EFFECT_PER_LAP,
+) -> pd.DataFrame:
+    """
+    Ajuste lap_time = intercept + slope × tyre_life pour TOUS les relais d'une
+    session, en une passe (moindres carrés fermés via sommes groupées).
+
+    Avec fuel_correction, chaque temps est ramené à charge de carburant
+    constante (+ fuel_effect × (LapNumber - 1)) avant l'ajustement, pour que
+    la pente ne mesure que l'usure des pneus.
+
+    Returns:
+        DataFrame DEGRADATION_COLUMNS, une ligne par relais
+        (Slope = dégradation en s/tour, NaN si moins de MIN_FIT_LAPS tours)
+    """
+    if laps.empty or stints.empty:
+        return pd.DataFrame(columns=DEGRADATION_COLUMNS)
+
+    frame = _clean_laps(laps, stints)
+
+    y = frame['LapTime'].to_numpy()
+    if fuel_correction:
+        y = y + fuel_effect * (frame['LapNumber'].to_numpy() - 1)
+    x = frame['TyreLife'].to_numpy(dtype=float)
+
+    sums = pd.DataFrame({
+        'Driver': frame['Driver'].values,
+        'Stint': frame['Stint'].astype(int).values,
+        'n': 1.0, 'x': x, 'y': y, 'xx': x * x, 'xy': x * y, 'yy': y * y,
+    }).groupby(['Driver', 'Stint']).sum()
+
+    n, sx, sy = sums['n'], sums['x'], sums['y']
+    sxx = sums['xx'] - sx * sx / n
+    sxy = sums['xy'] - sx * sy / n
+    syy = sums['yy'] - sy * sy / n
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (sxy / sxx).where((n >= MIN_FIT_LAPS) & (sxx > 0))
+        intercept = (sy - slope * sx) / n
+        r2 = (sxy * sxy / (sxx * syy)).where(syy > 0)
+
+    fits = pd.DataFrame({
+        'FitLaps': n.astype(int),
+        'Slope': slope,
+        'Intercept': intercept,
+        'R2': r2,
+    }).reset_index()
+
+    result = stints.merge(fits, on=['Driver', 'Stint'], how='left')
+    result['FitLaps'] = result['FitLaps'].fillna(0).astype(int)
+    return result[DEGRADATION_COLUMNS]
+
+
+def _optional(value, digits: int = 4):
+    return round(float(value), digits) if pd.notna(value) else None
+
+
+def degradation_to_records(degradation: pd.DataFrame) -> List[dict]:
+    """Format /api/degradation : relais groupés par pilote"""
+    drivers = []
+    for driver, rows in degradation.groupby('Driver', sort=False):
+        drivers.append({
+            'driver': str(driver),
+            'team': str(rows['Team'].iloc[0]),
+            'stints': [
+                {
+                    'stint': int(r.Stint),
+                    'compound': r.Compound,
+                    'startLap': int(r.StartLap),
+                    'endLap': int(r.EndLap),
+                    'fitLaps': int(r.FitLaps),
+                    'degradation': _optional(r.Slope),
+                    'baseLapTime': _optional(r.Intercept, 3),
+                    'r2': _optional(r.R2, 3),
+                }
+                for r in rows.itertuples(index=False)
+            ]
+        })
+    return drivers
+
+
+def compound_summary(degradation: pd.DataFrame) -> List[dict]:
+    """Dégradation médiane par composé, pondérée par le nombre de tours ajustés"""
+    fitted = degradation.dropna(subset=['Slope'])
+    summary = []
+    for compound, rows in fitted.groupby('Compound'):
+        weights = rows['FitLaps'].to_numpy(dtype=float)
+        summary.append({
+            'compound': str(compound),
+            'stints': len(rows),
+            'medianDegradation': round(float(rows['Slope'].median()), 4),
+            'weightedDegradation': round(float(np.average(rows['Slope'], weights=weights)), 4),
+            'baseLapTime': round(float(rows['Intercept'].median()), 3),
+        })
+    return summary
@@ -0,0 +1,134 @@
+from itertools import combinations
+from typing import List, Tuple
+
+# Statuts Ergast d'un pilote classé (arrivé, à 1 tour ou plus)
+FINISHED_KEYWORDS = ('Finished', 'Lap', '+')
+
+
+def is_finished(status: str) -> bool:
+    return any(keyword in status for keyword in FINISHED_KEYWORDS)
+
+
+def driver_season(races: list, qualifying: list) -> dict:
+    """
+    Document (saison, pilote) sérialisable, construit une fois puis mis en cache :
+    chaque duel entre deux pilotes se calcule ensuite à partir de deux documents.
+
+    Args:
+        races: RaceTable Ergast des résultats de course du pilote
+        qualifying: RaceTable Ergast de ses qualifications
+
+    Returns:
+        {'races': {round: {...}}, 'qualifying': {round: position}, 'team'}
+    """
+    rounds = {}
+    for race in races:
+        if not race['Results']:
+            continue
+        result = race['Results'][0]
+        rounds[race['round']] = {
+            'position': int(result['position']),
+            'points': float(result['points']),
+            'status': result['status'],
+            'finished': is_finished(result['status']),
+            'fastestLap': result.get('FastestLap', {}).get('rank') == '1',
+            'team': result['Constructor']['name'],
+        }
+
+    qualifying_positions = {
+        quali_race['round']: int(quali_race['QualifyingResults'][0]['position'])
+        for quali_race in qualifying
+        if quali_race['QualifyingResults']
+    }
+
+    return {
+        'races': rounds,
+        'qualifying': qualifying_positions,
+        'team': list(rounds.values())[-1]['team'] if rounds else "Unknown",
+    }
+
+
+def _average(values: list) -> float:
+    return round(sum(values) / len(values), 1) if values else 20.0
+
+
+def season_stats(document: dict, race_wins: int = 0, quali_wins: int = 0) -> dict:
+    """Statistiques individuelles d'une saison (+ duels gagnés contre un adversaire)"""
+    races = list(document['races'].values())
+    quali_positions = list(document['qualifying'].values())
+    race_finishes = [race['position'] for race in races if race['finished']]
+
+    return {
+        'wins': sum(race['position'] == 1 for race in races),
+        'podiums': sum(race['position'] <= 3 for race in races),
+        'poles': sum(position == 1 for position in quali_positions),
+        'points': sum(race['points'] for race in races),
+        'dnfs': sum(not race['finished'] for race in races),
+        'raceFinishes': race_finishes,
+        'qualiPositions': quali_positions,
+        'qualiWins': quali_wins,
+        'raceWins': race_wins,
+        'fastestLaps': sum(race['fastestLap'] for race in races),
+        'avgRacePosition': _average(race_finishes),
+        'avgQualiPosition': _average(quali_positions),
+    }
+
+
+def duel(document1: dict, document2: dict) -> dict:
+    """
+    Duels manche par manche entre deux pilotes.
+
+    - Course : comptée si les deux pilotes sont classés
+    - Qualification : comptée si les deux ont un classement
+    """
+    race_wins = [0, 0]
+    for round_num, race1 in document1['races'].items():
+        race2 = document2['races'].get(round_num)
+        if race2 is None or not (race1['finished'] and race2['finished']):
+            continue
+        if race1['position'] < race2['position']:
+            race_wins[0] += 1
+        elif race2['position'] < race1['position']:
+            race_wins[1] += 1
+
+    quali_wins = [0, 0]
+    for round_num, position1 in document1['qualifying'].items():
+        position2 = document2['qualifying'].get(round_num)
+        if position2 is None:
+            continue
+        quali_wins[0 if position1 < position2 else 1] += 1
+
+    shared = document1['races'].keys() & document2['races'].keys()
+    return {
+        'raceWins': race_wins,
+        'qualiWins': quali_wins,
+        'sharedRaces': len(shared),
+        'teammates': any(document1['races'][r]['team'] == document2['races'][r]['team'] for r in shared),
+    }
+
+
+def head_to_head(document1: dict, document2: dict) -> Tuple[dict, dict]:
+    """Statistiques des deux pilotes, duels inclus (format /api/studio/head-to-head)"""
+    result = duel(document1, document2)
+    return (
+        season_stats(document1, result['raceWins'][0], result['qualiWins'][0]),
+        season_stats(document2, result['raceWins'][1], result['qualiWins'][1]),
+    )
+
+
+def duel_matrix(documents: dict, teammates_only: bool = False) -> List[dict]:
+    """
+    Tous les duels d'une grille.
+
+    Args:
+        documents: {driverId: document driver_season} - l'identifiant Ergast,
+            pas le code à 3 lettres (non unique avant ~2005)
+        teammates_only: ne garder que les paires ayant partagé une équipe
+    """
+    pairings = []
+    for driver1, driver2 in combinations(documents, 2):
+        result = duel(documents[driver1], documents[driver2])
+        if teammates_only and not result['teammates']:
+            continue
+        pairings.append({'driver1': driver1, 'driver2': driver2, **result})
+    return pairings
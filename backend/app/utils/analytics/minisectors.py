@@ -0,0 +1,102 @@
+import numpy as np
+from typing import List
+
+# Nombre de mini-secteurs par défaut et bornes acceptées
+DEFAULT_MINISECTORS = 25
+MAX_MINISECTORS = 200
+
+
+def minisector_bounds(grid: dict, n: int) -> np.ndarray:
+    """Indices de grille des n+1 frontières de mini-secteurs (distances égales)"""
+    targets = np.linspace(0.0, grid['lapLength'], n + 1)
+    return np.searchsorted(grid['distance'], targets).clip(0, len(grid['distance']) - 1)
+
+
+def minisector_times(grid: dict, n: int) -> np.ndarray:
+    """
+    Matrice pilotes × mini-secteurs des temps (s), en une opération :
+    temps interpolé aux frontières, puis différence.
+    """
+    targets = np.linspace(0.0, grid['lapLength'], n + 1)
+    times = grid['channels']['Time']
+
+    # Interpolation linéaire vectorisée sur toutes les lignes
+    idx = np.searchsorted(grid['distance'], targets).clip(1, len(grid['distance']) - 1)
+    d0, d1 = grid['distance'][idx - 1], grid['distance'][idx]
+    weight = (targets - d0) / np.where(d1 > d0, d1 - d0, 1.0)
+    at_bounds = times[:, idx - 1] + (times[:, idx] - times[:, idx - 1]) * weight
+
+    return np.diff(at_bounds, axis=1)
+
+
+def minisector_dominance(grid: dict, n: int = DEFAULT_MINISECTORS) -> dict:
+    """
+    Carte de domination : pilote le plus rapide par mini-secteur et tour théorique.
+
+    Returns:
+        {'segments', 'lapLength', 'theoreticalBest', 'bestLap', 'minisectors',
+         'drivers', 'track'}
+    """
+    drivers: List[str] = grid['drivers']
+    times = minisector_times(grid, n)
+    valid = np.isfinite(times).all(axis=1)
+
+    masked = np.where(np.isfinite(times), times, np.inf)
+    fastest = masked.argmin(axis=0)
+    best_times = masked.min(axis=0)
+    second = np.partition(masked, 1, axis=0)[1] if len(drivers) > 1 else best_times
+
+    lap_times = np.where(valid, times.sum(axis=1), np.nan)
+    theoretical_best = float(best_times.sum())
+    best_lap = float(np.nanmin(lap_times)) if valid.any() else None
+
+    bounds = minisector_bounds(grid, n)
+    targets = np.linspace(0.0, grid['lapLength'], n + 1)
+    wins = np.bincount(fastest, minlength=len(drivers))
+
+    minisectors = [
+        {
+            'index': i + 1,
+            'startDistance': round(float(targets[i]), 1),
+            'endDistance': round(float(targets[i + 1]), 1),
+            'startIdx': int(bounds[i]),
+            'endIdx': int(bounds[i + 1]),
+            'fastestDriver': drivers[fastest[i]],
+            'time': round(float(best_times[i]), 3),
+            'marginToSecond': round(float(second[i] - best_times[i]), 3) if np.isfinite(second[i]) else None,
+        }
+        for i in range(n)
+    ]
+
+    driver_rows = []
+    for row, driver in enumerate(drivers):
+        if not valid[row]:
+            continue
+        driver_rows.append({
+            'driver': driver,
+            'lapTime': round(float(lap_times[row]), 3),
+            'gapToTheoretical': round(float(lap_times[row] - theoretical_best), 3),
+            'minisectorsWon': int(wins[row]),
+            'times': [round(float(t), 3) for t in times[row]],
+            'deltas': [round(float(t), 3) for t in times[row] - best_times],
+        })
+    driver_rows.sort(key=lambda r: r['lapTime'])
+
+    # Tracé de référence : trajectoire du pilote le plus rapide
+    reference = int(np.nanargmin(lap_times)) if valid.any() else 0
+    x = grid['channels']['X'][reference]
+    y = grid['channels']['Y'][reference]
+
+    return {
+        'segments': n,
+        'lapLength': round(grid['lapLength'], 1),
+        'theoreticalBest': round(theoretical_best, 3),
+        'bestLap': round(best_lap, 3) if best_lap is not None else None,
+        'minisectors': minisectors,
+        'drivers': driver_rows,
+        'track': {
+            'distance': [round(float(d), 1) for d in grid['distance']],
+            'x': [round(float(v), 1) if np.isfinite(v) else None for v in x],
+            'y': [round(float(v), 1) if np.isfinite(v) else None for v in y],
+        },
+    }
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+# Stratégies disponibles pour ?outlier_method=
+OUTLIER_STRATEGIES = ('median', 'mad', 'pit_sc')
+
+# Colonnes filtrées et seuil "médiane + X secondes" associé
+OUTLIER_COLUMNS = {
+    'LapTime': 20,
+    'Sector1Time': 10,
+    'Sector2Time': 10,
+    'Sector3Time': 10,
+}
+
+# Z-score robuste au-delà duquel un temps est un outlier (Iglewicz & Hoaglin)
+MAD_Z_THRESHOLD = 3.5
+
+# Codes TrackStatus FastF1 : 4 = Safety Car, 5 = Red Flag, 6/7 = VSC
+NEUTRALISED_STATUSES = ('4', '5', '6', '7')
+
+
+def lap_matrix(laps: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Matrice pilotes × tours (index Driver, colonnes LapNumber) d'une colonne des laps"""
+    values = laps[column]
+    if pd.api.types.is_timedelta64_dtype(values):
+        values = values.dt.total_seconds()
+
+    frame = pd.DataFrame({
+        'Driver': laps['Driver'].astype(str).values,
+        'LapNumber': pd.to_numeric(laps['LapNumber'], errors='coerce').values,
+        'Value': values.values,
+    }).dropna(subset=['LapNumber'])
+    frame['LapNumber'] = frame['LapNumber'].astype(int)
+
+    return frame.pivot_table(index='Driver', columns='LapNumber', values='Value', aggfunc='first', dropna=False)
+
+
+def median_offset_mask(values: np.ndarray, offset: float) -> np.ndarray:
+    """Outlier si temps > médiane du pilote + offset (règle historique de filter_pit_stops)"""
+    with np.errstate(invalid='ignore'):
+        median = np.nanmedian(values, axis=1, keepdims=True)
+        return values > median + offset
+
+
+def mad_mask(values: np.ndarray, z_threshold: float = MAD_Z_THRESHOLD) -> np.ndarray:
+    """Outlier si |z-score robuste| > z_threshold (médiane / MAD par pilote)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        median = np.nanmedian(values, axis=1, keepdims=True)
+        mad = np.nanmedian(np.abs(values - median), axis=1, keepdims=True)
+        z = 0.6745 * (values - median) / mad
+        return np.abs(z) > z_threshold
+
+
+def pit_sc_mask(laps: pd.DataFrame, index: pd.Index, columns: pd.Index) -> np.ndarray:
+    """Outlier si tour d'entrée/sortie des stands ou tour neutralisé (SC, VSC, drapeau rouge)"""
+    flags = pd.DataFrame({
+        'Driver': laps['Driver'].astype(str).values,
+        'LapNumber': pd.to_numeric(laps['LapNumber'], errors='coerce').values,
+        'Pit': (laps['PitInTime'].notna() | laps['PitOutTime'].notna()).values,
+    })
+
+    if 'TrackStatus' in laps:
+        status = laps['TrackStatus'].fillna('').astype(str)
+        flags['Neutralised'] = status.apply(lambda s: any(code in s for code in NEUTRALISED_STATUSES)).values
+    else:
+        flags['Neutralised'] = False
+
+    flags = flags.dropna(subset=['LapNumber'])
+    flags['LapNumber'] = flags['LapNumber'].astype(int)
+    flags['Flag'] = flags['Pit'] | flags['Neutralised']
+
+    matrix = flags.pivot_table(index='Driver', columns='LapNumber', values='Flag', aggfunc='max')
+    return matrix.reindex(index=index, columns=columns).fillna(False).to_numpy(dtype=bool)
+
+
+def compute_outlier_masks(laps: pd.DataFrame, strategy: str = 'median') -> Dict[str, pd.DataFrame]:
+    """
+    Masques d'outliers pilotes × tours pour chaque colonne de OUTLIER_COLUMNS.
+
+    Strategies:
+        median : médiane du pilote + 20s (tour) / + 10s (secteur)
+        mad    : z-score robuste (MAD) > 3.5
+        pit_sc : tours de stands et tours neutralisés (SC/VSC/drapeau rouge)
+
+    Returns:
+        {colonne: DataFrame bool (index Driver, colonnes LapNumber)}
+    """
+    if strategy not in OUTLIER_STRATEGIES:
+        raise ValueError(f"Unknown outlier strategy '{strategy}'. Available: {', '.join(OUTLIER_STRATEGIES)}")
+
+    masks = {}
+    context = None
+    for column, offset in OUTLIER_COLUMNS.items():
+        if column not in laps:
+            continue
+
+        matrix = lap_matrix(laps, column)
+        values = matrix.to_numpy(dtype=float)
+
+        if strategy == 'median':
+            mask = median_offset_mask(values, offset)
+        elif strategy == 'mad':
+            mask = mad_mask(values)
+        else:
+            if context is None:
+                context = pit_sc_mask(laps, matrix.index, matrix.columns)
+            mask = context
+
+        masks[column] = pd.DataFrame(mask, index=matrix.index, columns=matrix.columns)
+
+    return masks
+
+
+def apply_mask(values: List[Optional[float]], lap_numbers: List[int], mask: Optional[pd.DataFrame], driver: str) -> List[Optional[float]]:
+    """Remplace par None les valeurs marquées outlier pour ce pilote"""
+    if mask is None or driver not in mask.index:
+        return values
+
+    flags = mask.loc[driver].reindex(lap_numbers).fillna(False).to_numpy(dtype=bool)
+    return [None if flagged else value for value, flagged in zip(values, flags)]
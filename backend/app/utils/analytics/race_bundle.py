@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+from app.utils.analytics.stints import stints_to_pit_stops, stints_to_strategies
+
+# Sections du bundle = réponse de chaque endpoint historique
+RACE_BUNDLE_SECTIONS = (
+    'raceData',
+    'pitStops',
+    'raceEvents',
+    'positionEvolution',
+    'strategyComparison',
+)
+
+
+def _lap_table(laps: pd.DataFrame) -> pd.DataFrame:
+    """Colonnes utiles des laps, typées une seule fois (secondes, int, NaN)"""
+    table = pd.DataFrame({
+        'Driver': laps['Driver'].astype(str).values,
+        'Team': laps['Team'].astype(str).values if 'Team' in laps else 'Unknown',
+        'LapNumber': pd.to_numeric(laps['LapNumber'], errors='coerce').values,
+        'Position': pd.to_numeric(laps['Position'], errors='coerce').values,
+        'LapTime': laps['LapTime'].dt.total_seconds().values,
+        'Compound': laps['Compound'].fillna('UNKNOWN').astype(str).values if 'Compound' in laps else 'UNKNOWN',
+        'TyreLife': pd.to_numeric(laps['TyreLife'], errors='coerce').fillna(0).values,
+        'Stint': pd.to_numeric(laps['Stint'], errors='coerce').fillna(1).values if 'Stint' in laps else 1,
+        'PitOutTime': laps['PitOutTime'].notna().values,
+        'PitInTime': laps['PitInTime'].notna().values,
+    }).dropna(subset=['LapNumber'])
+    table['LapNumber'] = table['LapNumber'].astype(int)
+    return table
+
+
+def _race_data(table: pd.DataFrame, drivers: List[str], max_lap: int, event) -> dict:
+    ordered = table.assign(SortPosition=table['Position'].fillna(99)).sort_values(
+        ['LapNumber', 'SortPosition'], kind='stable'
+    )
+    lap_times = ordered['LapTime'].to_numpy()
+
+    by_lap = {lap: [] for lap in range(1, max_lap + 1)}
+    for row, lap_time in zip(ordered.itertuples(index=False), lap_times):
+        by_lap[row.LapNumber].append({
+            'driver': row.Driver,
+            'team': row.Team,
+            'position': int(row.SortPosition),
+            'lapTime': float(lap_time) if np.isfinite(lap_time) else None,
+            'compound': row.Compound,
+            'tyreLife': int(row.TyreLife),
+            'stint': int(row.Stint),
+            'pitOutTime': bool(row.PitOutTime),
+            'pitInTime': bool(row.PitInTime),
+        })
+
+    return {
+        'raceData': [{'lapNumber': lap, 'positions': positions} for lap, positions in by_lap.items()],
+        'totalLaps': max_lap,
+        'circuitName': event['EventName'],
+        'country': event['Country']
+    }
+
+
+def _race_events(table: pd.DataFrame, positions: pd.DataFrame, max_lap: int) -> dict:
+    events = []
+    lap_range = np.arange(1, max_lap + 1)
+
+    # Changements de leader
+    leaders = table[table['Position'] == 1].drop_duplicates('LapNumber').set_index('LapNumber')['Driver']
+    leaders = leaders.reindex(lap_range)
+    previous = leaders.shift(1)
+    changed = leaders.notna() & previous.notna() & (leaders != previous)
+    for lap in leaders.index[changed]:
+        events.append({
+            'lap': int(lap),
+            'type': 'LEAD_CHANGE',
+            'description': f'{leaders[lap]} takes the lead from {previous[lap]}',
+            'driver': str(leaders[lap]),
+            'severity': 'high'
+        })
+
+    # Abandons : dernier tour bouclé trop tôt
+    last_laps = table.groupby('Driver', sort=False)['LapNumber'].max()
+    for driver, last_lap in last_laps[last_laps < max_lap - 2].items():
+        events.append({
+            'lap': int(last_lap),
+            'type': 'DNF',
+            'description': f'{driver} retired from the race',
+            'driver': str(driver),
+            'severity': 'critical'
+        })
+
+    # Meilleur tour de la course
+    valid = table[np.isfinite(table['LapTime'])].sort_values('LapNumber', kind='stable')
+    if not valid.empty:
+        fastest = valid.loc[valid['LapTime'].idxmin()]
+        events.append({
+            'lap': int(fastest['LapNumber']),
+            'type': 'FASTEST_LAP',
+            'description': f'{fastest["Driver"]} sets fastest lap: {fastest["LapTime"]:.3f}s',
+            'driver': str(fastest['Driver']),
+            'severity': 'info'
+        })
+
+    # Gains de 3 places ou plus d'un tour à l'autre (matrice pilotes × tours)
+    matrix = positions.to_numpy(dtype=float)
+    with np.errstate(invalid='ignore'):
+        gains = matrix[:, :-1] - matrix[:, 1:]
+        driver_idx, lap_idx = np.nonzero(gains >= 3)
+    order = np.lexsort((driver_idx, lap_idx))
+    for d, l in zip(driver_idx[order], lap_idx[order]):
+        driver = positions.index[d]
+        prev_position = int(matrix[d, l])
+        curr_position = int(matrix[d, l + 1])
+        events.append({
+            'lap': int(positions.columns[l + 1]),
+            'type': 'OVERTAKE',
+            'description': f'{driver} gains {prev_position - curr_position} positions (P{prev_position} → P{curr_position})',
+            'driver': str(driver),
+            'severity': 'medium'
+        })
+
+    events.sort(key=lambda x: x['lap'])
+    return {'events': events}
+
+
+def _position_evolution(table: pd.DataFrame, positions: pd.DataFrame, drivers: List[str]) -> dict:
+    evolution = []
+    for lap, column in positions.items():
+        lap_positions = {'lap': int(lap)}
+        lap_positions.update({driver: int(pos) for driver, pos in column.dropna().items()})
+        evolution.append(lap_positions)
+
+    teams = table.drop_duplicates('Driver').set_index('Driver')['Team']
+    return {
+        'evolution': evolution,
+        'drivers': drivers,
+        'teams': teams.to_dict()
+    }
+
+
+def build_race_bundle(laps: pd.DataFrame, event, stints: pd.DataFrame) -> dict:
+    """
+    Calcule toutes les sections d'analyse de course en une passe sur les laps.
+
+    Args:
+        laps: session.laps d'une course
+        event: session.event (EventName, Country)
+        stints: table des relais (voir extract_stints)
+
+    Returns:
+        dict {section: réponse} pour chaque section de RACE_BUNDLE_SECTIONS
+    """
+    table = _lap_table(laps)
+    max_lap = int(table['LapNumber'].max()) if not table.empty else 0
+    drivers = list(pd.unique(table['Driver']))
+
+    # Matrice des positions pilotes × tours (1..max_lap), partagée
+    positions = table.pivot_table(index='Driver', columns='LapNumber', values='Position', aggfunc='first')
+    positions = positions.reindex(index=drivers, columns=range(1, max_lap + 1))
+
+    return {
+        'raceData': _race_data(table, drivers, max_lap, event),
+        'pitStops': {'pitStops': stints_to_pit_stops(stints)},
+        'raceEvents': _race_events(table, positions, max_lap),
+        'positionEvolution': _position_evolution(table, positions, drivers),
+        'strategyComparison': {'strategies': stints_to_strategies(stints)},
+    }
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+SECTOR_COLUMNS = ('Sector1Time', 'Sector2Time', 'Sector3Time')
+
+
+def _lap_frame(laps: pd.DataFrame) -> pd.DataFrame:
+    """Temps (s) de tous les tours de la session, tours supprimés (track limits) exclus"""
+    frame = pd.DataFrame({
+        'Driver': laps['Driver'].astype(str).values,
+        'Team': laps['Team'].astype(str).values if 'Team' in laps else '',
+        'LapNumber': pd.to_numeric(laps['LapNumber'], errors='coerce').values,
+        'LapTime': laps['LapTime'].dt.total_seconds().values,
+    })
+    for column in SECTOR_COLUMNS:
+        frame[column] = laps[column].dt.total_seconds().values
+
+    if 'Deleted' in laps:
+        deleted = laps['Deleted'].fillna(False).astype(bool).values
+        frame.loc[deleted, ['LapTime', *SECTOR_COLUMNS]] = np.nan
+
+    return frame.dropna(subset=['LapNumber'])
+
+
+def sector_statistics(laps: pd.DataFrame) -> dict:
+    """
+    Table des secteurs de TOUTE la session en un groupby :
+    meilleurs secteurs personnels, meilleurs secteurs absolus (violets),
+    tour théorique et écart au meilleur tour réel.
+
+    Returns:
+        {'overall': {secteur: {'time', 'driver', 'lapNumber'}},
+         'theoreticalBest', 'drivers': [...] triés par tour théorique}
+    """
+    frame = _lap_frame(laps)
+    if frame.empty:
+        return {'overall': {}, 'theoreticalBest': None, 'drivers': []}
+
+    grouped = frame.groupby('Driver', sort=False)
+    personal = grouped[['LapTime', *SECTOR_COLUMNS]].min()
+    teams = grouped['Team'].first()
+
+    # Numéro du tour de chaque meilleur temps personnel
+    best_lap_numbers = {}
+    for column in ('LapTime', *SECTOR_COLUMNS):
+        idx = frame[column].groupby(frame['Driver'], sort=False).idxmin().dropna()
+        best_lap_numbers[column] = frame.loc[idx.astype(int), 'LapNumber'].set_axis(idx.index)
+
+    overall_best = personal[list(SECTOR_COLUMNS)].min()
+    overall_holder = personal[list(SECTOR_COLUMNS)].idxmin()
+    purple = personal[list(SECTOR_COLUMNS)].eq(overall_best)
+
+    theoretical = personal[list(SECTOR_COLUMNS)].sum(axis=1, min_count=len(SECTOR_COLUMNS))
+    session_theoretical = overall_best.sum(min_count=len(SECTOR_COLUMNS))
+
+    def optional(value, digits=3):
+        return round(float(value), digits) if pd.notna(value) else None
+
+    drivers: List[dict] = []
+    for driver, row in personal.iterrows():
+        best_lap = row['LapTime']
+        drivers.append({
+            'driver': driver,
+            'team': teams[driver],
+            'bestLap': optional(best_lap),
+            'bestLapNumber': int(best_lap_numbers['LapTime'][driver]) if driver in best_lap_numbers['LapTime'] else None,
+            'sectors': [
+                {
+                    'sector': i + 1,
+                    'time': optional(row[column]),
+                    'lapNumber': int(best_lap_numbers[column][driver]) if driver in best_lap_numbers[column] else None,
+                    'purple': bool(purple.loc[driver, column]),
+                    'gapToOverall': optional(row[column] - overall_best[column]),
+                }
+                for i, column in enumerate(SECTOR_COLUMNS)
+            ],
+            'theoreticalBest': optional(theoretical[driver]),
+            'gapToTheoretical': optional(best_lap - theoretical[driver]),
+            'gapToSessionTheoretical': optional(theoretical[driver] - session_theoretical),
+        })
+
+    drivers.sort(key=lambda d: (d['theoreticalBest'] is None, d['theoreticalBest'] or 0))
+
+    return {
+        'overall': {
+            f"sector{i + 1}": {
+                'time': optional(overall_best[column]),
+                'driver': overall_holder[column] if pd.notna(overall_best[column]) else None,
+                'lapNumber': int(best_lap_numbers[column][overall_holder[column]]) if pd.notna(overall_best[column]) else None,
+            }
+            for i, column in enumerate(SECTOR_COLUMNS)
+        },
+        'theoreticalBest': optional(session_theoretical),
+        'bestLap': optional(personal['LapTime'].min()),
+        'drivers': drivers,
+    }
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+
+def _positions(points: np.ndarray, finishes: np.ndarray, entered: np.ndarray) -> np.ndarray:
+    """
+    Rang après chaque manche, en une passe vectorisée sur (manches × concurrents × concurrents).
+
+    Départage FIA : points, puis nombre de victoires, de 2es places, etc.
+    Les concurrents pas encore engagés n'ont pas de rang (0).
+
+    Args:
+        points: (R, E) points cumulés
+        finishes: (R, E, P) nombre cumulé de chaque place en Grand Prix
+        entered: (R, E) concurrent déjà classé au moins une fois
+    """
+    keys = np.concatenate([points[:, :, None], finishes], axis=2)
+    diff = keys[:, :, None, :] - keys[:, None, :, :]
+
+    # Signe de la première clé qui diffère (ordre lexicographique)
+    first = (diff != 0).argmax(axis=3)
+    sign = np.take_along_axis(diff, first[..., None], axis=3)[..., 0]
+
+    ahead = (sign < 0) & entered[:, None, :]
+    return np.where(entered, 1 + ahead.sum(axis=2), 0)
+
+
+def _progression(df: pd.DataFrame, key: str, rounds: np.ndarray, official: Optional[pd.DataFrame] = None) -> dict:
+    """
+    Points cumulés et rangs par manche pour une dimension (pilote ou écurie).
+    `official` ({'round', key, 'points', 'position'}) remplace, pour les
+    manches qu'il couvre, les sommes et rangs calculés.
+    """
+    entities = df[key].unique()
+    r = np.searchsorted(rounds, df['round'].to_numpy())
+    e = pd.Index(entities).get_indexer(df[key])
+
+    points = np.zeros((len(rounds), len(entities)))
+    np.add.at(points, (r, e), df['points'].to_numpy(dtype=float))
+    points = points.cumsum(axis=0)
+
+    entered = np.zeros((len(rounds), len(entities)), dtype=bool)
+    entered[r, e] = True
+    entered = np.logical_or.accumulate(entered, axis=0)
+
+    race = (df['kind'] == 'race').to_numpy() & df['position'].notna().to_numpy()
+    max_position = int(df.loc[race, 'position'].max()) if race.any() else 1
+    finishes = np.zeros((len(rounds), len(entities), max_position))
+    np.add.at(finishes, (r[race], e[race], df.loc[race, 'position'].to_numpy(dtype=int) - 1), 1)
+    finishes = finishes.cumsum(axis=0)
+    positions = _positions(points, finishes, entered)
+
+    if official is not None and not official.empty:
+        official_r = np.searchsorted(rounds, official['round'].to_numpy())
+        official_e = pd.Index(entities).get_indexer(official[key])
+        known = (official_r < len(rounds)) & (official_e >= 0)
+        known[known] = rounds[official_r[known]] == official['round'].to_numpy()[known]
+        official_r, official_e, official = official_r[known], official_e[known], official[known]
+
+        points[official_r, official_e] = official['points'].to_numpy(dtype=float)
+        ranked = official['position'].notna().to_numpy()
+        positions[official_r[ranked], official_e[ranked]] = official.loc[ranked, 'position'].to_numpy(dtype=int)
+
+    return {
+        'entities': entities,
+        'points': np.round(points, 2),
+        'positions': positions,
+        'entered': entered,
+    }
+
+
+def standings_progression(rows: List[dict], official: Optional[dict] = None) -> dict:
+    """
+    Classements pilotes et constructeurs après chaque manche, calculés
+    localement par sommes cumulées des points de chaque résultat.
+
+    Les points Ergast de chaque résultat intègrent déjà le barème de la saison
+    (meilleur tour, demi-points...) ; ceux des sprints sont ajoutés à leur manche.
+    Une somme ne suit pas les résultats retirés (saisons à résultats décomptés,
+    avant 1991) ni les exclusions : les classements officiels de `official`
+    priment sur les manches qu'ils couvrent.
+
+    Args:
+        rows: [{'round', 'kind' ('race' | 'sprint'), 'position', 'points',
+                'driver_id', 'code', 'driver', 'constructor_id', 'constructor_name'}, ...]
+        official: {'drivers': [{'round', 'driver_id', 'points', 'position'}],
+                   'constructors': [{'round', 'constructor_id', 'points', 'position'}]}
+                  (voir ErgastMirror.official_standings)
+
+    Returns:
+        {'rounds': [...], 'drivers': [...], 'constructors': [...]}, chaque
+        entrée avec 'points' et 'positions' (une valeur par manche, None
+        avant la première participation), triées par classement final.
+    """
+    if not rows:
+        return {'rounds': [], 'drivers': [], 'constructors': []}
+
+    df = pd.DataFrame(rows)
+    rounds = np.sort(df['round'].unique())
+
+    # Dernière équipe / dernier nom connus de chaque pilote (par driver_id :
+    # les codes à 3 lettres ne sont pas uniques avant ~2005) et écurie
+    latest = df.sort_values('round').groupby('driver_id').last()
+    team_names = df.sort_values('round').groupby('constructor_id')['constructor_name'].last()
+
+    def records(progression: dict, describe) -> list:
+        result = []
+        for i, entity in enumerate(progression['entities']):
+            entered = progression['entered'][:, i]
+            result.append({
+                **describe(entity),
+                'points': [float(p) if ok else None for p, ok in zip(progression['points'][:, i], entered)],
+                'positions': [int(p) if ok else None for p, ok in zip(progression['positions'][:, i], entered)],
+            })
+        result.sort(key=lambda record: record['positions'][-1] or len(result) + 1)
+        return result
+
+    official = official or {}
+    drivers = _progression(df, 'driver_id', rounds, pd.DataFrame(official.get('drivers', [])))
+    constructors = _progression(df, 'constructor_id', rounds, pd.DataFrame(official.get('constructors', [])))
+
+    return {
+        'rounds': [int(r) for r in rounds],
+        'drivers': records(drivers, lambda driver_id: {
+            'driverId': driver_id,
+            'code': latest.at[driver_id, 'code'],
+            'driver': latest.at[driver_id, 'driver'],
+            'team': latest.at[driver_id, 'constructor_name'],
+        }),
+        'constructors': records(constructors, lambda constructor_id: {
+            'team': team_names[constructor_id],
+        }),
+    }
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+STINT_COLUMNS = [
+    'Driver', 'Team', 'Stint', 'Compound', 'StartLap', 'EndLap', 'Length',
+    'TyreLifeStart', 'PitOutTime', 'PitInTime', 'PitLaneTime',
+]
+
+
+def _seconds(series: pd.Series) -> pd.Series:
+    """Timedelta → secondes (float, NaN si absent)"""
+    if pd.api.types.is_timedelta64_dtype(series):
+        return series.dt.total_seconds()
+    return pd.to_numeric(series, errors='coerce')
+
+
+def extract_stints(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Table des relais d'une session, calculée en une passe (run-length encoding).
+
+    Un nouveau relais commence à chaque changement de pilote ou de numéro de
+    Stint FastF1 (ou de composé si Stint est absent).
+
+    Colonnes:
+        Driver, Team, Stint (1..n par pilote), Compound, StartLap, EndLap,
+        Length, TyreLifeStart, PitOutTime (s, 1er tour du relais),
+        PitInTime (s, dernier tour du relais), PitLaneTime (s, temps passé
+        dans la pit lane avant ce relais)
+    """
+    if laps.empty:
+        return pd.DataFrame(columns=STINT_COLUMNS)
+
+    frame = pd.DataFrame({
+        'Driver': laps['Driver'].astype(str).values,
+        'Team': laps['Team'].astype(str).values if 'Team' in laps else 'Unknown',
+        'LapNumber': pd.to_numeric(laps['LapNumber'], errors='coerce').values,
+        'StintKey': pd.to_numeric(laps['Stint'], errors='coerce').values if 'Stint' in laps else np.nan,
+        'Compound': laps['Compound'].values if 'Compound' in laps else None,
+        'TyreLife': pd.to_numeric(laps['TyreLife'], errors='coerce').values if 'TyreLife' in laps else np.nan,
+        'PitOutTime': _seconds(laps['PitOutTime']).values,
+        'PitInTime': _seconds(laps['PitInTime']).values,
+    }).dropna(subset=['LapNumber'])
+    # Garder l'ordre d'apparition des pilotes (ordre de session.laps)
+    frame['DriverOrder'] = pd.factorize(frame['Driver'])[0]
+    frame = frame.sort_values(['DriverOrder', 'LapNumber'], kind='stable').reset_index(drop=True)
+
+    # Clé de relais : Stint FastF1, sinon le composé
+    key = frame['StintKey'].where(frame['StintKey'].notna(), frame['Compound'].astype(str))
+    new_run = (frame['Driver'] != frame['Driver'].shift()) | (key != key.shift())
+    run_id = new_run.cumsum()
+
+    stints = frame.groupby(run_id, sort=False).agg(
+        Driver=('Driver', 'first'),
+        Team=('Team', 'first'),
+        Compound=('Compound', 'first'),
+        StartLap=('LapNumber', 'min'),
+        EndLap=('LapNumber', 'max'),
+        Length=('LapNumber', 'size'),
+        TyreLifeStart=('TyreLife', 'first'),
+        PitOutTime=('PitOutTime', 'first'),
+        PitInTime=('PitInTime', 'last'),
+    ).reset_index(drop=True)
+
+    stints['Stint'] = stints.groupby('Driver', sort=False).cumcount() + 1
+    stints['Compound'] = stints['Compound'].fillna('UNKNOWN').astype(str)
+    stints['StartLap'] = stints['StartLap'].astype(int)
+    stints['EndLap'] = stints['EndLap'].astype(int)
+    stints['PitLaneTime'] = stints['PitOutTime'] - stints.groupby('Driver', sort=False)['PitInTime'].shift(1)
+
+    return stints[STINT_COLUMNS]
+
+
+def _optional(value, cast=float):
+    return cast(value) if pd.notna(value) else None
+
+
+def stints_to_strategies(stints: pd.DataFrame) -> List[dict]:
+    """Format /api/strategy-comparison"""
+    strategies = []
+    for driver, driver_stints in stints.groupby('Driver', sort=False):
+        strategies.append({
+            'driver': str(driver),
+            'team': str(driver_stints['Team'].iloc[0]),
+            'stints': [
+                {
+                    'stint': int(s.Stint),
+                    'compound': s.Compound,
+                    'startLap': int(s.StartLap),
+                    'laps': int(s.Length),
+                }
+                for s in driver_stints.itertuples(index=False)
+            ],
+            'totalStops': len(driver_stints) - 1
+        })
+    return strategies
+
+
+def stints_to_pit_stops(stints: pd.DataFrame) -> List[dict]:
+    """
+    Format /api/pit-stops : un arrêt par relais après le premier.
+    `lap` est le tour de sortie des stands (1er tour du nouveau relais).
+    """
+    stops = stints[stints['Stint'] > 1].sort_values('StartLap', kind='stable')
+    return [
+        {
+            'driver': s.Driver,
+            'team': s.Team,
+            'lap': int(s.StartLap),
+            'duration': _optional(s.PitLaneTime),
+            'compound': s.Compound,
+            'tyreLife': _optional(s.TyreLifeStart, int) or 0,
+            'stint': int(s.Stint),
+        }
+        for s in stops.itertuples(index=False)
+    ]
@@ -0,0 +1,202 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from itertools import combinations, product
+from typing import Dict, Optional, Tuple
+
+from app.utils.analytics.degradation import FUEL_EFFECT_PER_LAP, compound_summary
+
+# Composés slicks simulés (les pneus pluie ne sont pas modélisés)
+DRY_COMPOUNDS = ('SOFT', 'MEDIUM', 'HARD')
+
+# Perte au stand par défaut si la course n'en fournit pas d'estimation (s)
+DEFAULT_PIT_LOSS = 22.0
+
+
+def estimate_pit_loss(laps: pd.DataFrame, stints: pd.DataFrame) -> Optional[float]:
+    """
+    Perte de temps médiane d'un arrêt : (in-lap + out-lap) - 2 × tour médian du pilote.
+    """
+    frame = pd.DataFrame({
+        'Driver': laps['Driver'].astype(str).values,
+        'LapNumber': pd.to_numeric(laps['LapNumber'], errors='coerce').values,
+        'LapTime': laps['LapTime'].dt.total_seconds().values,
+    }).dropna()
+    if frame.empty:
+        return None
+
+    frame['LapNumber'] = frame['LapNumber'].astype(int)
+    lap_times = frame.set_index(['Driver', 'LapNumber'])['LapTime']
+    lap_times = lap_times[~lap_times.index.duplicated()]
+    medians = frame.groupby('Driver')['LapTime'].median()
+
+    stops = stints[stints['Stint'] > 1]
+    in_laps = pd.MultiIndex.from_arrays([stops['Driver'], stops['StartLap'].astype(int) - 1])
+    out_laps = pd.MultiIndex.from_arrays([stops['Driver'], stops['StartLap'].astype(int)])
+
+    losses = (
+        lap_times.reindex(in_laps).to_numpy()
+        + lap_times.reindex(out_laps).to_numpy()
+        - 2 * medians.reindex(stops['Driver']).to_numpy()
+    )
+    losses = losses[np.isfinite(losses) & (losses > 0)]
+    return float(np.median(losses)) if len(losses) else None
+
+
+def build_compound_models(degradation: pd.DataFrame) -> Dict[str, Tuple[float, float]]:
+    """
+    {composé: (temps de base à pneu neuf et plein d'essence, dégradation s/tour)}
+    à partir des ajustements de fit_degradation (médiane par composé).
+    """
+    models = {}
+    for row in compound_summary(degradation):
+        if row['compound'] in DRY_COMPOUNDS:
+            models[row['compound']] = (row['baseLapTime'], max(row['medianDegradation'], 0.0))
+    return models
+
+
+def _stop_grid(total_laps: int, stops: int, min_stint: int) -> np.ndarray:
+    """Toutes les combinaisons de tours d'arrêt (S, stops) respectant min_stint"""
+    candidates = np.array(
+        list(combinations(range(min_stint, total_laps - min_stint + 1), stops)),
+        dtype=np.int32
+    ).reshape(-1, stops)
+    bounds = np.hstack([
+        np.zeros((len(candidates), 1), dtype=np.int32),
+        candidates,
+        np.full((len(candidates), 1), total_laps, dtype=np.int32),
+    ])
+    lengths = np.diff(bounds, axis=1)
+    return candidates[(lengths >= min_stint).all(axis=1)]
+
+
+def _pareto_front(times: np.ndarray, stops: np.ndarray, max_stints: np.ndarray) -> np.ndarray:
+    """Indices non dominés (minimiser temps, nombre d'arrêts et relais le plus long)"""
+    objectives = np.stack([times, stops, max_stints], axis=1)
+    le = (objectives[:, None, :] <= objectives[None, :, :]).all(axis=2)
+    lt = (objectives[:, None, :] < objectives[None, :, :]).any(axis=2)
+    dominated = (le & lt).any(axis=0)
+    return np.flatnonzero(~dominated)
+
+
+def simulate_strategies(
+    total_laps: int,
+    compounds: Dict[str, Tuple[float, float]],
+    pit_loss: float = DEFAULT_PIT_LOSS,
+    max_stops: int = 2,
+    min_stint: int = 5,
+    top: int = 10,
+    fuel_effect: float = FUEL_EFFECT_PER_LAP,
+) -> dict:
+    """
+    Évalue TOUTES les stratégies (tours d'arrêt × séquences de composés) en NumPy.
+
+    Modèle de temps au tour : base[c] + deg[c] × âge_pneu - fuel_effect × (tour - 1).
+    Le coût d'un relais de n tours est fermé (n × base + deg × n(n+1)/2) et
+    pré-tabulé pour chaque (composé, n) : chaque candidat n'est qu'une somme
+    de lookups. Règle sportive : au moins deux composés différents.
+
+    Returns:
+        {'best': top stratégies, 'pareto': front (temps, arrêts, relais max),
+         'candidates': nombre évalué}
+    """
+    names = list(compounds)
+    base = np.array([compounds[c][0] for c in names])
+    deg = np.array([compounds[c][1] for c in names])
+
+    n = np.arange(total_laps + 1)
+    stint_cost = base[:, None] * n + deg[:, None] * n * (n + 1) / 2  # (C, L+1)
+    fuel_total = -fuel_effect * (total_laps - 1) * total_laps / 2
+
+    best_rows, front_rows = [], []
+    evaluated = 0
+
+    for stops in range(1, max_stops + 1):
+        stop_laps = _stop_grid(total_laps, stops, min_stint)
+        if len(stop_laps) == 0:
+            continue
+
+        sequences = np.array(list(product(range(len(names)), repeat=stops + 1)), dtype=np.int32)
+        if len(names) > 1:
+            sequences = sequences[(sequences != sequences[:, :1]).any(axis=1)]
+
+        bounds = np.hstack([np.zeros((len(stop_laps), 1), dtype=np.int32), stop_laps, np.full((len(stop_laps), 1), total_laps, dtype=np.int32)])
+        lengths = np.diff(bounds, axis=1)  # (S, stints)
+
+        # (S, Q) : somme des coûts de relais par lookup
+        totals = np.zeros((len(stop_laps), len(sequences)))
+        for k in range(stops + 1):
+            totals += stint_cost[sequences[None, :, k], lengths[:, k, None]]
+        totals += stops * pit_loss + fuel_total
+        evaluated += totals.size
+
+        # Top N du bloc (marge pour les permutations équivalentes, dédupliquées plus bas)
+        flat = totals.ravel()
+        k_top = min(top * math.factorial(stops + 1), flat.size)
+        idx = np.argpartition(flat, k_top - 1)[:k_top]
+        s_idx, q_idx = np.unravel_index(idx, totals.shape)
+        for s, q in zip(s_idx, q_idx):
+            best_rows.append((totals[s, q], stops, stop_laps[s], sequences[q], lengths[s].max()))
+
+        # Meilleure séquence par grille d'arrêts, puis meilleure par relais max
+        best_q = totals.argmin(axis=1)
+        best_t = totals[np.arange(len(stop_laps)), best_q]
+        longest = lengths.max(axis=1)
+        order = np.lexsort((best_t, longest))
+        _, first = np.unique(longest[order], return_index=True)
+        for s in order[first]:
+            front_rows.append((best_t[s], stops, stop_laps[s], sequences[best_q[s]], longest[s]))
+
+    def to_record(row, reference):
+        total, stops, laps_, sequence, longest = row
+        return {
+            'stops': int(stops),
+            'stopLaps': [int(l) for l in laps_],
+            'compounds': [names[c] for c in sequence],
+            'longestStint': int(longest),
+            'totalTime': round(float(total), 3),
+            'gapToBest': round(float(total - reference), 3),
+        }
+
+    if not best_rows:
+        return {'best': [], 'pareto': [], 'candidates': 0}
+
+    # Le modèle étant sans mémoire, permuter les relais donne le même temps :
+    # on ne garde qu'une stratégie par ensemble {(longueur, composé)}
+    best_rows.sort(key=lambda r: r[0])
+    unique_rows, seen = [], set()
+    for row in best_rows:
+        lengths = np.diff(np.concatenate([[0], row[2], [total_laps]]))
+        key = (row[1], tuple(sorted(zip(lengths.tolist(), row[3].tolist()))))
+        if key not in seen:
+            seen.add(key)
+            unique_rows.append(row)
+    best_rows = unique_rows
+    reference = best_rows[0][0]
+
+    front = _pareto_front(
+        np.array([r[0] for r in front_rows]),
+        np.array([r[1] for r in front_rows]),
+        np.array([r[4] for r in front_rows]),
+    )
+    pareto = sorted((front_rows[i] for i in front), key=lambda r: r[0])
+
+    return {
+        'best': [to_record(r, reference) for r in best_rows[:top]],
+        'pareto': [to_record(r, reference) for r in pareto],
+        'candidates': int(evaluated),
+    }
+
+
+if __name__ == "__main__":
+    # Benchmark : grille complète 3 arrêts sur 70 tours, un seul cœur
+    models = {'SOFT': (91.2, 0.11), 'MEDIUM': (91.7, 0.07), 'HARD': (92.1, 0.045)}
+    for max_stops in (1, 2, 3):
+        simulate_strategies(70, models, max_stops=max_stops)
+        runs = []
+        for _ in range(5):
+            start = time.perf_counter()
+            result = simulate_strategies(70, models, max_stops=max_stops)
+            runs.append(time.perf_counter() - start)
+        print(f"max_stops={max_stops}: {result['candidates']:>9,} candidates in {min(runs) * 1000:7.1f} ms (best of 5)")
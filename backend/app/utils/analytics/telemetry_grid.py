@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+# Pas de ré-échantillonnage en distance (m)
+RESAMPLE_STEP = 5.0
+
+# Canaux conservés sur la grille commune
+GRID_CHANNELS = ('Time', 'Speed', 'Throttle', 'Brake', 'nGear', 'X', 'Y')
+
+
+def _lap_arrays(telemetry: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Canaux numériques d'un tour, distance remise à 0 au départ du tour
+    et rendue monotone (la télémétrie FastF1 est paddée d'un point de chaque côté).
+    """
+    frame = telemetry.dropna(subset=['Distance', 'Time'])
+    if len(frame) < 2:
+        return None
+
+    time = frame['Time'].dt.total_seconds().to_numpy()
+    start = time >= 0
+    if start.sum() < 2:
+        return None
+
+    arrays = {'Time': time[start] - time[start][0]}
+    distance = frame['Distance'].to_numpy(dtype=float)[start]
+    arrays['Distance'] = np.maximum.accumulate(distance - distance[0])
+
+    for channel in GRID_CHANNELS:
+        if channel != 'Time' and channel in frame:
+            arrays[channel] = frame[channel].to_numpy(dtype=float)[start]
+
+    return arrays if arrays['Distance'][-1] > 0 else None
+
+
+def build_telemetry_grid(telemetries: Dict[str, pd.DataFrame], step: float = RESAMPLE_STEP) -> Optional[dict]:
+    """
+    Ré-échantillonne la télémétrie d'un tour par pilote sur UNE grille de distance.
+
+    Chaque tour est ramené à la longueur de référence (médiane des tours) :
+    la fraction de tour parcourue est la même pour tous les pilotes à un
+    indice donné, ce qui permet des calculs pilotes × points en NumPy.
+
+    Args:
+        telemetries: {pilote: lap.get_telemetry().add_distance()}
+
+    Returns:
+        {'drivers': [...], 'distance': (P,), 'lapLength': float,
+         'channels': {canal: (D, P)}} ou None si aucun tour exploitable
+    """
+    laps = {driver: _lap_arrays(tel) for driver, tel in telemetries.items()}
+    laps = {driver: arrays for driver, arrays in laps.items() if arrays is not None}
+    if not laps:
+        return None
+
+    lap_length = float(np.median([arrays['Distance'][-1] for arrays in laps.values()]))
+    distance = np.arange(0.0, lap_length, step)
+    distance = np.append(distance, lap_length)
+    fraction = distance / lap_length
+
+    drivers = list(laps)
+    channels = {
+        channel: np.full((len(drivers), len(distance)), np.nan)
+        for channel in GRID_CHANNELS
+    }
+
+    for row, driver in enumerate(drivers):
+        arrays = laps[driver]
+        source = arrays['Distance'] / arrays['Distance'][-1]
+        for channel in GRID_CHANNELS:
+            if channel in arrays:
+                channels[channel][row] = np.interp(fraction, source, arrays[channel])
+
+    return {
+        'drivers': drivers,
+        'distance': distance,
+        'lapLength': lap_length,
+        'channels': channels,
+    }
@@ -1,9 +1,16 @@
 import os
 import pickle
+import struct
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 import hashlib
 
+# En-tête des fichiers écrits avec un TTL : marqueur + date d'expiration (timestamp)
+# Les anciens fichiers (pickle seul) expirent ttl_hours après leur écriture
+EXPIRY_MAGIC = b"F1CACHE1"
+EXPIRY_HEADER = struct.Struct("<d")
+
 class FastF1Cache:
     def __init__(self, cache_dir: str = "cache"):
         self.cache_dir = Path(cache_dir)
@@ -19,6 +26,32 @@ class FastF1Cache:
         """Retourne le chemin du fichier de cache"""
         return self.cache_dir / f"{cache_key}.pkl"
     
+    def _is_expired(self, cache_path: Path) -> bool:
+        """Expiration lue dans l'en-tête, ou ttl_hours après l'écriture pour un ancien fichier"""
+        with open(cache_path, 'rb') as f:
+            header = f.read(len(EXPIRY_MAGIC) + EXPIRY_HEADER.size)
+        
+        if header.startswith(EXPIRY_MAGIC):
+            return time.time() > EXPIRY_HEADER.unpack(header[len(EXPIRY_MAGIC):])[0]
+        
+        file_time = datetime.fromtimestamp(cache_path.stat().st_mtime)
+        return datetime.now() - file_time > timedelta(hours=self.ttl_hours)
+    
+    def _load(self, cache_path: Path):
+        with open(cache_path, 'rb') as f:
+            if f.read(len(EXPIRY_MAGIC)) == EXPIRY_MAGIC:
+                f.seek(len(EXPIRY_MAGIC) + EXPIRY_HEADER.size)
+            else:
+                f.seek(0)
+            return pickle.load(f)
+    
+    def _dump(self, cache_path: Path, data, ttl: int = None):
+        """Écrit un fichier avec son expiration (TTL en secondes, défaut: ttl_hours)"""
+        ttl = ttl if ttl is not None else self.ttl_hours * 3600
+        with open(cache_path, 'wb') as f:
+            f.write(EXPIRY_MAGIC + EXPIRY_HEADER.pack(time.time() + ttl))
+            pickle.dump(data, f)
+    
     def get(self, *args):
         """Récupère des données du cache si elles existent et sont valides"""
         cache_key = self._get_cache_key(*args)
@@ -27,27 +60,30 @@ class FastF1Cache:
         if not cache_path.exists():
             return None
         
-        # Vérifier si le cache n'est pas expiré
-        file_time = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        if datetime.now() - file_time > timedelta(hours=self.ttl_hours):
-            cache_path.unlink()  # Supprimer le cache expiré
-            return None
-        
         try:
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
+            # Vérifier si le cache n'est pas expiré
+            if self._is_expired(cache_path):
+                cache_path.unlink()  # Supprimer le cache expiré
+                return None
+            
+            return self._load(cache_path)
         except Exception as e:
             print(f"Erreur lecture cache: {e}")
             return None
     
-    def set(self, data, *args):
-        """Sauvegarde des données dans le cache"""
+    def set(self, data, *args, ttl: int = None):
+        """
+        Sauvegarde des données dans le cache.
+        
+        Args:
+            ttl: durée de validité en secondes (ex: redis_cache.get_ttl_by_session_status),
+                 défaut: ttl_hours
+        """
         cache_key = self._get_cache_key(*args)
         cache_path = self._get_cache_path(cache_key)
         
         try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
+            self._dump(cache_path, data, ttl)
         except Exception as e:
             print(f"Erreur écriture cache: {e}")
     
@@ -60,8 +96,7 @@ class FastF1Cache:
             return False
         
         # Vérifier si le cache n'est pas expiré
-        file_time = datetime.fromtimestamp(cache_path.stat().st_mtime)
-        if datetime.now() - file_time > timedelta(hours=self.ttl_hours):
+        if self._is_expired(cache_path):
             cache_path.unlink()
             return False
         
@@ -75,8 +110,7 @@ class FastF1Cache:
             raise KeyError(f"Cache key not found: {key}")
         
         try:
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
+            return self._load(cache_path)
         except Exception as e:
             print(f"Erreur lecture cache: {e}")
             raise KeyError(f"Error reading cache: {key}")
@@ -86,8 +120,7 @@ class FastF1Cache:
         cache_path = self._get_cache_path(key)
         
         try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump(value, f)
+            self._dump(cache_path, value)
         except Exception as e:
             print(f"Erreur écriture cache: {e}")
     
@@ -99,9 +132,11 @@ class FastF1Cache:
     def clear_old(self):
         """Nettoie uniquement les fichiers de cache expirés"""
         for cache_file in self.cache_dir.glob("*.pkl"):
-            file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-            if datetime.now() - file_time > timedelta(hours=self.ttl_hours):
-                cache_file.unlink()
+            try:
+                if self._is_expired(cache_file):
+                    cache_file.unlink()
+            except OSError as e:
+                print(f"Erreur nettoyage cache: {e}")
 
 # Instance globale du cache
 cache = FastF1Cache()
\ No newline at end of file
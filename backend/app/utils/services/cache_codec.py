@@ -0,0 +1,244 @@
+import json
+import os
+import threading
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    lz4_frame = None
+
+# En-tête d'une entrée encodée : \x00 (jamais en tête d'un JSON texte) + "MK"
+# + version du format + identifiants du sérialiseur et de la compression
+MAGIC = b"\x00MK"
+FORMAT_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 3
+
+# Sérialiseurs : id → (nom, encode, decode). Le JSON produit par orjson et par
+# json est le même format : les deux se relisent mutuellement.
+SERIALIZERS: Dict[int, Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    1: ('json', lambda value: json.dumps(value).encode(), json.loads),
+}
+if orjson is not None:
+    SERIALIZERS[2] = (
+        'orjson',
+        lambda value: orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        orjson.loads,
+    )
+if msgpack is not None:
+    SERIALIZERS[3] = ('msgpack', lambda value: msgpack.packb(value, use_bin_type=True), lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False))
+
+# Compressions : id → (nom, compress, decompress)
+COMPRESSORS: Dict[int, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    0: ('none', lambda data: data, lambda data: data),
+    1: ('zlib', lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if zstandard is not None:
+    # Un (dé)compresseur zstd ne doit pas servir à deux threads à la fois
+    # (event loop, recalculs en arrière-plan, précalcul) : un par thread
+    _zstd = threading.local()
+
+    def _zstd_compress(data: bytes) -> bytes:
+        if not hasattr(_zstd, 'compressor'):
+            _zstd.compressor = zstandard.ZstdCompressor(level=3)
+        return _zstd.compressor.compress(data)
+
+    def _zstd_decompress(data: bytes) -> bytes:
+        if not hasattr(_zstd, 'decompressor'):
+            _zstd.decompressor = zstandard.ZstdDecompressor()
+        return _zstd.decompressor.decompress(data)
+
+    COMPRESSORS[2] = ('zstd', _zstd_compress, _zstd_decompress)
+if lz4_frame is not None:
+    COMPRESSORS[3] = ('lz4', lz4_frame.compress, lz4_frame.decompress)
+
+# Les sérialiseurs dont la sortie est du JSON (servable tel quel en réponse HTTP)
+JSON_SERIALIZERS = ('json', 'orjson')
+
+
+class CacheCodecError(ValueError):
+    """Entrée illisible (en-tête inconnu, données corrompues) ou valeur non encodable"""
+
+
+def _id(registry: dict, name: str) -> Optional[int]:
+    return next((key for key, entry in registry.items() if entry[0] == name), None)
+
+
+class CacheCodec:
+    """
+    Encodage des valeurs du cache Redis : sérialiseur + compression au-delà
+    d'un seuil, derrière un en-tête versionné qui identifie les deux.
+
+    decode() relit toute entrée encodée par un codec disponible, ainsi que les
+    anciennes entrées en JSON texte (sans en-tête).
+
+    Configuration (variables d'environnement) :
+        CACHE_SERIALIZER          orjson | msgpack | json (défaut: orjson, sinon json)
+        CACHE_COMPRESSION         zstd | lz4 | zlib | none (défaut: zstd, sinon zlib)
+        CACHE_COMPRESS_THRESHOLD  octets à partir desquels on compresse (défaut: 1024)
+    """
+
+    def __init__(self, serializer: str = None, compression: str = None, threshold: int = None):
+        serializer = serializer or os.getenv('CACHE_SERIALIZER', 'orjson')
+        compression = compression or os.getenv('CACHE_COMPRESSION', 'zstd')
+
+        self.serializer_id = _id(SERIALIZERS, serializer)
+        if self.serializer_id is None:
+            logger.warning(f"⚠️ Cache serializer '{serializer}' unavailable - falling back to json")
+            self.serializer_id = _id(SERIALIZERS, 'orjson') or _id(SERIALIZERS, 'json')
+
+        self.compression_id = _id(COMPRESSORS, compression)
+        if self.compression_id is None:
+            logger.warning(f"⚠️ Cache compression '{compression}' unavailable - falling back to zlib")
+            self.compression_id = _id(COMPRESSORS, 'zlib')
+
+        self.threshold = threshold if threshold is not None else int(os.getenv('CACHE_COMPRESS_THRESHOLD', '1024'))
+
+    @property
+    def name(self) -> str:
+        return f"{SERIALIZERS[self.serializer_id][0]}+{COMPRESSORS[self.compression_id][0]}"
+
+    def encode(self, value: Any) -> bytes:
+        """Valeur → en-tête + charge utile (compressée si elle dépasse le seuil)"""
+        try:
+            payload = SERIALIZERS[self.serializer_id][1](value)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise CacheCodecError(f"cannot encode value: {e}") from e
+
+        compression_id = 0
+        if self.compression_id and len(payload) >= self.threshold:
+            payload = COMPRESSORS[self.compression_id][1](payload)
+            compression_id = self.compression_id
+        return MAGIC + bytes([FORMAT_VERSION, self.serializer_id, compression_id]) + payload
+
+    @staticmethod
+    def _split(data: bytes) -> Tuple[int, bytes]:
+        """(id du sérialiseur, charge décompressée) ; id json pour une ancienne entrée sans en-tête"""
+        if not data.startswith(MAGIC):
+            return 1, data
+
+        version, serializer_id, compression_id = data[len(MAGIC):HEADER_SIZE]
+        if version != FORMAT_VERSION or serializer_id not in SERIALIZERS or compression_id not in COMPRESSORS:
+            raise CacheCodecError(f"unsupported cache entry (version {version}, serializer {serializer_id}, compression {compression_id})")
+
+        try:
+            return serializer_id, COMPRESSORS[compression_id][2](data[HEADER_SIZE:])
+        except Exception as e:
+            raise CacheCodecError(f"corrupted cache entry: {e}") from e
+
+    def decode(self, data) -> Any:
+        """Entrée Redis (bytes, ou str d'un ancien client en decode_responses) → valeur"""
+        if isinstance(data, str):
+            data = data.encode()
+
+        serializer_id, payload = self._split(data)
+        try:
+            return SERIALIZERS[serializer_id][2](payload)
+        except Exception as e:
+            raise CacheCodecError(f"cannot decode cache entry: {e}") from e
+
+    def decode_json_bytes(self, data) -> bytes:
+        """
+        Texte JSON d'une entrée, servable tel quel en réponse HTTP : pour une
+        entrée JSON / orjson, simple décompression, sans désérialiser.
+        """
+        if isinstance(data, str):
+            return data.encode()
+
+        serializer_id, payload = self._split(data)
+        if SERIALIZERS[serializer_id][0] in JSON_SERIALIZERS:
+            return payload
+        return SERIALIZERS[_id(SERIALIZERS, 'orjson') or 1][1](self.decode(data))
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée par redis_cache
+cache_codec = CacheCodec()
+
+
+if __name__ == "__main__":
+    # Benchmark : octets stockés et temps encode / decode par type de payload
+    import time
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    n = 4000
+    distance = np.cumsum(rng.uniform(1, 2, n))
+    telemetry = {
+        'driver1': {
+            'distance': np.round(distance, 1).tolist(),
+            'speed': np.round(200 + 100 * np.sin(distance / 300), 1).tolist(),
+            'throttle': rng.integers(0, 101, n).tolist(),
+            'brake': rng.integers(0, 2, n).astype(bool).tolist(),
+            'gear': rng.integers(1, 9, n).tolist(),
+            'x': np.round(8000 * np.cos(distance / 800), 1).tolist(),
+            'y': np.round(5000 * np.sin(distance / 800), 1).tolist(),
+        },
+    }
+    telemetry['driver2'] = telemetry['driver1']
+    payloads = {
+        'telemetry comparison': telemetry,
+        'session laps': {'laps': [
+            {'lapNumber': i, 'lapTime': 90 + float(rng.normal()), 'sector1': 30.1, 'sector2': 29.8, 'sector3': 30.4,
+             'compound': 'MEDIUM', 'tyreLife': i % 25, 'isPersonalBest': False, 'position': int(rng.integers(1, 20))}
+            for i in range(1, 58)
+        ]},
+        'standings': {'standings': [
+            {'position': i, 'driver': f"Driver {i}", 'code': f"D{i:02d}", 'team': f"Team {i // 2}", 'points': 300.0 - 12 * i, 'wins': 0}
+            for i in range(1, 21)
+        ]},
+    }
+
+    codecs = {'legacy json text': None}
+    for serializer in ('json', 'orjson', 'msgpack'):
+        for compression in ('none', 'zlib', 'zstd', 'lz4'):
+            if _id(SERIALIZERS, serializer) is not None and _id(COMPRESSORS, compression) is not None:
+                codecs[f"{serializer}+{compression}"] = CacheCodec(serializer, compression, threshold=1024)
+
+    def best(fn, runs=20):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+
+    for label, payload in payloads.items():
+        print(f"\n{label}")
+        print(f"  {'codec':<18}{'bytes':>10}{'encode ms':>11}{'decode ms':>11}")
+        for name, codec in codecs.items():
+            if codec is None:
+                data = json.dumps(payload)
+                encode, decode = best(lambda: json.dumps(payload)), best(lambda: json.loads(data))
+                size = len(data.encode())
+            else:
+                data = codec.encode(payload)
+                assert codec.decode(data) == payload
+                assert json.loads(codec.decode_json_bytes(data)) == payload
+                encode, decode = best(lambda: codec.encode(payload)), best(lambda: codec.decode(data))
+                size = len(data)
+            print(f"  {name:<18}{size:>10,}{encode:>11.2f}{decode:>11.2f}")
+
+    # Anciennes entrées JSON texte (str ou bytes) toujours lisibles
+    legacy = json.dumps(payloads['standings'])
+    assert cache_codec.decode(legacy) == cache_codec.decode(legacy.encode()) == payloads['standings']
+    assert cache_codec.decode_json_bytes(legacy.encode()) == legacy.encode()
+    print(f"\ndefault codec: {cache_codec.name} (threshold {cache_codec.threshold} B), legacy JSON reads OK")
@@ -0,0 +1,122 @@
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+import logging
+
+from app.utils.services.redis_cache import redis_cache
+from app.utils.analytics.track_projection import TrackIndex
+
+logger = logging.getLogger(__name__)
+
+# Un catalogue ne change qu'avec le tracé : conservé 1 an dans Redis
+CATALOGUE_TTL = 365 * 24 * 3600
+
+# Arrondi de la longueur de tour pour identifier un tracé (m)
+LAYOUT_LENGTH_STEP = 50
+
+
+class CornerCatalogueStore:
+    """
+    Catalogue des virages par circuit et par tracé, persisté.
+
+    Lecture : mémoire → fichier JSON (CORNER_CATALOGUE_DIR, défaut: cache/corners)
+    → Redis. Un catalogue absent est construit une seule fois (verrou par tracé)
+    puis écrit partout : le même T5 est ainsi servi pour tous les pilotes et
+    toutes les sessions du circuit.
+    """
+
+    def __init__(self, directory: str = None, cache=redis_cache):
+        self.directory = Path(directory or os.getenv('CORNER_CATALOGUE_DIR', 'cache/corners'))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+        self._catalogues: dict = {}
+        self._indexes: dict = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict = {}
+
+    @staticmethod
+    def layout_key(circuit: str, lap_length: float) -> str:
+        """
+        Identifiant de tracé : circuit + longueur arrondie à LAYOUT_LENGTH_STEP m
+        (une modification du tracé change la longueur, donc le catalogue).
+        """
+        slug = re.sub(r'[^a-z0-9]+', '-', str(circuit).lower()).strip('-')
+        length = int(round(lap_length / LAYOUT_LENGTH_STEP) * LAYOUT_LENGTH_STEP)
+        return f"{slug}-{length}"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        if key in self._catalogues:
+            return self._catalogues[key]
+
+        catalogue = None
+        path = self._path(key)
+        if path.exists():
+            try:
+                catalogue = json.loads(path.read_text())
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Corner catalogue read error for {key}: {e}")
+
+        if catalogue is None and self.cache is not None:
+            catalogue = self.cache.get(f"corner_catalogue:{key}")
+            if catalogue is not None:
+                self._write_file(key, catalogue)
+
+        if catalogue is not None:
+            self._catalogues[key] = catalogue
+        return catalogue
+
+    def _write_file(self, key: str, catalogue: dict):
+        try:
+            self._path(key).write_text(json.dumps(catalogue))
+        except OSError as e:
+            logger.error(f"❌ Corner catalogue write error for {key}: {e}")
+
+    def set(self, key: str, catalogue: dict):
+        self._catalogues[key] = catalogue
+        self._write_file(key, catalogue)
+        if self.cache is not None:
+            self.cache.set(f"corner_catalogue:{key}", catalogue, ttl=CATALOGUE_TTL)
+        logger.info(f"📐 Corner catalogue saved: {key} ({len(catalogue.get('corners', []))} corners)")
+
+    def get_or_build(self, key: str, builder: Callable[[], dict]) -> dict:
+        """Retourne le catalogue du tracé, le construit (une seule fois) si absent"""
+        catalogue = self.get(key)
+        if catalogue is not None:
+            return catalogue
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            catalogue = self.get(key)
+            if catalogue is None:
+                catalogue = {'layout': key, **builder()}
+                self.set(key, catalogue)
+            return catalogue
+
+    def track_index(self, key: str) -> Optional[TrackIndex]:
+        """
+        KD-tree de la ligne de référence du tracé, construit une fois puis partagé.
+        None si le catalogue n'a pas de ligne de référence.
+        """
+        if key in self._indexes:
+            return self._indexes[key]
+
+        catalogue = self.get(key)
+        if catalogue is None or not catalogue.get('centerline'):
+            return None
+
+        with self._lock:
+            if key not in self._indexes:
+                self._indexes[key] = TrackIndex.from_centerline(catalogue['centerline'])
+            return self._indexes[key]
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée dans main.py
+corner_catalogue_store = CornerCatalogueStore()
@@ -0,0 +1,686 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import logging
+
+from app.utils.services.http_client import http_client
+from app.utils.services.upstream_cache import upstream_cache
+
+logger = logging.getLogger(__name__)
+
+# Taille de page maximale acceptée par Jolpica
+PAGE_SIZE = 100
+
+# Délai minimal entre deux tentatives de rafraîchissement d'une saison (s)
+REFRESH_RETRY = 60
+
+# Version du schéma : une base plus ancienne est resynchronisée au démarrage
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    race_name TEXT,
+    circuit_name TEXT,
+    date TEXT,
+    PRIMARY KEY (season, round)
+);
+CREATE TABLE IF NOT EXISTS drivers (
+    driver_id TEXT PRIMARY KEY,
+    code TEXT,
+    given_name TEXT,
+    family_name TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    driver_id TEXT NOT NULL,
+    constructor_id TEXT,
+    constructor_name TEXT,
+    position INTEGER,
+    grid INTEGER,
+    points REAL,
+    status TEXT,
+    time TEXT,
+    fastest_lap_rank TEXT,
+    PRIMARY KEY (season, round, driver_id)
+);
+CREATE INDEX IF NOT EXISTS idx_results_driver ON results (season, driver_id);
+CREATE INDEX IF NOT EXISTS idx_results_constructor ON results (season, constructor_id);
+CREATE TABLE IF NOT EXISTS qualifying (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    driver_id TEXT NOT NULL,
+    constructor_id TEXT,
+    position INTEGER,
+    PRIMARY KEY (season, round, driver_id)
+);
+CREATE INDEX IF NOT EXISTS idx_qualifying_driver ON qualifying (season, driver_id);
+CREATE TABLE IF NOT EXISTS sprint_results (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    driver_id TEXT NOT NULL,
+    constructor_id TEXT,
+    constructor_name TEXT,
+    position INTEGER,
+    points REAL,
+    PRIMARY KEY (season, round, driver_id)
+);
+CREATE INDEX IF NOT EXISTS idx_sprint_results_driver ON sprint_results (season, driver_id);
+CREATE TABLE IF NOT EXISTS driver_standings (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    driver_id TEXT NOT NULL,
+    constructor_name TEXT,
+    position INTEGER,
+    points REAL,
+    wins INTEGER,
+    PRIMARY KEY (season, round, driver_id)
+);
+CREATE INDEX IF NOT EXISTS idx_driver_standings_driver ON driver_standings (season, driver_id);
+CREATE TABLE IF NOT EXISTS constructor_standings (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    constructor_id TEXT NOT NULL,
+    constructor_name TEXT,
+    position INTEGER,
+    points REAL,
+    wins INTEGER,
+    PRIMARY KEY (season, round, constructor_id)
+);
+CREATE INDEX IF NOT EXISTS idx_constructor_standings_constructor ON constructor_standings (season, constructor_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    season INTEGER PRIMARY KEY,
+    last_round INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _driver_code(driver: dict) -> str:
+    return driver['code'] if 'code' in driver else driver['familyName'][:3].upper()
+
+
+class ErgastMirror:
+    """
+    Miroir local (SQLite indexé) des résultats Jolpica/Ergast.
+
+    - Synchronisation complète d'une saison (résultats, qualifications,
+      classements après chaque manche), puis incrémentale manche par manche
+    - Les routes /api/championship/* et /api/studio/head-to-head lisent ici
+      (requêtes indexées, quelques ms) au lieu de rappeler Jolpica
+    - Les appels Jolpica passent par UpstreamCache (revalidation conditionnelle,
+      copie périmée servie si Jolpica est indisponible)
+
+    Configuration (variables d'environnement) :
+        ERGAST_MIRROR_PATH       fichier SQLite (défaut: cache/ergast.sqlite)
+        ERGAST_MIRROR_REFRESH    secondes avant de revérifier une saison incomplète (défaut: 3600)
+        ERGAST_MIRROR_ADMIN_KEY  clé (en-tête X-Admin-Key) de POST /api/ergast-mirror/{year}/sync -
+                                 route désactivée si absente
+        JOLPICA_BASE_URL         API source (défaut: https://api.jolpi.ca/ergast/f1) -
+                                 pointer vers un faux serveur local pour tester la synchro
+    """
+
+    def __init__(self, path: str = None, base_url: str = None, client=upstream_cache, refresh: int = None):
+        self.path = Path(path or os.getenv('ERGAST_MIRROR_PATH', 'cache/ergast.sqlite'))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.base_url = (base_url or os.getenv('JOLPICA_BASE_URL', 'https://api.jolpi.ca/ergast/f1')).rstrip('/')
+        self.client = client
+        self.refresh = refresh or int(os.getenv('ERGAST_MIRROR_REFRESH', '3600'))
+
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._sync_locks: dict = {}
+        self._refreshing: dict = {}
+        self._refresh_attempts: dict = {}
+        with self._lock:
+            self._db.executescript(SCHEMA)
+            if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._db.execute("DELETE FROM sync_state")
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self._db.commit()
+
+    # ========== SQL ==========
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _write(self, statements: list):
+        """[(sql, [params, ...]), ...] dans UNE transaction"""
+        with self._lock, self._db:
+            for sql, rows in statements:
+                if rows:
+                    self._db.executemany(sql, rows)
+
+    def sync_state(self, season: int) -> Optional[dict]:
+        rows = self._query("SELECT last_round, synced_at FROM sync_state WHERE season = ?", (season,))
+        return dict(rows[0]) if rows else None
+
+    def status(self) -> dict:
+        seasons = self._query("SELECT season, last_round, synced_at FROM sync_state ORDER BY season")
+        return {
+            'path': str(self.path),
+            'source': self.base_url,
+            'refreshSeconds': self.refresh,
+            'seasons': {
+                row['season']: {
+                    'lastRound': row['last_round'],
+                    'syncedAt': datetime.fromtimestamp(row['synced_at']).isoformat(timespec='seconds'),
+                }
+                for row in seasons
+            },
+        }
+
+    # ========== SYNCHRONISATION ==========
+
+    async def _get_json(self, path: str, params: dict = None):
+        """GET Jolpica : une copie en cache périmée est revalidée avant d'être utilisée"""
+        return await self.client.get_json(f"{self.base_url}/{path}", params=params, stale_while_revalidate=False)
+
+    async def _fetch_races(self, path: str) -> list:
+        """Toutes les pages d'une requête Jolpica, courses fusionnées par manche"""
+        first = await self._get_json(path, params={'limit': PAGE_SIZE, 'offset': 0})
+        total = int(first['MRData'].get('total', 0))
+        pages = [first]
+        if total > PAGE_SIZE:
+            pages += await asyncio.gather(*(
+                self._get_json(path, params={'limit': PAGE_SIZE, 'offset': offset})
+                for offset in range(PAGE_SIZE, total, PAGE_SIZE)
+            ))
+
+        races = {}
+        for page in pages:
+            for race in page['MRData']['RaceTable']['Races']:
+                merged = races.setdefault(int(race['round']), {**race, 'Results': [], 'QualifyingResults': [], 'SprintResults': []})
+                merged['Results'] += race.get('Results', [])
+                merged['QualifyingResults'] += race.get('QualifyingResults', [])
+                merged['SprintResults'] += race.get('SprintResults', [])
+        return [races[r] for r in sorted(races)]
+
+    async def _fetch_standings(self, season: int, gp_round: int) -> tuple:
+        return await asyncio.gather(
+            self._get_json(f"{season}/{gp_round}/driverStandings.json"),
+            self._get_json(f"{season}/{gp_round}/constructorStandings.json"),
+        )
+
+    def _store(self, season: int, results: list, qualifying: list, sprints: list, standings: dict, schedule: list = ()):
+        """Écrit calendrier, courses, résultats (GP et sprint), qualifications et classements d'une saison (upsert)"""
+        races, drivers, result_rows, quali_rows, sprint_rows, driver_rows, constructor_rows = [], {}, [], [], [], [], []
+
+        for race in list(schedule) + results + qualifying + sprints:
+            races.append((season, int(race['round']), race['raceName'], race['Circuit']['circuitName'], race.get('date')))
+
+        for race in results:
+            gp_round = int(race['round'])
+            for result in race['Results']:
+                driver = result['Driver']
+                drivers[driver['driverId']] = (driver['driverId'], _driver_code(driver), driver['givenName'], driver['familyName'])
+                result_rows.append((
+                    season, gp_round, driver['driverId'],
+                    result['Constructor']['constructorId'], result['Constructor']['name'],
+                    _int(result['position']), _int(result.get('grid')), float(result.get('points', 0)),
+                    result.get('status'), result['Time']['time'] if 'Time' in result else None,
+                    result.get('FastestLap', {}).get('rank'),
+                ))
+
+        for race in qualifying:
+            gp_round = int(race['round'])
+            for result in race['QualifyingResults']:
+                driver = result['Driver']
+                drivers[driver['driverId']] = (driver['driverId'], _driver_code(driver), driver['givenName'], driver['familyName'])
+                quali_rows.append((season, gp_round, driver['driverId'], result['Constructor']['constructorId'], _int(result['position'])))
+
+        for race in sprints:
+            gp_round = int(race['round'])
+            for result in race['SprintResults']:
+                driver = result['Driver']
+                drivers[driver['driverId']] = (driver['driverId'], _driver_code(driver), driver['givenName'], driver['familyName'])
+                sprint_rows.append((
+                    season, gp_round, driver['driverId'], result['Constructor']['constructorId'], result['Constructor']['name'],
+                    _int(result['position']), float(result.get('points', 0))
+                ))
+
+        for gp_round, (driver_data, constructor_data) in standings.items():
+            for table in driver_data['MRData']['StandingsTable']['StandingsLists']:
+                for row in table['DriverStandings']:
+                    driver = row['Driver']
+                    drivers[driver['driverId']] = (driver['driverId'], _driver_code(driver), driver['givenName'], driver['familyName'])
+                    driver_rows.append((
+                        season, gp_round, driver['driverId'], row['Constructors'][0]['name'] if row['Constructors'] else None,
+                        _int(row.get('position')), float(row['points']), int(row['wins'])
+                    ))
+            for table in constructor_data['MRData']['StandingsTable']['StandingsLists']:
+                for row in table['ConstructorStandings']:
+                    constructor_rows.append((
+                        season, gp_round, row['Constructor']['constructorId'], row['Constructor']['name'],
+                        _int(row.get('position')), float(row['points']), int(row['wins'])
+                    ))
+
+        self._write([
+            ("INSERT OR REPLACE INTO races VALUES (?, ?, ?, ?, ?)", races),
+            ("INSERT OR REPLACE INTO drivers VALUES (?, ?, ?, ?)", list(drivers.values())),
+            ("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", result_rows),
+            ("INSERT OR REPLACE INTO qualifying VALUES (?, ?, ?, ?, ?)", quali_rows),
+            ("INSERT OR REPLACE INTO sprint_results VALUES (?, ?, ?, ?, ?, ?, ?)", sprint_rows),
+            ("INSERT OR REPLACE INTO driver_standings VALUES (?, ?, ?, ?, ?, ?, ?)", driver_rows),
+            ("INSERT OR REPLACE INTO constructor_standings VALUES (?, ?, ?, ?, ?, ?, ?)", constructor_rows),
+        ])
+
+    def _mark_synced(self, season: int, last_round: int):
+        self._write([("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)", [(season, last_round, time.time())])])
+
+    async def sync_season(self, season: int) -> int:
+        """Synchronisation complète d'une saison. Retourne la dernière manche disputée."""
+        start = time.perf_counter()
+        schedule, results, qualifying, sprints = await asyncio.gather(
+            self._fetch_races(f"{season}.json"),
+            self._fetch_races(f"{season}/results.json"),
+            self._fetch_races(f"{season}/qualifying.json"),
+            self._fetch_races(f"{season}/sprint.json"),
+        )
+        rounds = [int(race['round']) for race in results]
+        standings = dict(zip(rounds, await asyncio.gather(*(self._fetch_standings(season, r) for r in rounds))))
+
+        self._store(season, results, qualifying, sprints, standings, schedule)
+        last_round = max(rounds, default=0)
+        self._mark_synced(season, last_round)
+        logger.info(f"🗄️ Ergast mirror: season {season} synced ({len(rounds)} rounds, {time.perf_counter() - start:.1f}s)")
+        return last_round
+
+    async def resync_season(self, season: int) -> int:
+        """
+        Resynchronisation complète à la demande, sous le verrou de la saison :
+        une demande arrivée pendant une synchro en cours attend sa fin au lieu
+        d'en relancer une.
+        """
+        lock = self._sync_locks.setdefault(season, asyncio.Lock())
+        if lock.locked():
+            async with lock:
+                state = self.sync_state(season)
+                if state is not None:
+                    return state['last_round']
+        async with lock:
+            return await self.sync_season(season)
+
+    async def sync_round(self, season: int, gp_round: int) -> bool:
+        """Synchronise une manche. True si ses résultats de course sont publiés."""
+        results, qualifying, sprints = await asyncio.gather(
+            self._fetch_races(f"{season}/{gp_round}/results.json"),
+            self._fetch_races(f"{season}/{gp_round}/qualifying.json"),
+            self._fetch_races(f"{season}/{gp_round}/sprint.json"),
+        )
+        standings = {gp_round: await self._fetch_standings(season, gp_round)} if results else {}
+        self._store(season, results, qualifying, sprints, standings)
+
+        if results:
+            state = self.sync_state(season)
+            self._mark_synced(season, max(gp_round, state['last_round'] if state else 0))
+            logger.info(f"🗄️ Ergast mirror: {season} round {gp_round} synced")
+        return bool(results)
+
+    async def sync_new_rounds(self, season: int) -> int:
+        """Synchro incrémentale : manches postérieures à la dernière connue"""
+        state = self.sync_state(season)
+        if state is None:
+            return await self.sync_season(season)
+
+        # Calendrier relu : manches ajoutées / annulées en cours de saison
+        self._store(season, [], [], [], {}, await self._fetch_races(f"{season}.json"))
+
+        gp_round = state['last_round'] + 1
+        while await self.sync_round(season, gp_round):
+            gp_round += 1
+        self._mark_synced(season, gp_round - 1)
+        return gp_round - 1
+
+    def final_round(self, season: int) -> Optional[int]:
+        """Dernière manche du calendrier de la saison (None si calendrier inconnu)"""
+        rows = self._query("SELECT MAX(round) AS round FROM races WHERE season = ?", (season,))
+        return rows[0]['round'] if rows else None
+
+    def is_complete(self, season: int, state: dict = None) -> bool:
+        """True si les résultats de la dernière manche du calendrier sont synchronisés"""
+        state = state or self.sync_state(season)
+        final_round = self.final_round(season)
+        return state is not None and final_round is not None and state['last_round'] >= final_round
+
+    async def ensure_season(self, season: int):
+        """
+        Garantit que la saison est disponible localement :
+        - absente : synchro complète avant de répondre
+        - saison incomplète (dernière manche du calendrier pas encore synchronisée)
+          vérifiée il y a plus de `refresh` secondes : les données locales sont
+          servies et la synchro incrémentale part en arrière-plan
+        Une saison terminée n'est plus rappelée.
+        """
+        state = self.sync_state(season)
+        if state is None:
+            lock = self._sync_locks.setdefault(season, asyncio.Lock())
+            async with lock:
+                if self.sync_state(season) is None:
+                    await self.sync_season(season)
+            return
+
+        if not self.is_complete(season, state) and time.time() - state['synced_at'] >= self.refresh:
+            self._refresh_in_background(season)
+
+    def _refresh_in_background(self, season: int):
+        task = self._refreshing.get(season)
+        if task is not None and not task.done():
+            return
+        if time.time() - self._refresh_attempts.get(season, 0) < REFRESH_RETRY:
+            return
+
+        self._refresh_attempts[season] = time.time()
+        self._refreshing[season] = asyncio.create_task(self._refresh(season))
+
+    async def _refresh(self, season: int):
+        try:
+            await self.sync_new_rounds(season)
+        except Exception as e:
+            # Les données locales restent servies si Jolpica est indisponible
+            logger.error(f"❌ Ergast mirror refresh failed for {season}: {e}")
+
+    # ========== REQUÊTES ==========
+
+    def _standings_round(self, table: str, season: int, gp_round: Optional[int]) -> Optional[int]:
+        if gp_round is not None:
+            return gp_round
+        rows = self._query(f"SELECT MAX(round) AS round FROM {table} WHERE season = ?", (season,))
+        return rows[0]['round'] if rows else None
+
+    def driver_standings(self, season: int, gp_round: int = None) -> List[dict]:
+        """Classement pilotes (après `gp_round`, ou le plus récent) - format /api/championship"""
+        gp_round = self._standings_round('driver_standings', season, gp_round)
+        rows = self._query("""
+            SELECT s.position, s.points, s.wins, s.constructor_name, d.code, d.given_name, d.family_name
+            FROM driver_standings s JOIN drivers d ON d.driver_id = s.driver_id
+            WHERE s.season = ? AND s.round = ?
+            ORDER BY s.position IS NULL, s.position
+        """, (season, gp_round))
+        return [
+            {
+                'position': row['position'],
+                'driver': f"{row['given_name']} {row['family_name']}",
+                'code': row['code'],
+                'team': row['constructor_name'],
+                'points': row['points'],
+                'wins': row['wins'],
+            }
+            for row in rows
+        ]
+
+    def constructor_standings(self, season: int, gp_round: int = None) -> List[dict]:
+        gp_round = self._standings_round('constructor_standings', season, gp_round)
+        rows = self._query("""
+            SELECT position, constructor_name, points, wins FROM constructor_standings
+            WHERE season = ? AND round = ?
+            ORDER BY position IS NULL, position
+        """, (season, gp_round))
+        return [
+            {'position': row['position'], 'team': row['constructor_name'], 'points': row['points'], 'wins': row['wins']}
+            for row in rows
+        ]
+
+    def race_results(self, season: int, gp_round: int) -> Optional[dict]:
+        race = self._query("SELECT race_name, circuit_name, date FROM races WHERE season = ? AND round = ?", (season, gp_round))
+        rows = self._query("""
+            SELECT r.position, r.grid, r.points, r.status, r.time, r.constructor_name, d.code, d.given_name, d.family_name
+            FROM results r JOIN drivers d ON d.driver_id = r.driver_id
+            WHERE r.season = ? AND r.round = ?
+            ORDER BY r.position
+        """, (season, gp_round))
+        if not race or not rows:
+            return None
+
+        return {
+            'results': [
+                {
+                    'position': row['position'],
+                    'driver': f"{row['given_name']} {row['family_name']}",
+                    'code': row['code'],
+                    'team': row['constructor_name'],
+                    'grid': row['grid'],
+                    'points': row['points'],
+                    'status': row['status'],
+                    'time': row['time'],
+                }
+                for row in rows
+            ],
+            'raceName': race[0]['race_name'],
+            'circuitName': race[0]['circuit_name'],
+            'date': race[0]['date'],
+        }
+
+    def season_drivers(self, season: int) -> List[dict]:
+        """Pilotes de la saison au format DriverTable Ergast"""
+        rows = self._query("""
+            SELECT DISTINCT d.driver_id, d.code, d.given_name, d.family_name
+            FROM drivers d
+            WHERE d.driver_id IN (
+                SELECT driver_id FROM results WHERE season = ?
+                UNION SELECT driver_id FROM qualifying WHERE season = ?
+            )
+        """, (season, season))
+        return [
+            {'driverId': row['driver_id'], 'code': row['code'], 'givenName': row['given_name'], 'familyName': row['family_name']}
+            for row in rows
+        ]
+
+    def driver_races(self, season: int, driver_id: str) -> List[dict]:
+        """Résultats de course d'un pilote au format RaceTable Ergast (une entrée par manche)"""
+        rows = self._query("""
+            SELECT r.round, c.race_name, r.position, r.points, r.status, r.fastest_lap_rank, r.constructor_name
+            FROM results r JOIN races c ON c.season = r.season AND c.round = r.round
+            WHERE r.season = ? AND r.driver_id = ? AND r.position IS NOT NULL
+            ORDER BY r.round
+        """, (season, driver_id))
+        races = []
+        for row in rows:
+            result = {
+                'position': str(row['position']),
+                'points': str(row['points']),
+                'status': row['status'],
+                'Constructor': {'name': row['constructor_name']},
+            }
+            if row['fastest_lap_rank'] is not None:
+                result['FastestLap'] = {'rank': row['fastest_lap_rank']}
+            races.append({'round': str(row['round']), 'raceName': row['race_name'], 'Results': [result]})
+        return races
+
+    def driver_qualifying(self, season: int, driver_id: str) -> List[dict]:
+        """Qualifications d'un pilote au format RaceTable Ergast"""
+        rows = self._query("""
+            SELECT round, position FROM qualifying
+            WHERE season = ? AND driver_id = ? AND position IS NOT NULL
+            ORDER BY round
+        """, (season, driver_id))
+        return [
+            {'round': str(row['round']), 'QualifyingResults': [{'position': str(row['position'])}]}
+            for row in rows
+        ]
+
+
+    def season_points(self, season: int) -> List[dict]:
+        """Points marqués par pilote et par manche (GP + sprint), base du classement cumulé"""
+        rows = self._query("""
+            SELECT p.round, p.kind, p.position, p.status, p.points, p.constructor_id, p.constructor_name,
+                   p.driver_id, d.code, d.given_name || ' ' || d.family_name AS driver
+            FROM (
+                SELECT round, 'race' AS kind, driver_id, constructor_id, constructor_name, position, status, points
+                FROM results WHERE season = ?
+                UNION ALL
+                SELECT round, 'sprint' AS kind, driver_id, constructor_id, constructor_name, position, NULL AS status, points
+                FROM sprint_results WHERE season = ?
+            ) p JOIN drivers d ON d.driver_id = p.driver_id
+            ORDER BY p.round
+        """, (season, season))
+        return [dict(row) for row in rows]
+
+    def official_standings(self, season: int) -> dict:
+        """Classements officiels après chaque manche (résultats décomptés et exclusions inclus)"""
+        drivers = self._query("""
+            SELECT round, driver_id, points, position FROM driver_standings WHERE season = ? ORDER BY round
+        """, (season,))
+        constructors = self._query("""
+            SELECT round, constructor_id, points, position FROM constructor_standings WHERE season = ? ORDER BY round
+        """, (season,))
+        return {'drivers': [dict(row) for row in drivers], 'constructors': [dict(row) for row in constructors]}
+
+    def season_races(self, season: int) -> List[dict]:
+        rows = self._query("SELECT round, race_name FROM races WHERE season = ? ORDER BY round", (season,))
+        return [{'round': row['round'], 'raceName': row['race_name']} for row in rows]
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée dans main.py
+ergast_mirror = ErgastMirror()
+
+
+if __name__ == "__main__":
+    # Synchro contre un faux serveur Jolpica local, puis temps de requête
+    import json
+    import re
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlsplit, parse_qs
+
+    from app.utils.services.upstream_cache import UpstreamCache
+
+    SEASON, ROUNDS, SCHEDULED = 2024, 20, 24
+    DRIVERS = [{'driverId': f"driver_{i}", 'code': f"D{i:02d}", 'givenName': 'Driver', 'familyName': f"Number{i}"} for i in range(20)]
+    TEAMS = [{'constructorId': f"team_{i}", 'name': f"Team {i}"} for i in range(10)]
+
+    def race(gp_round, key, rows):
+        return {'season': str(SEASON), 'round': str(gp_round), 'raceName': f"Grand Prix {gp_round}",
+                'Circuit': {'circuitName': f"Circuit {gp_round}"}, 'date': f"{SEASON}-01-01", key: rows}
+
+    def results(gp_round):
+        order = sorted(range(20), key=lambda i: (i * 7 + gp_round * 3) % 20)
+        return [{'position': str(p + 1), 'grid': str(p + 1), 'points': str(max(0, 25 - 2 * p)), 'status': 'Finished',
+                 'Driver': DRIVERS[i], 'Constructor': TEAMS[i // 2], 'FastestLap': {'rank': str(p + 1)}}
+                for p, i in enumerate(order)]
+
+    def qualifying(gp_round):
+        return [{'position': r['position'], 'Driver': r['Driver'], 'Constructor': r['Constructor']} for r in results(gp_round)]
+
+    def sprint(gp_round):
+        rows = results(gp_round + 1) if gp_round % 4 == 0 else []
+        return [{**r, 'points': str(max(0, 9 - int(r['position'])))} for r in rows]
+
+    def standings(gp_round, kind):
+        points = {}
+        for r in range(1, gp_round + 1):
+            for row in results(r) + sprint(r):
+                key = row['Driver']['driverId'] if kind == 'driver' else row['Constructor']['constructorId']
+                points[key] = points.get(key, 0) + float(row['points'])
+        ranked = sorted(points, key=points.get, reverse=True)
+        if kind == 'driver':
+            rows = [{'position': str(p + 1), 'points': str(points[d]), 'wins': '0', 'Driver': DRIVERS[int(d.split('_')[1])],
+                     'Constructors': [TEAMS[int(d.split('_')[1]) // 2]]} for p, d in enumerate(ranked)]
+            return {'StandingsLists': [{'DriverStandings': rows}]}
+        rows = [{'position': str(p + 1), 'points': str(points[c]), 'wins': '0', 'Constructor': TEAMS[int(c.split('_')[1])]}
+                for p, c in enumerate(ranked)]
+        return {'StandingsLists': [{'ConstructorStandings': rows}]}
+
+    class FakeJolpica(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            limit, offset = int(query.get('limit', [30])[0]), int(query.get('offset', [0])[0])
+            match = re.fullmatch(r'/(\d+)(?:/(\d+))?(?:/(results|qualifying|sprint|driverStandings|constructorStandings))?\.json', url.path)
+            rounds = [int(match.group(2))] if match and match.group(2) else range(1, ROUNDS + 1)
+            rounds = [r for r in rounds if r <= ROUNDS]
+            kind = match.group(3) if match else None
+
+            if match and kind is None:
+                # Calendrier : toutes les manches, y compris celles pas encore disputées
+                body = {'MRData': {'total': str(SCHEDULED), 'RaceTable': {'Races': [race(r, 'Results', []) for r in range(1, SCHEDULED + 1)]}}}
+            elif kind in ('driverStandings', 'constructorStandings'):
+                body = {'MRData': {'total': '1', 'StandingsTable': standings(rounds[0], kind[:-9]) if rounds else {'StandingsLists': []}}}
+            else:
+                key, build = {'results': ('Results', results), 'qualifying': ('QualifyingResults', qualifying),
+                              'sprint': ('SprintResults', sprint)}[kind]
+                rows = [(r, row) for r in rounds for row in build(r)]
+                total, rows = len(rows), rows[offset:offset + limit]
+                races = {}
+                for r, row in rows:
+                    races.setdefault(r, race(r, key, []))[key].append(row)
+                body = {'MRData': {'total': str(total), 'RaceTable': {'Races': list(races.values())}}}
+
+            payload = json.dumps(body).encode()
+            self.send_response(200 if match else 404)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeJolpica)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    async def main():
+        global ROUNDS
+        with tempfile.TemporaryDirectory() as directory:
+            mirror = ErgastMirror(path=f"{directory}/ergast.sqlite", base_url=f"http://127.0.0.1:{server.server_port}")
+
+            start = time.perf_counter()
+            last_round = await mirror.sync_season(SEASON)
+            print(f"bulk sync: {ROUNDS} rounds → last round {last_round} in {time.perf_counter() - start:.2f}s")
+
+            synced = mirror.sync_state(SEASON)['last_round']
+            assert await mirror.sync_new_rounds(SEASON) == synced, "no new round expected"
+
+            # Saison incomplète (manches restantes au calendrier) : rafraîchie quelle que soit l'année
+            assert mirror.final_round(SEASON) == SCHEDULED and not mirror.is_complete(SEASON)
+            ROUNDS = SCHEDULED
+            mirror.client = UpstreamCache(cache=None, max_age=0)
+            assert await mirror.sync_new_rounds(SEASON) == SCHEDULED and mirror.is_complete(SEASON)
+
+            queries = {
+                'driver standings': lambda: mirror.driver_standings(SEASON),
+                'standings after R10': lambda: mirror.constructor_standings(SEASON, 10),
+                'race results R5': lambda: mirror.race_results(SEASON, 5),
+                'head-to-head data': lambda: (mirror.season_drivers(SEASON), mirror.driver_races(SEASON, 'driver_1'),
+                                              mirror.driver_qualifying(SEASON, 'driver_1')),
+            }
+            for label, query in queries.items():
+                runs = []
+                for _ in range(50):
+                    begin = time.perf_counter()
+                    query()
+                    runs.append(time.perf_counter() - begin)
+                print(f"{label}: {min(runs) * 1000:.2f} ms")
+
+            # Classement cumulé local == classements Jolpica de chaque manche
+            from app.utils.analytics.standings import standings_progression
+            begin = time.perf_counter()
+            progression = standings_progression(mirror.season_points(SEASON))
+            print(f"standings progression: {(time.perf_counter() - begin) * 1000:.1f} ms")
+            for i, gp_round in enumerate(progression['rounds']):
+                expected = {row['code']: row['points'] for row in mirror.driver_standings(SEASON, gp_round)}
+                assert {d['code']: d['points'][i] for d in progression['drivers']} == expected, gp_round
+            overlaid = standings_progression(mirror.season_points(SEASON), mirror.official_standings(SEASON))
+            assert [d['points'] for d in overlaid['drivers']] == [d['points'] for d in progression['drivers']]
+
+            print(f"leader: {mirror.driver_standings(SEASON)[0]}")
+            await http_client.aclose()
+
+    asyncio.run(main())
+    server.shutdown()
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import random
+import time
+import weakref
+from typing import Any, Optional
+from urllib.parse import urlsplit
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Statuts HTTP qui méritent un nouvel essai (limite de débit, upstream indisponible)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """
+    Client HTTP async partagé pour TOUS les appels REST externes (Jolpica, F1 live timing...).
+
+    - Connexions keep-alive réutilisées (un httpx.AsyncClient par event loop)
+    - Concurrence bornée par hôte (sémaphore)
+    - Timeouts systématiques
+    - Retries avec backoff exponentiel + jitter (erreurs réseau, 429, 5xx ;
+      Retry-After respecté)
+    - Métriques par hôte (requêtes, retries, échecs, latence)
+
+    Configuration (variables d'environnement) :
+        HTTP_TIMEOUT          secondes par requête (défaut: 10)
+        HTTP_MAX_CONNECTIONS  connexions ouvertes au total (défaut: 20)
+        HTTP_PER_HOST_LIMIT   requêtes simultanées par hôte (défaut: 4)
+        HTTP_RETRIES          nouveaux essais après le premier (défaut: 3)
+        HTTP_BACKOFF          base du backoff en secondes (défaut: 0.5)
+    """
+
+    def __init__(
+        self,
+        timeout: float = None,
+        max_connections: int = None,
+        per_host_limit: int = None,
+        retries: int = None,
+        backoff: float = None,
+    ):
+        self.timeout = timeout or float(os.getenv('HTTP_TIMEOUT', '10'))
+        self.max_connections = max_connections or int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+        self.per_host_limit = per_host_limit or int(os.getenv('HTTP_PER_HOST_LIMIT', '4'))
+        self.retries = retries if retries is not None else int(os.getenv('HTTP_RETRIES', '3'))
+        self.backoff = backoff or float(os.getenv('HTTP_BACKOFF', '0.5'))
+
+        # Client et sémaphores liés à l'event loop qui les utilise
+        # (l'app + les threads du précalcul qui lancent leur propre loop)
+        self._loops: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self.metrics: dict = {}
+
+    # ========== CLIENT ==========
+
+    def _state(self) -> dict:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = {
+                'client': httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout),
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=60,
+                    ),
+                    follow_redirects=True,
+                    headers={'User-Agent': 'metrik-delta-api'},
+                ),
+                'semaphores': {},
+            }
+            self._loops[loop] = state
+        return state
+
+    def _host_metrics(self, host: str) -> dict:
+        return self.metrics.setdefault(host, {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'inFlight': 0,
+            'totalSeconds': 0.0,
+            'lastError': None,
+        })
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Backoff exponentiel avec full jitter, ou Retry-After s'il est fourni"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), 30.0)
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+    # ========== REQUÊTES ==========
+
+    async def request(self, method: str, url: str, retries: int = None, **kwargs) -> httpx.Response:
+        """
+        Requête avec retries. Retourne la dernière réponse (même en erreur HTTP
+        non retentée) ; lève httpx.HTTPError si le réseau échoue à chaque essai.
+        """
+        state = self._state()
+        host = urlsplit(url).netloc
+        semaphore = state['semaphores'].setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        stats = self._host_metrics(host)
+        retries = self.retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            response = None
+            error = None
+
+            async with semaphore:
+                stats['requests'] += 1
+                stats['inFlight'] += 1
+                start = time.perf_counter()
+                try:
+                    response = await state['client'].request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    error = e
+                finally:
+                    stats['inFlight'] -= 1
+                    stats['totalSeconds'] += time.perf_counter() - start
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                return response
+
+            stats['lastError'] = str(error) if error is not None else f"HTTP {response.status_code}"
+            if attempt == retries:
+                stats['failures'] += 1
+                logger.error(f"❌ {method} {url} failed after {attempt + 1} attempts: {stats['lastError']}")
+                if error is not None:
+                    raise error
+                return response
+
+            stats['retries'] += 1
+            delay = self._delay(attempt, response)
+            logger.warning(f"⚠️ {method} {url}: {stats['lastError']} - retry {attempt + 1}/{retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def get_json(self, url: str, params: dict = None, **kwargs) -> Any:
+        """GET + raise_for_status + JSON"""
+        response = await self.request('GET', url, params=params, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def gather_json(self, *urls: str) -> list:
+        """Plusieurs GET JSON en parallèle (bornés par la limite par hôte)"""
+        return await asyncio.gather(*(self.get_json(url) for url in urls))
+
+    # ========== CYCLE DE VIE ==========
+
+    async def aclose(self):
+        """Ferme le client de l'event loop courante"""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state['client'].aclose()
+
+    def status(self) -> dict:
+        hosts = {}
+        for host, stats in self.metrics.items():
+            completed = stats['requests'] - stats['inFlight']
+            hosts[host] = {
+                **stats,
+                'totalSeconds': round(stats['totalSeconds'], 3),
+                'avgMs': round(stats['totalSeconds'] / completed * 1000, 1) if completed else None,
+            }
+        return {
+            'timeout': self.timeout,
+            'maxConnections': self.max_connections,
+            'perHostLimit': self.per_host_limit,
+            'retries': self.retries,
+            'hosts': hosts,
+        }
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée dans main.py et routes/
+http_client = HttpClient()
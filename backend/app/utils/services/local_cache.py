@@ -0,0 +1,196 @@
+import fnmatch
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Canal Redis pub/sub des invalidations entre workers
+INVALIDATION_CHANNEL = os.getenv('CACHE_INVALIDATION_CHANNEL', 'cache:invalidate')
+
+# Namespaces (préfixe de clé avant ':') gardés en mémoire → budget en Mo
+DEFAULT_LIMITS = 'grands_prix:4,drivers:16,laps:64,telemetry:128'
+
+
+def _parse_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for item in spec.split(','):
+        if ':' in item:
+            namespace, megabytes = item.split(':', 1)
+            limits[namespace.strip()] = int(float(megabytes) * 1024 * 1024)
+    return limits
+
+
+class _Namespace:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.size = 0
+        self.metrics = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+
+class LocalCache:
+    """
+    Niveau de cache en mémoire du process, devant Redis (voir AsyncRedisCache).
+
+    - Un LRU par namespace (préfixe de clé), borné en octets ; les autres
+      namespaces ne sont pas gardés en mémoire
+    - Entrée = valeur encodée telle que stockée dans Redis, et ses formes
+      décodées (valeur Python, texte JSON) mémorisées au premier accès :
+      les hits suivants ne coûtent ni aller-retour Redis ni décodage
+    - Durée de vie courte (LOCAL_CACHE_TTL) : borne la fraîcheur si une
+      invalidation pub/sub est perdue
+    - Invalidations : directes dans le process, publiées sur Redis pour les
+      autres workers (message {'origin', 'keys' | 'pattern'})
+
+    Les valeurs renvoyées sont partagées entre les requêtes : ne pas les modifier.
+
+    Configuration (variables d'environnement) :
+        LOCAL_CACHE_LIMITS          "namespace:Mo,..." (défaut: grands_prix:4,drivers:16,laps:64,telemetry:128)
+        LOCAL_CACHE_TTL             secondes de vie max d'une entrée (défaut: 60)
+        CACHE_INVALIDATION_CHANNEL  canal pub/sub (défaut: cache:invalidate)
+    """
+
+    def __init__(self, limits: Dict[str, int] = None, ttl: float = None):
+        limits = limits if limits is not None else _parse_limits(os.getenv('LOCAL_CACHE_LIMITS', DEFAULT_LIMITS))
+        self.ttl = ttl if ttl is not None else float(os.getenv('LOCAL_CACHE_TTL', '60'))
+        self.instance_id = uuid.uuid4().hex
+        self._namespaces = {namespace: _Namespace(limit) for namespace, limit in limits.items() if limit > 0}
+        self._lock = threading.Lock()
+
+    def _namespace(self, key: str) -> Optional[_Namespace]:
+        return self._namespaces.get(key.split(':', 1)[0])
+
+    def tracks(self, key: str) -> bool:
+        return self._namespace(key) is not None
+
+    # ========== LECTURE / ÉCRITURE ==========
+
+    def get(self, key: str, decode: Callable[[bytes], Any]) -> Optional[Any]:
+        """Forme `decode(valeur encodée)` de l'entrée, None si absente ou expirée"""
+        namespace = self._namespace(key)
+        if namespace is None:
+            return None
+
+        with self._lock:
+            entry = namespace.entries.get(key)
+            if entry is None or entry['expires'] <= time.monotonic():
+                if entry is not None:
+                    self._remove(namespace, key)
+                namespace.metrics['misses'] += 1
+                return None
+
+            namespace.entries.move_to_end(key)
+            namespace.metrics['hits'] += 1
+            if decode in entry['decoded']:
+                return entry['decoded'][decode]
+
+        value = decode(entry['raw'])
+        self._memoize(namespace, key, entry, decode, value)
+        return value
+
+    def put(self, key: str, raw: bytes, ttl: float = None, decode: Callable = None, value: Any = None):
+        """Mémorise une valeur encodée (et, si fournie, sa forme décodée par `decode`)"""
+        namespace = self._namespace(key)
+        if namespace is None:
+            return
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        entry = {'raw': raw, 'expires': time.monotonic() + ttl, 'decoded': {}, 'size': len(raw)}
+
+        with self._lock:
+            self._remove(namespace, key)
+            if entry['size'] > namespace.limit:
+                return
+            namespace.entries[key] = entry
+            namespace.size += entry['size']
+            self._evict(namespace)
+
+        if decode is not None:
+            self._memoize(namespace, key, entry, decode, value)
+
+    def _memoize(self, namespace: _Namespace, key: str, entry: dict, decode: Callable, value: Any):
+        with self._lock:
+            if namespace.entries.get(key) is not entry:
+                return
+            entry['decoded'][decode] = value
+            if isinstance(value, bytes):
+                entry['size'] += len(value)
+                namespace.size += len(value)
+                self._evict(namespace)
+
+    def _remove(self, namespace: _Namespace, key: str) -> bool:
+        entry = namespace.entries.pop(key, None)
+        if entry is None:
+            return False
+        namespace.size -= entry['size']
+        return True
+
+    def _evict(self, namespace: _Namespace):
+        while namespace.size > namespace.limit and namespace.entries:
+            key = next(iter(namespace.entries))
+            self._remove(namespace, key)
+            namespace.metrics['evictions'] += 1
+
+    # ========== INVALIDATION ==========
+
+    def invalidate(self, keys: List[str] = None, pattern: str = None) -> int:
+        """Retire des clés (ou un pattern glob Redis) du niveau local"""
+        removed = 0
+        with self._lock:
+            for key in keys or []:
+                namespace = self._namespace(key)
+                if namespace is not None and self._remove(namespace, key):
+                    namespace.metrics['invalidations'] += 1
+                    removed += 1
+
+            if pattern is not None:
+                for namespace in self._namespaces.values():
+                    for key in [k for k in namespace.entries if fnmatch.fnmatchcase(k, pattern)]:
+                        self._remove(namespace, key)
+                        namespace.metrics['invalidations'] += 1
+                        removed += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            for namespace in self._namespaces.values():
+                namespace.entries.clear()
+                namespace.size = 0
+
+    def message(self, keys: List[str] = None, pattern: str = None) -> Optional[str]:
+        """Message d'invalidation à publier (None si rien ne concerne le niveau local)"""
+        keys = [key for key in keys or [] if self.tracks(key)]
+        if not keys and pattern is None:
+            return None
+        return json.dumps({'origin': self.instance_id, 'keys': keys, 'pattern': pattern})
+
+    def apply(self, message) -> int:
+        """Applique un message reçu d'un autre worker (ceux de ce process sont ignorés)"""
+        data = json.loads(message)
+        if data.get('origin') == self.instance_id:
+            return 0
+        return self.invalidate(data.get('keys'), data.get('pattern'))
+
+    def status(self) -> dict:
+        with self._lock:
+            namespaces = {}
+            for name, namespace in self._namespaces.items():
+                lookups = namespace.metrics['hits'] + namespace.metrics['misses']
+                namespaces[name] = {
+                    'entries': len(namespace.entries),
+                    'bytes': namespace.size,
+                    'limitBytes': namespace.limit,
+                    **namespace.metrics,
+                    'hitRate': round(namespace.metrics['hits'] / lookups, 4) if lookups else None,
+                }
+        return {'ttl': self.ttl, 'namespaces': namespaces}
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée par redis_cache (un niveau local par process)
+local_cache = LocalCache()
@@ -0,0 +1,236 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+import logging
+
+import fastf1
+import pandas as pd
+
+from app.utils.services.redis_cache import async_redis_cache
+from app.utils.services.response_cache import run_detached
+from app.utils.services.ttl_policy import SESSION_IDENTIFIERS, SESSION_DURATIONS
+
+logger = logging.getLogger(__name__)
+
+# Une étape = (libellé, callable sans argument, sync ou async)
+Step = Tuple[str, Callable]
+
+
+class SessionNotReady(Exception):
+    """Les données de la session ne sont pas encore publiées - réessayer plus tard"""
+
+
+class PrecomputeScheduler:
+    """
+    Précalcule les payloads standards dès qu'une session est terminée.
+
+    À chaque tick :
+    - lit le calendrier (fastf1.get_event_schedule, ou un loader injecté)
+    - repère les sessions terminées depuis PRECOMPUTE_DELAY_MINUTES
+      (et au plus PRECOMPUTE_LOOKBACK_DAYS)
+    - exécute les étapes fournies par `build_steps` dans un thread, pour ne
+      pas bloquer l'event loop
+
+    Configuration (variables d'environnement) :
+        PRECOMPUTE_ENABLED        "1" pour démarrer au lancement de l'app
+        PRECOMPUTE_INTERVAL       secondes entre deux ticks (défaut: 300)
+        PRECOMPUTE_DELAY_MINUTES  attente après la fin estimée (défaut: 30)
+        PRECOMPUTE_LOOKBACK_DAYS  fenêtre de rattrapage (défaut: 3)
+        PRECOMPUTE_SESSIONS       types de sessions (défaut: "Q,R")
+        PRECOMPUTE_MAX_ATTEMPTS   essais par session (défaut: 6)
+
+    Pour les tests, `schedule_loader` peut renvoyer un DataFrame local et
+    `clock` une date fixe, puis appeler `run_once()` directement.
+    """
+
+    def __init__(
+        self,
+        build_steps: Callable[[int, int, str], List[Step]],
+        schedule_loader: Optional[Callable[[int], pd.DataFrame]] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+        cache=async_redis_cache,
+    ):
+        self.build_steps = build_steps
+        self.schedule_loader = schedule_loader or fastf1.get_event_schedule
+        self.clock = clock or (lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+        self.cache = cache
+
+        self.enabled = os.getenv('PRECOMPUTE_ENABLED', '0') == '1'
+        self.interval = int(os.getenv('PRECOMPUTE_INTERVAL', '300'))
+        self.delay = timedelta(minutes=int(os.getenv('PRECOMPUTE_DELAY_MINUTES', '30')))
+        self.lookback = timedelta(days=int(os.getenv('PRECOMPUTE_LOOKBACK_DAYS', '3')))
+        self.session_types = [s.strip().upper() for s in os.getenv('PRECOMPUTE_SESSIONS', 'Q,R').split(',') if s.strip()]
+        self.max_attempts = int(os.getenv('PRECOMPUTE_MAX_ATTEMPTS', '6'))
+
+        self._task: Optional[asyncio.Task] = None
+        self._schedules: dict = {}
+        self._done: set = set()
+        self._attempts: dict = {}
+        self.metrics = {
+            'ticks': 0,
+            'sessions_done': 0,
+            'sessions_failed': 0,
+            'sessions_not_ready': 0,
+            'steps_done': 0,
+            'steps_failed': 0,
+            'last_tick': None,
+            'last_error': None,
+            'current': None,
+        }
+
+    # ========== CALENDRIER ==========
+
+    def _load_schedule(self, year: int) -> pd.DataFrame:
+        """Calendrier d'une saison, relu au plus une fois par heure"""
+        cached = self._schedules.get(year)
+        if cached and time.monotonic() - cached[0] < 3600:
+            return cached[1]
+
+        schedule = self.schedule_loader(year)
+        self._schedules[year] = (time.monotonic(), schedule)
+        return schedule
+
+    def finished_sessions(self, now: datetime) -> List[Tuple[int, int, str, datetime]]:
+        """
+        Sessions terminées et a priori publiées à `now`, les plus anciennes d'abord.
+
+        Returns:
+            [(year, round, session_type, fin_estimée), ...]
+        """
+        sessions = []
+        for year in sorted({now.year, (now - self.lookback).year}):
+            schedule = self._load_schedule(year)
+
+            for _, event in schedule.iterrows():
+                round_number = int(event['RoundNumber'])
+                if round_number == 0:  # Tests hivernaux
+                    continue
+
+                for n in range(1, 6):
+                    name = event.get(f'Session{n}')
+                    start = event.get(f'Session{n}DateUtc')
+                    session_type = SESSION_IDENTIFIERS.get(name)
+
+                    if session_type not in self.session_types or pd.isna(start):
+                        continue
+
+                    end = pd.Timestamp(start).to_pydatetime().replace(tzinfo=None) + SESSION_DURATIONS[session_type]
+                    if end + self.delay <= now and now - end <= self.lookback:
+                        sessions.append((year, round_number, session_type, end))
+
+        sessions.sort(key=lambda s: s[3])
+        return sessions
+
+    # ========== EXÉCUTION ==========
+
+    def _marker(self, year: int, gp_round: int, session_type: str) -> str:
+        return f"precompute:done:{year}:{gp_round}:{session_type}"
+
+    async def _is_done(self, key: tuple) -> bool:
+        if key in self._done:
+            return True
+        if self.cache is not None and await self.cache.get(self._marker(*key)):
+            self._done.add(key)
+            return True
+        return False
+
+    async def precompute(self, year: int, gp_round: int, session_type: str) -> bool:
+        """Exécute toutes les étapes d'une session. True si la session est traitée."""
+        key = (year, gp_round, session_type)
+        label = f"{year} R{gp_round} {session_type}"
+
+        try:
+            steps = await asyncio.to_thread(self.build_steps, year, gp_round, session_type)
+        except SessionNotReady as e:
+            self.metrics['sessions_not_ready'] += 1
+            logger.info(f"⏳ Precompute {label}: data not ready ({e})")
+            return False
+
+        failed = 0
+        for i, (step_label, fn) in enumerate(steps):
+            self.metrics['current'] = {
+                'session': label,
+                'step': step_label,
+                'progress': f"{i + 1}/{len(steps)}",
+            }
+            try:
+                await asyncio.to_thread(run_detached, fn)
+                self.metrics['steps_done'] += 1
+            except Exception as e:
+                failed += 1
+                self.metrics['steps_failed'] += 1
+                self.metrics['last_error'] = f"{label} {step_label}: {e}"
+                logger.error(f"❌ Precompute {label} {step_label}: {e}")
+
+        self.metrics['current'] = None
+        self._done.add(key)
+        if self.cache is not None:
+            await self.cache.set(self._marker(*key), {'steps': len(steps), 'failed': failed}, ttl=int(self.lookback.total_seconds()) * 2)
+
+        self.metrics['sessions_done'] += 1
+        logger.info(f"✅ Precompute {label}: {len(steps) - failed}/{len(steps)} steps")
+        return True
+
+    async def run_once(self) -> int:
+        """Un tick : traite les sessions terminées pas encore précalculées"""
+        now = self.clock()
+        self.metrics['ticks'] += 1
+        self.metrics['last_tick'] = now.isoformat()
+
+        # Calendrier FastF1 (réseau / disque) hors de l'event loop
+        sessions = await asyncio.to_thread(self.finished_sessions, now)
+
+        processed = 0
+        for year, gp_round, session_type, _ in sessions:
+            key = (year, gp_round, session_type)
+            if await self._is_done(key) or self._attempts.get(key, 0) >= self.max_attempts:
+                continue
+
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+            try:
+                if await self.precompute(year, gp_round, session_type):
+                    processed += 1
+                elif self._attempts[key] >= self.max_attempts:
+                    self.metrics['sessions_failed'] += 1
+            except Exception as e:
+                self.metrics['sessions_failed'] += 1
+                self.metrics['last_error'] = f"{key}: {e}"
+                logger.error(f"❌ Precompute {key}: {e}")
+
+        return processed
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.metrics['last_error'] = str(e)
+                logger.error(f"❌ Precompute tick failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Lance la boucle en tâche de fond (si PRECOMPUTE_ENABLED=1)"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+            logger.info(f"🔄 Precompute scheduler started ({', '.join(self.session_types)} every {self.interval}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'running': self._task is not None and not self._task.done(),
+            'interval': self.interval,
+            'sessionTypes': self.session_types,
+            'pending': {f"{y}:{r}:{s}": n for (y, r, s), n in self._attempts.items() if (y, r, s) not in self._done},
+            **self.metrics,
+        }
@@ -1,18 +1,34 @@
 import redis
-import json
+import redis.asyncio as aioredis
+import asyncio
 import os
-from typing import Optional, Any
+import time
+import uuid
+import weakref
+from typing import Optional, Any, List
 import logging
 
+from app.utils.services.cache_codec import cache_codec, CacheCodecError
+from app.utils.services.local_cache import local_cache, INVALIDATION_CHANNEL
+
 logger = logging.getLogger(__name__)
 
+# Libère un verrou seulement s'il appartient encore à son détenteur
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
 class RedisCache:
     """
     Service Redis pour cache backend partagé entre tous les users.
     
     Gère automatiquement :
     - Connexion Redis avec fallback si down
-    - Sérialisation/désérialisation JSON
+    - Sérialisation via cache_codec (orjson + zstd au-delà d'un seuil,
+      anciennes entrées JSON texte toujours lisibles)
     - TTL intelligent par type de données
     - Gestion d'erreurs (l'app continue même si Redis crash)
     """
@@ -32,7 +48,7 @@ class RedisCache:
             
             self.client = redis.from_url(
                 redis_url,
-                decode_responses=True,  # Auto-decode bytes → str
+                decode_responses=False,  # Valeurs binaires (cache_codec)
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True
@@ -63,16 +79,16 @@ class RedisCache:
             if value is None:
                 return None
             
-            # Désérialiser JSON
-            data = json.loads(value)
+            # Désérialiser (format versionné ou ancien JSON)
+            data = cache_codec.decode(value)
             logger.info(f"✅ Cache HIT: {key}")
             return data
             
         except redis.RedisError as e:
             logger.error(f"❌ Redis GET error for {key}: {e}")
             return None
-        except json.JSONDecodeError as e:
-            logger.error(f"❌ JSON decode error for {key}: {e}")
+        except CacheCodecError as e:
+            logger.error(f"❌ Cache decode error for {key}: {e}")
             return None
     
     def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
@@ -91,11 +107,12 @@ class RedisCache:
             return False
         
         try:
-            # Sérialiser en JSON
-            serialized = json.dumps(value)
+            # Sérialiser (+ compression au-delà du seuil)
+            serialized = cache_codec.encode(value)
             
             # Stocker avec TTL
             self.client.setex(key, ttl, serialized)
+            self._invalidate_local(keys=[key])
             
             logger.info(f"💾 Cache SET: {key} (TTL: {ttl}s)")
             return True
@@ -103,10 +120,66 @@ class RedisCache:
         except redis.RedisError as e:
             logger.error(f"❌ Redis SET error for {key}: {e}")
             return False
-        except (TypeError, ValueError) as e:
-            logger.error(f"❌ JSON encode error for {key}: {e}")
+        except CacheCodecError as e:
+            logger.error(f"❌ Cache encode error for {key}: {e}")
+            return False
+    
+    def set_fields(self, key: str, mapping: dict, ttl: int = 3600) -> bool:
+        """
+        Stocke un dict comme un hash Redis (une entrée, un champ encodé par section).
+        
+        Permet de relire seulement certaines sections avec get_fields.
+        """
+        if not self.client:
+            return False
+        
+        try:
+            serialized = {field: cache_codec.encode(value) for field, value in mapping.items()}
+            
+            pipe = self.client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=serialized)
+            pipe.expire(key, ttl)
+            pipe.execute()
+            
+            logger.info(f"💾 Cache HSET: {key} ({len(mapping)} fields, TTL: {ttl}s)")
+            return True
+            
+        except redis.RedisError as e:
+            logger.error(f"❌ Redis HSET error for {key}: {e}")
+            return False
+        except CacheCodecError as e:
+            logger.error(f"❌ Cache encode error for {key}: {e}")
             return False
     
+    def get_fields(self, key: str, fields: list) -> Optional[dict]:
+        """
+        Récupère certains champs d'un hash stocké via set_fields.
+        
+        Returns:
+            - {champ: données} si TOUS les champs sont présents
+            - None sinon (cache MISS ou Redis down)
+        """
+        if not self.client or not fields:
+            return None
+        
+        try:
+            values = self.client.hmget(key, fields)
+            
+            if any(value is None for value in values):
+                return None
+            
+            data = {field: cache_codec.decode(value) for field, value in zip(fields, values)}
+            logger.info(f"✅ Cache HIT: {key} {list(fields)}")
+            return data
+            
+        except redis.RedisError as e:
+            logger.error(f"❌ Redis HMGET error for {key}: {e}")
+            return None
+        except CacheCodecError as e:
+            logger.error(f"❌ Cache decode error for {key}: {e}")
+            return None
+    
     def delete(self, key: str) -> bool:
         """Supprime une clé du cache"""
         if not self.client:
@@ -114,6 +187,7 @@ class RedisCache:
         
         try:
             self.client.delete(key)
+            self._invalidate_local(keys=[key])
             logger.info(f"🗑️ Cache DELETE: {key}")
             return True
         except redis.RedisError as e:
@@ -132,6 +206,7 @@ class RedisCache:
         
         try:
             keys = self.client.keys(pattern)
+            self._invalidate_local(pattern=pattern)
             if keys:
                 deleted = self.client.delete(*keys)
                 logger.info(f"🗑️ Cache DELETE pattern {pattern}: {deleted} keys")
@@ -148,12 +223,20 @@ class RedisCache:
         
         try:
             self.client.flushall()
+            self._invalidate_local(pattern='*')
             logger.warning("🧹 Cache FLUSHED completely")
             return True
         except redis.RedisError as e:
             logger.error(f"❌ Redis FLUSH error: {e}")
             return False
     
+    def _invalidate_local(self, keys: list = None, pattern: str = None):
+        """Retire les clés du niveau local de ce process et des autres workers (pub/sub)"""
+        local_cache.invalidate(keys, pattern)
+        message = local_cache.message(keys, pattern)
+        if message:
+            self.client.publish(INVALIDATION_CHANNEL, message)
+    
     def get_cache_key_laps(self, year: int, gp: int, session: str, driver: str) -> str:
         """Génère une clé Redis pour session laps"""
         return f"laps:{year}:{gp}:{session}:{driver}"
@@ -173,19 +256,18 @@ class RedisCache:
         lap2_str = f"lap{lap2}" if lap2 is not None else "fastest"
         return f"telemetry:{year}:{gp}:{session}:{driver1}:{lap1_str}:{driver2}:{lap2_str}"
     
-    def get_ttl_by_session_status(self, year: int, gp: int) -> int:
+    def get_ttl_by_session_status(self, year: int, gp: Optional[int] = None, session: Optional[str] = None) -> int:
         """
-        Retourne un TTL intelligent selon le statut du GP.
+        Retourne un TTL intelligent selon le statut du GP (voir TtlPolicy).
         
-        - GP passé : 24h (données figées)
-        - GP en cours : 5 min (peuvent changer)
-        - GP futur : 1h (planning peut changer)
+        - GP / session passé depuis plus de CACHE_FINAL_AFTER_HOURS : quasi permanent (données figées)
+        - en cours ou tout juste terminé : quelques minutes (peuvent changer)
+        - futur : 1h max (planning peut changer)
+        - gp=None : TTL d'une donnée de saison (jusqu'à la prochaine course publiée)
         """
-        from datetime import datetime
+        from app.utils.services.ttl_policy import ttl_policy
         
-        # TODO: Ajouter logique pour détecter si GP est en cours/passé/futur
-        # Pour l'instant, on met 1h partout
-        return 3600  # 1h par défaut
+        return ttl_policy.ttl(year, gp, session)
     
     def health_check(self) -> dict:
         """Check si Redis est accessible"""
@@ -212,5 +294,428 @@ class RedisCache:
             }
 
 
-# 🔥 INSTANCE GLOBALE - Utilisée dans main.py
-redis_cache = RedisCache()
\ No newline at end of file
+
+class CircuitBreaker:
+    """
+    Coupe-circuit : après `threshold` échecs consécutifs, les appels sont
+    court-circuités pendant `cooldown` secondes, puis un seul appel d'essai
+    passe (succès → refermé, échec → rouvert).
+    """
+    
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial = False
+        self.short_circuited = 0
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self.opened_at < self.cooldown else "half-open"
+    
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.trial or time.monotonic() - self.opened_at < self.cooldown:
+            self.short_circuited += 1
+            return False
+        self.trial = True
+        return True
+    
+    def success(self):
+        if self.opened_at is not None:
+            logger.info("✅ Redis circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+    
+    def abort(self):
+        """Appel terminé sans verdict (annulé, erreur hors Redis) : libère l'essai en cours"""
+        self.trial = False
+    
+    def failure(self):
+        self.failures += 1
+        self.trial = False
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                logger.error(f"🔌 Redis circuit opened for {self.cooldown:.0f}s after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class AsyncRedisCache:
+    """
+    Cache Redis asyncio pour les handlers `async def` (n'attend jamais Redis
+    en bloquant l'event loop).
+    
+    - Pool de connexions par event loop (l'app + les loops du précalcul)
+    - Timeouts courts, cache_codec comme RedisCache (mêmes clés, mêmes valeurs)
+    - mget / set_many pipelinés pour les réponses composées de nombreuses clés
+    - Coupe-circuit : un Redis mort n'est plus sollicité à chaque requête
+    - Expiration souple (soft_ttl, marqueur "{clé}:fresh" = date de
+      péremption) en plus de l'expiration Redis, et verrous : voir
+      ResponseCache (stale-while-revalidate)
+    - Niveau local en mémoire devant Redis (voir LocalCache) : les écritures
+      et suppressions sont publiées sur INVALIDATION_CHANNEL, et la tâche
+      listen_invalidations() applique celles des autres workers
+    
+    Configuration (variables d'environnement) :
+        REDIS_URL                 URL Redis (cache désactivé si absente)
+        REDIS_TIMEOUT             timeout connexion / commande en secondes (défaut: 1)
+        REDIS_MAX_CONNECTIONS     taille du pool par event loop (défaut: 20)
+        REDIS_BREAKER_THRESHOLD   échecs consécutifs avant ouverture (défaut: 3)
+        REDIS_BREAKER_COOLDOWN    secondes avant un appel d'essai (défaut: 30)
+    """
+    
+    def __init__(self, url: str = None, local=local_cache):
+        self.url = url or os.getenv('REDIS_URL')
+        self.local = local
+        self.timeout = float(os.getenv('REDIS_TIMEOUT', '1'))
+        self.max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', '20'))
+        self.breaker = CircuitBreaker(
+            threshold=int(os.getenv('REDIS_BREAKER_THRESHOLD', '3')),
+            cooldown=float(os.getenv('REDIS_BREAKER_COOLDOWN', '30')),
+        )
+        self._loops: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._listener: Optional[asyncio.Task] = None
+        self.metrics = {'localHits': 0, 'redisHits': 0, 'misses': 0, 'invalidationsReceived': 0}
+    
+    def _new_client(self, **options) -> aioredis.Redis:
+        pool = aioredis.ConnectionPool.from_url(
+            self.url,
+            decode_responses=False,
+            socket_connect_timeout=self.timeout,
+            socket_timeout=self.timeout,
+            **options,
+        )
+        return aioredis.Redis(connection_pool=pool)
+    
+    def _client(self) -> Optional[aioredis.Redis]:
+        if not self.url or not self.breaker.allow():
+            return None
+        
+        loop = asyncio.get_running_loop()
+        client = self._loops.get(loop)
+        if client is None:
+            client = self._new_client(max_connections=self.max_connections)
+            self._loops[loop] = client
+        return client
+    
+    async def _call(self, label: str, key: str, operation, default=None):
+        """Exécute une commande ; tout échec Redis compte pour le coupe-circuit"""
+        client = self._client()
+        if client is None:
+            return default
+        
+        try:
+            result = await operation(client)
+        except (redis.RedisError, OSError, asyncio.TimeoutError) as e:
+            self.breaker.failure()
+            logger.error(f"❌ Redis {label} error for {key}: {e}")
+            return default
+        except BaseException:
+            # CancelledError, erreur inattendue : sinon l'essai resterait pris
+            # et Redis contourné jusqu'au redémarrage
+            self.breaker.abort()
+            raise
+        
+        self.breaker.success()
+        return result
+    
+    @staticmethod
+    def _loads(key: str, value: Optional[bytes], decode=cache_codec.decode) -> Optional[Any]:
+        if value is None:
+            return None
+        try:
+            return decode(value)
+        except CacheCodecError as e:
+            logger.error(f"❌ Cache decode error for {key}: {e}")
+            return None
+    
+    @staticmethod
+    def _dumps(label: str, mapping: dict) -> Optional[dict]:
+        try:
+            return {key: cache_codec.encode(value) for key, value in mapping.items()}
+        except CacheCodecError as e:
+            logger.error(f"❌ Cache encode error for {label}: {e}")
+            return None
+    
+    async def _get(self, key: str, decode) -> Optional[Any]:
+        """Niveau local, puis Redis (l'entrée lue est alors gardée en local)"""
+        data = self.local.get(key, decode)
+        if data is not None:
+            self.metrics['localHits'] += 1
+            return data
+        
+        raw = await self._call("GET", key, lambda client: client.get(key))
+        data = self._loads(key, raw, decode=decode)
+        if data is None:
+            self.metrics['misses'] += 1
+            return None
+        
+        self.metrics['redisHits'] += 1
+        self.local.put(key, raw, decode=decode, value=data)
+        logger.info(f"✅ Cache HIT: {key}")
+        return data
+    
+    async def get(self, key: str) -> Optional[Any]:
+        return await self._get(key, cache_codec.decode)
+    
+    @staticmethod
+    def _fresh_key(key: str) -> str:
+        return f"{key}:fresh"
+    
+    async def get_with_freshness(self, key: str, as_json: bool = False) -> tuple:
+        """
+        (valeur, fraîche) : fraîche tant que le soft_ttl de l'entrée court,
+        (None, False) si absente (expiration Redis = hard TTL dépassée).
+        Une entrée sans marqueur (écrite sans soft_ttl, ou avant les marqueurs)
+        est fraîche jusqu'à son expiration Redis.
+        """
+        decode = cache_codec.decode_json_bytes if as_json else cache_codec.decode
+        data = self.local.get(key, decode)
+        if data is not None:
+            self.metrics['localHits'] += 1
+            return data, True
+        
+        async def read(client):
+            pipe = client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.get(self._fresh_key(key))
+            return await pipe.execute()
+        
+        raw, stale_at = await self._call("GET", key, read, default=(None, None))
+        data = self._loads(key, raw, decode=decode)
+        if data is None:
+            self.metrics['misses'] += 1
+            return None, False
+        
+        # Marqueur : date (epoch) de fin du soft_ttl ; absent = fraîche
+        remaining = float(stale_at) - time.time() if stale_at is not None else None
+        fresh = remaining is None or remaining > 0
+        self.metrics['redisHits'] += 1
+        if fresh:
+            self.local.put(key, raw, ttl=remaining, decode=decode, value=data)
+        logger.info(f"✅ Cache HIT: {key}{'' if fresh else ' (stale)'}")
+        return data, fresh
+    
+    async def get_json_bytes(self, key: str) -> Optional[bytes]:
+        """
+        Entrée sous forme de texte JSON, sans la désérialiser : à renvoyer
+        telle quelle (Response application/json) pour les gros payloads.
+        """
+        return await self._get(key, cache_codec.decode_json_bytes)
+    
+    async def _publish(self, keys: List[str] = None, pattern: str = None):
+        """Invalidation des niveaux locaux des autres workers"""
+        message = self.local.message(keys, pattern)
+        if message:
+            await self._call("PUBLISH", INVALIDATION_CHANNEL, lambda client: client.publish(INVALIDATION_CHANNEL, message), default=0)
+    
+    async def set(self, key: str, value: Any, ttl: int = 3600, soft_ttl: int = None) -> bool:
+        """
+        Args:
+            ttl: expiration Redis de l'entrée (hard TTL)
+            soft_ttl: durée de fraîcheur (voir get_with_freshness), None = toute la durée
+                (pas de marqueur)
+        """
+        serialized = self._dumps(key, {key: value})
+        if serialized is None:
+            return False
+        serialized = serialized[key]
+        
+        async def write(client):
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(key, ttl, serialized)
+            if soft_ttl is not None:
+                pipe.setex(self._fresh_key(key), ttl, repr(time.time() + soft_ttl).encode())
+            else:
+                pipe.delete(self._fresh_key(key))
+            return await pipe.execute()
+        
+        done = await self._call("SET", key, write, default=None)
+        if done is None:
+            self.local.invalidate([key])
+            return False
+        
+        self.local.put(key, serialized, ttl=soft_ttl or ttl)
+        await self._publish(keys=[key])
+        logger.info(f"💾 Cache SET: {key} (TTL: {ttl}s{f', soft: {soft_ttl}s' if soft_ttl else ''})")
+        return True
+    
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Plusieurs clés en un aller-retour (None pour chaque clé absente)"""
+        if not keys:
+            return []
+        data = [self.local.get(key, cache_codec.decode) for key in keys]
+        missing = [key for key, value in zip(keys, data) if value is None]
+        self.metrics['localHits'] += len(keys) - len(missing)
+        if not missing:
+            return data
+        
+        values = await self._call("MGET", f"{len(missing)} keys", lambda client: client.mget(missing), default=[None] * len(missing))
+        fetched = {}
+        for key, raw in zip(missing, values):
+            value = self._loads(key, raw)
+            if value is not None:
+                fetched[key] = value
+                self.local.put(key, raw, decode=cache_codec.decode, value=value)
+        
+        self.metrics['redisHits'] += len(fetched)
+        self.metrics['misses'] += len(missing) - len(fetched)
+        logger.info(f"✅ Cache MGET: {len(keys) - len(missing) + len(fetched)}/{len(keys)} hits")
+        return [value if value is not None else fetched.get(key) for key, value in zip(keys, data)]
+    
+    async def set_many(self, mapping: dict, ttl: int = 3600) -> bool:
+        """Plusieurs clés (même TTL) en un pipeline"""
+        if not mapping:
+            return True
+        serialized = self._dumps(f"{len(mapping)} keys", mapping)
+        if serialized is None:
+            return False
+        
+        async def write(client):
+            pipe = client.pipeline(transaction=False)
+            for key, value in serialized.items():
+                pipe.setex(key, ttl, value)
+            pipe.delete(*(self._fresh_key(key) for key in serialized))
+            return await pipe.execute()
+        
+        done = await self._call("PIPELINE SET", f"{len(mapping)} keys", write, default=None)
+        if done is None:
+            self.local.invalidate(list(serialized))
+            return False
+        
+        for key, value in serialized.items():
+            self.local.put(key, value, ttl=ttl)
+        await self._publish(keys=list(serialized))
+        logger.info(f"💾 Cache SET: {len(mapping)} keys (TTL: {ttl}s)")
+        return True
+    
+    async def set_fields(self, key: str, mapping: dict, ttl: int = 3600) -> bool:
+        """Hash Redis, un champ encodé par section (voir RedisCache.set_fields)"""
+        serialized = self._dumps(key, mapping)
+        if serialized is None:
+            return False
+        
+        async def write(client):
+            pipe = client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=serialized)
+            pipe.expire(key, ttl)
+            return await pipe.execute()
+        
+        done = await self._call("HSET", key, write, default=None)
+        if done is not None:
+            logger.info(f"💾 Cache HSET: {key} ({len(mapping)} fields, TTL: {ttl}s)")
+        return done is not None
+    
+    async def get_fields(self, key: str, fields: list) -> Optional[dict]:
+        """Certains champs d'un hash, None si l'un d'eux manque"""
+        if not fields:
+            return None
+        values = await self._call("HMGET", key, lambda client: client.hmget(key, fields))
+        if values is None or any(value is None for value in values):
+            return None
+        
+        data = {field: self._loads(key, value) for field, value in zip(fields, values)}
+        logger.info(f"✅ Cache HIT: {key} {list(fields)}")
+        return data
+    
+    async def delete(self, key: str) -> bool:
+        self.local.invalidate([key])
+        deleted = await self._call("DELETE", key, lambda client: client.delete(key, self._fresh_key(key)), default=False)
+        await self._publish(keys=[key])
+        return bool(deleted)
+    
+    async def delete_pattern(self, pattern: str) -> int:
+        """Supprime les clés d'un pattern (SCAN, sans bloquer Redis comme KEYS)"""
+        async def delete(client):
+            keys = [key async for key in client.scan_iter(match=pattern, count=500)]
+            return await client.delete(*keys) if keys else 0
+        
+        self.local.invalidate(pattern=pattern)
+        deleted = await self._call("DELETE pattern", pattern, delete, default=0)
+        await self._publish(pattern=pattern)
+        if deleted:
+            logger.info(f"🗑️ Cache DELETE pattern {pattern}: {deleted} keys")
+        return deleted
+    
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        """Verrou Redis (SET NX PX) partagé entre workers ; jeton à rendre à release_lock, None si déjà pris"""
+        token = uuid.uuid4().hex
+        acquired = await self._call("LOCK", name, lambda client: client.set(f"lock:{name}", token, nx=True, px=int(ttl * 1000)))
+        return token if acquired else None
+    
+    async def release_lock(self, name: str, token: str) -> bool:
+        released = await self._call("UNLOCK", name, lambda client: client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{name}", token), default=0)
+        return bool(released)
+    
+    async def listen_invalidations(self):
+        """
+        Tâche de fond : applique au niveau local les invalidations publiées par
+        les autres workers. Connexion dédiée, reconnectée après une erreur ; le
+        niveau local est vidé à chaque (re)connexion (messages manqués).
+        """
+        while True:
+            client = None
+            try:
+                client = self._new_client()
+                async with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    self.local.clear()
+                    logger.info(f"📡 Listening for cache invalidations on {INVALIDATION_CHANNEL}")
+                    
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            self.metrics['invalidationsReceived'] += 1
+                            self.local.apply(message['data'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Cache invalidation listener error: {e}")
+                self.local.clear()
+            finally:
+                if client is not None:
+                    await client.aclose()
+            
+            await asyncio.sleep(self.breaker.cooldown)
+    
+    def start_invalidation_listener(self):
+        if self.url and self._listener is None:
+            self._listener = asyncio.create_task(self.listen_invalidations())
+    
+    async def stop_invalidation_listener(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+    
+    async def aclose(self):
+        """Ferme le pool de l'event loop courante"""
+        client = self._loops.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
+    def status(self) -> dict:
+        return {
+            "enabled": bool(self.url),
+            "circuit": self.breaker.state,
+            "codec": cache_codec.name,
+            "consecutiveFailures": self.breaker.failures,
+            "shortCircuited": self.breaker.short_circuited,
+            "listening": self._listener is not None and not self._listener.done(),
+            **self.metrics,
+            "local": self.local.status(),
+        }
+
+
+# 🔥 INSTANCES GLOBALES - Utilisées dans main.py (async_redis_cache dans les handlers async)
+redis_cache = RedisCache()
+async_redis_cache = AsyncRedisCache()
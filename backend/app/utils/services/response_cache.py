@@ -0,0 +1,235 @@
+import asyncio
+import inspect
+import os
+import weakref
+from typing import Any, Callable, Optional, Union
+import logging
+
+from fastapi import Response
+
+from app.utils.services.http_client import http_client
+from app.utils.services.redis_cache import async_redis_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def _in_own_loop(coroutine):
+    """
+    Exécute une coroutine, attend les recalculs qu'elle a lancés, puis ferme
+    les pools HTTP / Redis ouverts par sa loop
+    """
+    try:
+        return await coroutine
+    finally:
+        await response_cache.aclose()
+        await http_client.aclose()
+        await async_redis_cache.aclose()
+
+
+def run_detached(fn: Callable):
+    """
+    Exécute fn() dans le thread courant ; si c'est une coroutine (endpoint
+    async), dans une event loop dédiée. À appeler via asyncio.to_thread.
+    """
+    result = fn()
+    if inspect.iscoroutine(result):
+        return asyncio.run(_in_own_loop(result))
+    return result
+
+
+class ResponseCache:
+    """
+    Cache des réponses d'endpoints, en stale-while-revalidate.
+
+    Chaque entrée a deux expirations :
+    - soft TTL (`ttl`) : au-delà, la copie périmée est servie immédiatement et
+      UNE tâche de fond la recalcule (verrou Redis partagé entre workers,
+      calcul dans un thread avec sa propre event loop)
+    - hard TTL (`ttl` × CACHE_HARD_TTL_FACTOR par défaut) : l'entrée disparaît
+      de Redis, la requête suivante recalcule de façon synchrone ; les requêtes
+      simultanées du même process partagent ce calcul
+
+    `ttl` peut être une fonction : elle n'est appelée qu'au moment d'écrire
+    (calcul ou recalcul), jamais sur un hit.
+
+    Configuration (variables d'environnement) :
+        CACHE_HARD_TTL_FACTOR   hard TTL = soft TTL × facteur (défaut: 4)
+        CACHE_REFRESH_LOCK_TTL  durée max d'un recalcul en arrière-plan, en s (défaut: 300)
+    """
+
+    def __init__(self, cache=async_redis_cache):
+        self.cache = cache
+        self.hard_ttl_factor = float(os.getenv('CACHE_HARD_TTL_FACTOR', '4'))
+        self.lock_ttl = float(os.getenv('CACHE_REFRESH_LOCK_TTL', '300'))
+
+        self._inflight: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._refreshing: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self.metrics = {'fresh': 0, 'stale': 0, 'miss': 0, 'refreshed': 0, 'refreshFailed': 0, 'refreshLocked': 0}
+
+    def _ttls(self, ttl: Union[int, Callable[[], int]], hard_ttl: Optional[int]) -> tuple:
+        """(soft TTL, hard TTL) ; `ttl` évalué ici s'il est paresseux"""
+        ttl = ttl() if callable(ttl) else ttl
+        return ttl, hard_ttl or int(ttl * self.hard_ttl_factor)
+
+    async def _compute_and_store(self, key: str, compute: Callable, ttl, hard_ttl: Optional[int]) -> Any:
+        value = compute()
+        if inspect.isawaitable(value):
+            value = await value
+        ttl, hard_ttl = self._ttls(ttl, hard_ttl)
+        await self.cache.set(key, value, ttl=hard_ttl, soft_ttl=ttl)
+        return value
+
+    async def _compute_once(self, key: str, compute: Callable, ttl, hard_ttl: Optional[int]) -> Any:
+        """Calcul synchrone, partagé par les requêtes simultanées de la même event loop"""
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute_and_store(key, compute, ttl, hard_ttl))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _store_detached(self, key: str, compute: Callable, ttl, hard_ttl: Optional[int]) -> Any:
+        try:
+            return await self._compute_and_store(key, compute, ttl, hard_ttl)
+        finally:
+            await self.cache.aclose()
+
+    async def _refresh(self, key: str, compute: Callable, ttl, hard_ttl: Optional[int]):
+        token = None
+        try:
+            token = await self.cache.acquire_lock(f"refresh:{key}", self.lock_ttl)
+            if token is None:
+                self.metrics['refreshLocked'] += 1
+                return
+            await asyncio.to_thread(run_detached, lambda: self._store_detached(key, compute, ttl, hard_ttl))
+            self.metrics['refreshed'] += 1
+            logger.info(f"🔄 Cache refreshed: {key}")
+        except Exception as e:
+            self.metrics['refreshFailed'] += 1
+            logger.error(f"❌ Cache refresh failed for {key}: {e}")
+        finally:
+            self._refreshing.get(asyncio.get_running_loop(), {}).pop(key, None)
+            if token is not None:
+                await self.cache.release_lock(f"refresh:{key}", token)
+
+    def _refresh_in_background(self, key: str, compute: Callable, ttl, hard_ttl: Optional[int]):
+        """
+        Un seul recalcul par clé : tâche locale à la loop (enregistrée avant
+        toute attente, les hits simultanés du worker ne prennent pas le verrou),
+        verrou Redis entre workers
+        """
+        refreshing = self._refreshing.setdefault(asyncio.get_running_loop(), {})
+        if key not in refreshing:
+            refreshing[key] = asyncio.create_task(self._refresh(key, compute, ttl, hard_ttl))
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable,
+        ttl: Union[int, Callable[[], int]],
+        hard_ttl: int = None,
+        as_response: bool = False,
+    ) -> Any:
+        """
+        Valeur en cache, ou calculée par `compute()` (sync ou async) et mise en cache.
+
+        Args:
+            ttl: soft TTL, ou fonction qui le calcule (évaluée seulement en cas
+                de calcul, ex: partial(redis_cache.get_ttl_by_session_status, year))
+            hard_ttl: expiration Redis (défaut: ttl × CACHE_HARD_TTL_FACTOR)
+            as_response: renvoyer un hit sous forme de Response JSON, sans
+                désérialiser (gros payloads) ; un calcul renvoie la valeur
+        """
+        value, fresh = await self.cache.get_with_freshness(key, as_json=as_response)
+
+        if value is None:
+            self.metrics['miss'] += 1
+            return await self._compute_once(key, compute, ttl, hard_ttl)
+
+        if fresh:
+            self.metrics['fresh'] += 1
+        else:
+            self.metrics['stale'] += 1
+            self._refresh_in_background(key, compute, ttl, hard_ttl)
+
+        return Response(content=value, media_type="application/json") if as_response else value
+
+    async def aclose(self):
+        """Attend la fin des recalculs lancés par l'event loop courante (arrêt de l'app, fin d'une loop dédiée)"""
+        refreshing = self._refreshing.pop(asyncio.get_running_loop(), {})
+        if refreshing:
+            await asyncio.gather(*refreshing.values(), return_exceptions=True)
+
+    def status(self) -> dict:
+        return {
+            'hardTtlFactor': self.hard_ttl_factor,
+            'refreshing': sum(len(tasks) for tasks in self._refreshing.values()),
+            **self.metrics,
+        }
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée dans main.py
+response_cache = ResponseCache()
+
+
+if __name__ == "__main__":
+    # Vérification : deux "workers" sur un même Redis (REDIS_URL, sinon fakeredis)
+    import time
+
+    from app.utils.services.local_cache import LocalCache
+    from app.utils.services.redis_cache import AsyncRedisCache
+
+    async def main():
+        if os.getenv('REDIS_URL'):
+            caches = [AsyncRedisCache(local=LocalCache()) for _ in range(2)]
+        else:
+            import fakeredis
+            server = fakeredis.FakeServer()
+            caches = []
+            for _ in range(2):
+                cache = AsyncRedisCache(url="redis://fake", local=LocalCache(limits={}))
+                cache._new_client = lambda **options: fakeredis.FakeAsyncRedis(server=server)
+                caches.append(cache)
+        workers = [ResponseCache(cache=cache) for cache in caches]
+        key = f"telemetry:swr-check:{time.time()}"
+        calls = {'n': 0, 'ttl': 0}
+
+        def ttl():
+            calls['ttl'] += 1
+            return 1
+
+        def compute():
+            calls['n'] += 1
+            time.sleep(0.3)  # calcul fastf1 bloquant
+            return {'version': calls['n']}
+
+        async def endpoint(worker):
+            return await worker.get_or_compute(key, compute, ttl=ttl, hard_ttl=4)
+
+        # Miss : 10 requêtes simultanées → un seul calcul
+        results = await asyncio.gather(*(endpoint(workers[0]) for _ in range(10)))
+        assert calls['n'] == 1 and all(r == {'version': 1} for r in results)
+        assert await endpoint(workers[0]) == {'version': 1} and calls['ttl'] == 1, "TTL evaluated on a hit"
+
+        # Périmé (soft TTL dépassé) : copie servie tout de suite, un seul recalcul pour les 2 workers
+        await asyncio.sleep(1.1)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(endpoint(workers[i % 2]) for i in range(20)))
+        elapsed = (time.perf_counter() - start) * 1000
+        assert all(r == {'version': 1} for r in results)
+        await asyncio.gather(*(w.aclose() for w in workers))
+        assert calls['n'] == 2, calls
+        assert sum(w.metrics['refreshLocked'] for w in workers) <= 1, "one lock attempt per worker"
+        assert await endpoint(workers[1]) == {'version': 2}
+        print(f"stale hits served in {elapsed:.0f} ms while one background refresh ran")
+
+        # Hard TTL dépassé : recalcul synchrone
+        await asyncio.sleep(4.1)
+        assert await endpoint(workers[0]) == {'version': 3}
+        print(f"workers: {[w.status() for w in workers]}")
+
+        for cache in caches:
+            await cache.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+import fastf1
+import os
+import threading
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """
+    Garde en mémoire les dernières sessions FastF1 chargées.
+
+    session.load() coûte plusieurs secondes : quand plusieurs calculs portent
+    sur la même session (précalcul, rafale de requêtes après une course), la
+    session n'est chargée qu'une fois puis partagée.
+
+    - Taille bornée (LRU) via SESSION_STORE_SIZE (défaut: 2 sessions)
+    - Un verrou par session : deux threads ne chargent jamais la même session
+    """
+
+    def __init__(self, max_sessions: int = None):
+        self.max_sessions = max_sessions or int(os.getenv('SESSION_STORE_SIZE', '2'))
+        self._sessions: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: dict = {}
+
+    def _key(self, year: int, gp_round, session_type: str) -> tuple:
+        return (int(year), gp_round, str(session_type).upper())
+
+    def get(self, year: int, gp_round, session_type: str):
+        """Retourne la session chargée (la charge si absente)"""
+        key = self._key(year, gp_round, session_type)
+
+        with self._lock:
+            if key in self._sessions:
+                self._sessions.move_to_end(key)
+                return self._sessions[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Un autre thread l'a peut-être chargée pendant l'attente
+            with self._lock:
+                if key in self._sessions:
+                    self._sessions.move_to_end(key)
+                    return self._sessions[key]
+
+            session = fastf1.get_session(year, gp_round, session_type)
+            session.load()
+            logger.info(f"📦 Session loaded: {key}")
+
+            with self._lock:
+                self._sessions[key] = session
+                while len(self._sessions) > self.max_sessions:
+                    evicted, _ = self._sessions.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                    logger.info(f"🗑️ Session evicted: {evicted}")
+
+            return session
+
+    def discard(self, year: int, gp_round, session_type: str):
+        """Oublie une session (ex: données incomplètes, à recharger plus tard)"""
+        with self._lock:
+            self._sessions.pop(self._key(year, gp_round, session_type), None)
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée dans main.py
+session_store = SessionStore()
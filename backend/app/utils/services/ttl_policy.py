@@ -0,0 +1,250 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+import logging
+
+import fastf1
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Nom de session FastF1 (schedule) → identifiant court
+SESSION_IDENTIFIERS = {
+    'Race': 'R',
+    'Qualifying': 'Q',
+    'Sprint': 'S',
+    'Sprint Qualifying': 'SQ',
+    'Sprint Shootout': 'SQ',
+    'Practice 1': 'FP1',
+    'Practice 2': 'FP2',
+    'Practice 3': 'FP3',
+}
+
+# Durée estimée de chaque session (le schedule ne donne que l'heure de départ)
+SESSION_DURATIONS = {
+    'R': timedelta(hours=2),
+    'S': timedelta(hours=1),
+    'Q': timedelta(hours=1),
+    'SQ': timedelta(minutes=45),
+    'FP1': timedelta(hours=1),
+    'FP2': timedelta(hours=1),
+    'FP3': timedelta(hours=1),
+}
+
+# Sessions qui changent les résultats / classements d'une saison
+SCORING_SESSIONS = ('R', 'S')
+
+
+class TtlPolicy:
+    """
+    TTL des entrées de cache selon le statut de la session / du Grand Prix,
+    d'après le calendrier FastF1 (relu au plus une fois par heure).
+
+    - future : TTL moyen, sans dépasser le début de la session
+    - en cours, ou terminée depuis moins de CACHE_PUBLISH_DELAY_MINUTES : TTL court
+    - terminée depuis moins de CACHE_FINAL_AFTER_HOURS (données publiées,
+      pénalités encore possibles) : TTL "récent"
+    - au-delà : données figées, TTL final (quasi permanent)
+    - GP / session absent du calendrier, ou calendrier indisponible : TTL par défaut
+
+    Configuration (variables d'environnement, TTL en secondes) :
+        CACHE_TTL_LIVE               défaut: 300
+        CACHE_TTL_RECENT             défaut: 1800
+        CACHE_TTL_FUTURE             défaut: 3600
+        CACHE_TTL_FINAL              défaut: 365 jours
+        CACHE_TTL_DEFAULT            défaut: 3600
+        CACHE_PUBLISH_DELAY_MINUTES  défaut: 30
+        CACHE_FINAL_AFTER_HOURS      défaut: 24
+        CACHE_SCHEDULE_RETRY         délai avant de retenter un calendrier indisponible (défaut: 60)
+
+    Pour les tests, `schedule_loader` peut renvoyer un DataFrame local et
+    `clock` une date fixe (UTC naïve).
+    """
+
+    def __init__(
+        self,
+        schedule_loader: Optional[Callable[[int], pd.DataFrame]] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        self.schedule_loader = schedule_loader or fastf1.get_event_schedule
+        self.clock = clock or (lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+        self.live = int(os.getenv('CACHE_TTL_LIVE', '300'))
+        self.recent = int(os.getenv('CACHE_TTL_RECENT', '1800'))
+        self.future = int(os.getenv('CACHE_TTL_FUTURE', '3600'))
+        self.final = int(os.getenv('CACHE_TTL_FINAL', str(365 * 24 * 3600)))
+        self.default = int(os.getenv('CACHE_TTL_DEFAULT', '3600'))
+        self.publish_delay = timedelta(minutes=int(os.getenv('CACHE_PUBLISH_DELAY_MINUTES', '30')))
+        self.final_after = timedelta(hours=int(os.getenv('CACHE_FINAL_AFTER_HOURS', '24')))
+        self.schedule_retry = float(os.getenv('CACHE_SCHEDULE_RETRY', '60'))
+
+        self._schedules: dict = {}
+        self._failures: dict = {}
+        self._lock = threading.Lock()
+
+    # ========== CALENDRIER ==========
+
+    def _load_schedule(self, year: int) -> Optional[pd.DataFrame]:
+        """
+        Calendrier d'une saison, relu au plus une fois par heure. Si la lecture
+        échoue : ancienne copie, sinon None, sans nouvel essai avant
+        `schedule_retry` secondes (le TTL ne doit pas refaire l'appel réseau à
+        chaque requête).
+        """
+        with self._lock:
+            cached = self._schedules.get(year)
+            if cached and time.monotonic() - cached[0] < 3600:
+                return cached[1]
+            failed_at = self._failures.get(year)
+            if failed_at is not None and time.monotonic() - failed_at < self.schedule_retry:
+                return cached[1] if cached else None
+
+        try:
+            schedule = self.schedule_loader(year)
+        except Exception as e:
+            logger.error(f"❌ TTL policy: schedule {year} unavailable (retry in {self.schedule_retry:.0f}s): {e}")
+            with self._lock:
+                self._failures[year] = time.monotonic()
+            return cached[1] if cached else None
+
+        with self._lock:
+            self._schedules[year] = (time.monotonic(), schedule)
+            self._failures.pop(year, None)
+        return schedule
+
+    def sessions(self, year: int, gp_round: Optional[int] = None) -> Optional[List[Tuple[int, str, datetime, datetime]]]:
+        """
+        [(round, session_type, début, fin_estimée), ...] de la saison ou d'un GP
+        (hors essais hivernaux), None si le calendrier est indisponible
+        """
+        schedule = self._load_schedule(year)
+        if schedule is None:
+            return None
+
+        sessions = []
+        for _, event in schedule.iterrows():
+            round_number = int(event['RoundNumber'])
+            if round_number == 0 or (gp_round is not None and round_number != gp_round):
+                continue
+
+            for n in range(1, 6):
+                session_type = SESSION_IDENTIFIERS.get(event.get(f'Session{n}'))
+                start = event.get(f'Session{n}DateUtc')
+                if session_type is None or pd.isna(start):
+                    continue
+
+                start = pd.Timestamp(start).to_pydatetime().replace(tzinfo=None)
+                sessions.append((round_number, session_type, start, start + SESSION_DURATIONS[session_type]))
+        return sessions
+
+    # ========== TTL ==========
+
+    def _clamp(self, seconds: float) -> int:
+        return int(min(max(seconds, self.live), self.final))
+
+    def _window_ttl(self, start: datetime, end: datetime, now: datetime) -> int:
+        if now < start:
+            return int(min(self.future, max((start - now).total_seconds(), self.live)))
+        if now < end + self.publish_delay:
+            return self.live
+        if now < end + self.final_after:
+            return self.recent
+        return self.final
+
+    def ttl(self, year: int, gp_round: Optional[int] = None, session_type: Optional[str] = None) -> int:
+        """
+        TTL d'une entrée liée à une session, un Grand Prix (toutes ses sessions)
+        ou une saison (gp_round=None : valable jusqu'à la prochaine course ou
+        sprint publiée, final une fois la saison figée).
+        """
+        now = self.clock()
+        try:
+            sessions = self.sessions(year, gp_round)
+        except Exception as e:
+            logger.error(f"❌ TTL policy: schedule {year} unreadable: {e}")
+            return self.default
+        if sessions is None:
+            return self.default
+
+        if gp_round is None:
+            return self._season_ttl(sessions, now)
+
+        if session_type is not None:
+            sessions = [s for s in sessions if s[1] == session_type.upper()]
+        if not sessions:
+            return self.default
+
+        return self._window_ttl(min(s[2] for s in sessions), max(s[3] for s in sessions), now)
+
+    def _season_ttl(self, sessions: list, now: datetime) -> int:
+        scoring = [s for s in sessions if s[1] in SCORING_SESSIONS]
+        if not scoring:
+            return self.default
+
+        upcoming = [end for _, _, _, end in scoring if end + self.publish_delay > now]
+        if upcoming:
+            return self._clamp((min(upcoming) + self.publish_delay - now).total_seconds())
+
+        last_end = max(end for _, _, _, end in scoring)
+        return self.recent if now < last_end + self.final_after else self.final
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée par redis_cache / main.py
+ttl_policy = TtlPolicy()
+
+
+if __name__ == "__main__":
+    # Vérification sur un calendrier local, autour d'un week-end de course
+    schedule = pd.DataFrame([{
+        'RoundNumber': 5,
+        'Session1': 'Practice 1', 'Session1DateUtc': pd.Timestamp('2025-05-02 11:30'),
+        'Session2': 'Practice 2', 'Session2DateUtc': pd.Timestamp('2025-05-02 15:00'),
+        'Session3': 'Practice 3', 'Session3DateUtc': pd.Timestamp('2025-05-03 11:30'),
+        'Session4': 'Qualifying', 'Session4DateUtc': pd.Timestamp('2025-05-03 15:00'),
+        'Session5': 'Race', 'Session5DateUtc': pd.Timestamp('2025-05-04 13:00'),
+    }, {
+        'RoundNumber': 6,
+        'Session1': 'Practice 1', 'Session1DateUtc': pd.Timestamp('2025-05-16 11:30'),
+        'Session2': 'Sprint Qualifying', 'Session2DateUtc': pd.Timestamp('2025-05-16 15:30'),
+        'Session3': 'Sprint', 'Session3DateUtc': pd.Timestamp('2025-05-17 10:00'),
+        'Session4': 'Qualifying', 'Session4DateUtc': pd.Timestamp('2025-05-17 14:00'),
+        'Session5': 'Race', 'Session5DateUtc': pd.Timestamp('2025-05-18 13:00'),
+    }])
+
+    now = {'value': None}
+    policy = TtlPolicy(schedule_loader=lambda year: schedule, clock=lambda: now['value'])
+
+    cases = [
+        ('2025-04-20 12:00', 5, 'R', policy.future),
+        ('2025-05-04 11:00', 5, 'R', policy.future),
+        ('2025-05-04 12:50', 5, 'R', 600),                     # départ dans 10 min
+        ('2025-05-04 14:00', 5, 'R', policy.live),             # en cours
+        ('2025-05-04 15:20', 5, 'R', policy.live),             # publication en attente
+        ('2025-05-04 16:00', 5, 'R', policy.recent),
+        ('2025-05-06 12:00', 5, 'R', policy.final),
+        ('2025-05-04 14:00', 5, 'Q', policy.recent),
+        ('2025-05-04 14:00', 5, None, policy.live),            # GP entier : course en cours
+        ('2025-05-04 14:00', 9, 'R', policy.default),          # GP inconnu
+        ('2025-05-10 12:00', None, None, 6 * 24 * 3600 + 23 * 3600 + 30 * 60),  # saison : sprint R6 publiée
+        ('2025-05-19 12:00', None, None, policy.recent),
+        ('2025-06-01 12:00', None, None, policy.final),
+    ]
+    for clock, gp_round, session_type, expected in cases:
+        now['value'] = datetime.fromisoformat(clock)
+        ttl = policy.ttl(2025, gp_round, session_type)
+        print(f"{clock}  R{gp_round} {session_type or '*':<2} → {ttl:>9}s")
+        assert ttl == expected, (clock, gp_round, session_type, ttl, expected)
+
+    # Calendrier indisponible : TTL par défaut, un seul appel par fenêtre de retry
+    loads = {'n': 0}
+
+    def unavailable(year):
+        loads['n'] += 1
+        raise ConnectionError("schedule API down")
+
+    offline = TtlPolicy(schedule_loader=unavailable, clock=lambda: now['value'])
+    assert [offline.ttl(2025, 5, 'R') for _ in range(5)] == [offline.default] * 5
+    assert loads['n'] == 1, loads
+    print("✅ TTL policy checks passed")
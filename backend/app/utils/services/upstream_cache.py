@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from urllib.parse import urlencode
+import logging
+
+from app.utils.services.http_client import http_client
+from app.utils.services.redis_cache import async_redis_cache
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamCache:
+    """
+    Cache des réponses REST externes (Jolpica...) devant HttpClient.
+
+    - Réponse fraîche (< UPSTREAM_MAX_AGE) : servie sans requête
+    - Réponse périmée : revalidée par requête conditionnelle
+      (If-None-Match / If-Modified-Since → 304 sans corps), soit en arrière-plan
+      (stale-while-revalidate, la copie périmée est servie tout de suite), soit
+      avant de répondre (stale_while_revalidate=False)
+    - Upstream lent ou indisponible : la copie périmée est servie (fail open),
+      jusqu'à UPSTREAM_MAX_STALE
+    - Entrées en mémoire (LRU, UPSTREAM_MAX_ENTRIES) et dans Redis
+
+    Configuration (variables d'environnement) :
+        UPSTREAM_MAX_AGE             secondes de fraîcheur (défaut: 300)
+        UPSTREAM_MAX_STALE           âge maximal d'une copie servie en secours (défaut: 7 jours)
+        UPSTREAM_REVALIDATE_TIMEOUT  timeout d'une revalidation avec copie disponible (défaut: 3)
+        UPSTREAM_MAX_ENTRIES         entrées gardées en mémoire (défaut: 2000)
+    """
+
+    def __init__(self, client=http_client, cache=async_redis_cache, max_age: int = None, max_stale: int = None):
+        self.client = client
+        self.cache = cache
+        self.max_age = max_age if max_age is not None else int(os.getenv('UPSTREAM_MAX_AGE', '300'))
+        self.max_stale = max_stale if max_stale is not None else int(os.getenv('UPSTREAM_MAX_STALE', str(7 * 24 * 3600)))
+        self.revalidate_timeout = float(os.getenv('UPSTREAM_REVALIDATE_TIMEOUT', '3'))
+        self.max_entries = int(os.getenv('UPSTREAM_MAX_ENTRIES', '2000'))
+
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._refreshing: dict = {}
+        self.metrics = {'fresh': 0, 'stale': 0, 'revalidated': 0, 'modified': 0, 'miss': 0, 'failOpen': 0}
+
+    # ========== STOCKAGE ==========
+
+    @staticmethod
+    def _key(url: str, params: Optional[dict]) -> str:
+        full = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        return f"upstream:{hashlib.sha1(full.encode()).hexdigest()}"
+
+    async def _get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None and self.cache is not None:
+            entry = await self.cache.get(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _remember(self, key: str, entry: dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _store(self, key: str, entry: dict):
+        self._remember(key, entry)
+        if self.cache is not None:
+            await self.cache.set(key, entry, ttl=self.max_stale)
+
+    # ========== REQUÊTES ==========
+
+    async def _fetch(self, key: str, url: str, params: Optional[dict], entry: Optional[dict]) -> dict:
+        """Requête (conditionnelle si une copie existe) ; retourne l'entrée à jour"""
+        headers = {}
+        kwargs = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('lastModified'):
+                headers['If-Modified-Since'] = entry['lastModified']
+            kwargs = {'retries': 0, 'timeout': self.revalidate_timeout}
+
+        response = await self.client.request('GET', url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.metrics['revalidated'] += 1
+            entry = {**entry, 'fetchedAt': time.time()}
+        else:
+            response.raise_for_status()
+            if entry is not None:
+                self.metrics['modified'] += 1
+            entry = {
+                'body': response.json(),
+                'etag': response.headers.get('ETag'),
+                'lastModified': response.headers.get('Last-Modified'),
+                'fetchedAt': time.time(),
+            }
+
+        await self._store(key, entry)
+        return entry
+
+    async def _revalidate(self, key: str, url: str, params: Optional[dict], entry: dict) -> dict:
+        """Revalidation d'une copie périmée ; fail open sur la copie si l'upstream échoue"""
+        try:
+            return await self._fetch(key, url, params, entry)
+        except Exception as e:
+            self.metrics['failOpen'] += 1
+            logger.warning(f"⚠️ Upstream revalidation failed for {url}, serving stale copy: {e}")
+            return entry
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _refresh_in_background(self, key: str, url: str, params: Optional[dict], entry: dict):
+        if key not in self._refreshing:
+            self._refreshing[key] = asyncio.create_task(self._revalidate(key, url, params, entry))
+
+    async def get_json(self, url: str, params: dict = None, max_age: int = None, stale_while_revalidate: bool = True) -> Any:
+        """
+        GET JSON via le cache.
+
+        Args:
+            max_age: fraîcheur de cette requête (défaut: UPSTREAM_MAX_AGE)
+            stale_while_revalidate: False pour toujours revalider une copie
+                périmée avant de répondre (synchronisations)
+        """
+        key = self._key(url, params)
+        entry = await self._get(key)
+        max_age = self.max_age if max_age is None else max_age
+
+        if entry is None:
+            self.metrics['miss'] += 1
+            return (await self._fetch(key, url, params, None))['body']
+
+        age = time.time() - entry['fetchedAt']
+        if age < max_age:
+            self.metrics['fresh'] += 1
+            return entry['body']
+
+        if stale_while_revalidate and age < self.max_stale:
+            self.metrics['stale'] += 1
+            self._refresh_in_background(key, url, params, entry)
+            return entry['body']
+
+        return (await self._revalidate(key, url, params, entry))['body']
+
+    def status(self) -> dict:
+        return {
+            'maxAge': self.max_age,
+            'maxStale': self.max_stale,
+            'entries': len(self._entries),
+            'refreshing': len(self._refreshing),
+            **self.metrics,
+        }
+
+
+# 🔥 INSTANCE GLOBALE - Utilisée par ergast_mirror
+upstream_cache = UpstreamCache()
+
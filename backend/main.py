@@ -1,12 +1,40 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware 
-from app.utils.services.redis_cache import redis_cache
+from app.utils.services.redis_cache import redis_cache, async_redis_cache
+from app.utils.services.session_store import session_store
+from app.utils.services.precompute import PrecomputeScheduler, SessionNotReady
+from app.utils.services.corner_catalogue import corner_catalogue_store
+from app.utils.services.http_client import http_client
+from app.utils.services.ergast_mirror import ergast_mirror
+from app.utils.services.upstream_cache import upstream_cache
+from app.utils.services.response_cache import response_cache
 import fastf1
 import pandas as pd
-import requests
+import numpy as np
+import os
+import secrets
+import time
+import asyncio
+from functools import partial
+from itertools import combinations
 from app.utils.cache import cache as api_cache
 from app.utils.error_handler import handle_fastf1_error, log_request, log_success, log_error
+from app.utils.analytics.battles import detect_battles
+from app.utils.analytics.stints import extract_stints
+from app.utils.analytics.race_bundle import build_race_bundle, RACE_BUNDLE_SECTIONS
+from app.utils.analytics.outliers import compute_outlier_masks, apply_mask, OUTLIER_STRATEGIES
+from app.utils.analytics.degradation import fit_degradation, degradation_to_records, compound_summary, FUEL_EFFECT_PER_LAP
+from app.utils.analytics.strategy_sim import simulate_strategies, build_compound_models, estimate_pit_loss, DEFAULT_PIT_LOSS
+from app.utils.analytics.telemetry_grid import build_telemetry_grid
+from app.utils.analytics.minisectors import minisector_dominance, DEFAULT_MINISECTORS, MAX_MINISECTORS
+from app.utils.analytics.sector_stats import sector_statistics
+from app.utils.analytics.corners import telemetry_arrays, gps_points, detect_corners, build_corner_catalogue, slice_corners
+from app.utils.analytics.corner_metrics import corner_comparison
+from app.utils.analytics.decimation import decimate_indices, remap_indices, DEFAULT_TOLERANCE, DEFAULT_SPEED_POINTS
+from app.utils.analytics.head_to_head import driver_season, season_stats, head_to_head, duel_matrix
+from app.utils.analytics.standings import standings_progression
+from app.utils.analytics.championship_sim import simulate_championship, recent_form, points_system, DEFAULT_SCENARIOS, MAX_SCENARIOS
 from stripe_routes import router as stripe_router
 from routes.livetiming import router as livetiming_router
 
@@ -37,6 +65,9 @@ app.include_router(stripe_router, prefix="/api/stripe", tags=["stripe"])
 # Include Live Timing router (F1 proxy)
 app.include_router(livetiming_router)
 
+# API Jolpica (miroir Ergast)
+JOLPICA_BASE_URL = os.getenv('JOLPICA_BASE_URL', 'https://api.jolpi.ca/ergast/f1')
+
 # Cache FastF1
 cache_dir = 'cache'
 fastf1.Cache.enable_cache(cache_dir)
@@ -71,35 +102,33 @@ async def get_grands_prix(year: int):
     try:
         # 🔥 ÉTAPE 1 : Vérifier Redis cache
         cache_key = f"grands_prix:{year}"
-        cached_data = redis_cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        # 🔥 ÉTAPE 2 : Cache MISS → Calculer
-        schedule = fastf1.get_event_schedule(year)
-        grands_prix = []
         
-        for idx, event in schedule.iterrows():
-            event_type = event.get('EventFormat', '')
-            # Filtrer les événements de test
-            if event_type == 'testing':
-                continue
+        async def compute():
+            # 🔥 ÉTAPE 2 : Cache MISS → Calculer
+            schedule = fastf1.get_event_schedule(year)
+            grands_prix = []
             
-            gp_info = {
-                "round": int(event['RoundNumber']),
-                "country": event['Country'],
-                "location": event['Location'],
-                "name": event['Location'],
-                "official_name": event['OfficialEventName'],
-                "date": event['EventDate'].strftime('%Y-%m-%d')
-            }
-            grands_prix.append(gp_info)
-        
-        result = {"grands_prix": grands_prix}
+            for idx, event in schedule.iterrows():
+                event_type = event.get('EventFormat', '')
+                # Filtrer les événements de test
+                if event_type == 'testing':
+                    continue
+                
+                gp_info = {
+                    "round": int(event['RoundNumber']),
+                    "country": event['Country'],
+                    "location": event['Location'],
+                    "name": event['Location'],
+                    "official_name": event['OfficialEventName'],
+                    "date": event['EventDate'].strftime('%Y-%m-%d')
+                }
+                grands_prix.append(gp_info)
+            
+            result = {"grands_prix": grands_prix}
+            return result
         
-        # 🔥 ÉTAPE 3 : Sauvegarder dans Redis (TTL 24h - calendrier ne change jamais)
-        redis_cache.set(cache_key, result, ttl=86400)
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year))
         
         return result
         
@@ -118,30 +147,26 @@ async def get_drivers(year: int, gp_round: int, session_type: str):
         
         # 🔥 ÉTAPE 1 : Vérifier Redis cache
         cache_key = f"drivers:{year}:{gp_round}:{session_type}"
-        cached_data = redis_cache.get(cache_key)
         
-        if cached_data:
-            log_success("/api/drivers", cache_hit=True)
-            return cached_data
-        
-        # 🔥 ÉTAPE 2 : Cache MISS → Calculer
-        session = fastf1.get_session(year, gp_round, session_type)
-        session.load()
-        
-        drivers = []
-        for driver_code in session.drivers:
-            driver_info = session.get_driver(driver_code)
-            drivers.append({
-                'abbreviation': str(driver_info['Abbreviation']),
-                'number': str(driver_info['DriverNumber']),
-                'team': str(driver_info['TeamName']),
-                'fullName': str(driver_info['FullName']) if 'FullName' in driver_info else str(driver_info['Abbreviation'])
-            })
+        async def compute():
+            # 🔥 ÉTAPE 2 : Cache MISS → Calculer
+            session = session_store.get(year, gp_round, session_type)
+            
+            drivers = []
+            for driver_code in session.drivers:
+                driver_info = session.get_driver(driver_code)
+                drivers.append({
+                    'abbreviation': str(driver_info['Abbreviation']),
+                    'number': str(driver_info['DriverNumber']),
+                    'team': str(driver_info['TeamName']),
+                    'fullName': str(driver_info['FullName']) if 'FullName' in driver_info else str(driver_info['Abbreviation'])
+                })
+            return drivers
         
-        # 🔥 ÉTAPE 3 : Sauvegarder dans Redis (TTL 1h)
-        redis_cache.set(cache_key, drivers, ttl=3600)
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        drivers = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, gp_round, session_type))
         
-        log_success("/api/drivers", cache_hit=False)
+        log_success("/api/drivers")
         return drivers
         
     except Exception as e:
@@ -175,218 +200,214 @@ async def get_telemetry_comparison(
             driver1, lap_number1, 
             driver2, lap_number2
         )
-        cached_data = redis_cache.get(cache_key)
-        
-        if cached_data:
-            log_success("/api/telemetry", cache_hit=True)
-            return cached_data
-        
-        # 🔥 ÉTAPE 2 : Cache MISS → Calculer avec FastF1
-        session = fastf1.get_session(year, gp_round, session_type)
-        session.load()
         
-        # 🔥 RÉCUPÉRER LAP1 (driver1)
-        if lap_number1 is not None:
-            # Lap spécifique pour driver1
-            laps1 = session.laps.pick_drivers(driver1)
-            lap1_filtered = laps1[laps1['LapNumber'] == lap_number1]
+        async def compute():
+            # 🔥 ÉTAPE 2 : Cache MISS → Calculer avec FastF1
+            session = session_store.get(year, gp_round, session_type)
             
-            if lap1_filtered.empty:
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Lap {lap_number1} not found for {driver1}"
-                )
+            # 🔥 RÉCUPÉRER LAP1 (driver1)
+            if lap_number1 is not None:
+                # Lap spécifique pour driver1
+                laps1 = session.laps.pick_drivers(driver1)
+                lap1_filtered = laps1[laps1['LapNumber'] == lap_number1]
+                
+                if lap1_filtered.empty:
+                    raise HTTPException(
+                        status_code=404, 
+                        detail=f"Lap {lap_number1} not found for {driver1}"
+                    )
+                
+                lap1 = lap1_filtered.iloc[0]
+            else:
+                # Fastest lap par défaut
+                lap1 = session.laps.pick_drivers(driver1).pick_fastest()
+            
+            # 🔥 RÉCUPÉRER LAP2 (driver2)
+            if lap_number2 is not None:
+                # Lap spécifique pour driver2
+                laps2 = session.laps.pick_drivers(driver2)
+                lap2_filtered = laps2[laps2['LapNumber'] == lap_number2]
+                
+                if lap2_filtered.empty:
+                    raise HTTPException(
+                        status_code=404, 
+                        detail=f"Lap {lap_number2} not found for {driver2}"
+                    )
+                
+                lap2 = lap2_filtered.iloc[0]
+            else:
+                # Fastest lap par défaut
+                lap2 = session.laps.pick_drivers(driver2).pick_fastest()
             
-            lap1 = lap1_filtered.iloc[0]
-        else:
-            # Fastest lap par défaut
-            lap1 = session.laps.pick_drivers(driver1).pick_fastest()
-        
-        # 🔥 RÉCUPÉRER LAP2 (driver2)
-        if lap_number2 is not None:
-            # Lap spécifique pour driver2
-            laps2 = session.laps.pick_drivers(driver2)
-            lap2_filtered = laps2[laps2['LapNumber'] == lap_number2]
+            if lap1 is None or lap2 is None:
+                missing_driver = driver1 if lap1 is None else driver2
+                raise Exception(f"Driver {missing_driver} not found or no valid laps available")
             
-            if lap2_filtered.empty:
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Lap {lap_number2} not found for {driver2}"
-                )
+            # 🔥 RÉCUPÉRER LES SECTEURS
+            import pandas as pd
             
-            lap2 = lap2_filtered.iloc[0]
-        else:
-            # Fastest lap par défaut
-            lap2 = session.laps.pick_drivers(driver2).pick_fastest()
-        
-        if lap1 is None or lap2 is None:
-            missing_driver = driver1 if lap1 is None else driver2
-            raise Exception(f"Driver {missing_driver} not found or no valid laps available")
-        
-        # 🔥 RÉCUPÉRER LES SECTEURS
-        import pandas as pd
-        
-        sectors_driver1 = {
-            "sector1": float(lap1['Sector1Time'].total_seconds()) if pd.notna(lap1['Sector1Time']) else None,
-            "sector2": float(lap1['Sector2Time'].total_seconds()) if pd.notna(lap1['Sector2Time']) else None,
-            "sector3": float(lap1['Sector3Time'].total_seconds()) if pd.notna(lap1['Sector3Time']) else None,
-        }
-        
-        sectors_driver2 = {
-            "sector1": float(lap2['Sector1Time'].total_seconds()) if pd.notna(lap2['Sector1Time']) else None,
-            "sector2": float(lap2['Sector2Time'].total_seconds()) if pd.notna(lap2['Sector2Time']) else None,
-            "sector3": float(lap2['Sector3Time'].total_seconds()) if pd.notna(lap2['Sector3Time']) else None,
-        }
-        
-        # ✅ RÉCUPÉRATION TÉLÉMÉTRIE BRUTE
-        tel1 = lap1.get_telemetry().add_distance()
-        tel2 = lap2.get_telemetry().add_distance()
-        
-        # 🔍 DEBUG RPM - Vérifier les colonnes disponibles
-        print(f"\n{'='*60}")
-        print(f"🔍 DEBUG RPM - {driver1} vs {driver2}")
-        print(f"{'='*60}")
-        print(f"📋 Colonnes disponibles Driver 1: {tel1.columns.tolist()}")
-        print(f"📋 Colonnes disponibles Driver 2: {tel2.columns.tolist()}")
-        print(f"")
-        
-        # Détecter la colonne RPM (plusieurs noms possibles)
-        rpm_col = None
-        for possible_col in ['RPM', 'nRPM', 'Rpm', 'EngineRPM']:
-            if possible_col in tel1.columns:
-                rpm_col = possible_col
-                print(f"✅ Colonne RPM trouvée: '{rpm_col}'")
-                print(f"   Driver 1 RPM range: {tel1[rpm_col].min():.0f} - {tel1[rpm_col].max():.0f}")
-                print(f"   Driver 1 RPM mean: {tel1[rpm_col].mean():.0f}")
-                if rpm_col in tel2.columns:
-                    print(f"   Driver 2 RPM range: {tel2[rpm_col].min():.0f} - {tel2[rpm_col].max():.0f}")
-                    print(f"   Driver 2 RPM mean: {tel2[rpm_col].mean():.0f}")
-                break
-        
-        if not rpm_col:
-            print(f"❌ Aucune colonne RPM trouvée")
-            print(f"   Fallback à 10000 RPM sera utilisé")
-        
-        print(f"{'='*60}\n")
-        
-        # ✅ INTERPOLATION SUR GRILLE COMMUNE (synchronisation parfaite)
-        import numpy as np
-        from scipy.interpolate import interp1d
-        
-        # Déterminer la plage de distance commune
-        min_distance = max(tel1['Distance'].min(), tel2['Distance'].min())
-        max_distance = min(tel1['Distance'].max(), tel2['Distance'].max())
-        
-        # Créer grille uniforme de 1000 points
-        common_distance = np.linspace(min_distance, max_distance, 1000)
-        
-        # ===== DRIVER 1 =====
-        # Interpolation linéaire pour valeurs continues
-        interp_speed1 = interp1d(tel1['Distance'], tel1['Speed'], kind='linear', bounds_error=False, fill_value=0)
-        interp_throttle1 = interp1d(tel1['Distance'], tel1['Throttle'], kind='linear', bounds_error=False, fill_value=0)
-        
-        # Interpolation nearest pour valeurs discrètes
-        interp_brake1 = interp1d(tel1['Distance'], tel1['Brake'].astype(int), kind='nearest', bounds_error=False, fill_value=0)
-        interp_gear1 = interp1d(tel1['Distance'], tel1['nGear'], kind='nearest', bounds_error=False, fill_value=0)
-        interp_drs1 = interp1d(tel1['Distance'], tel1['DRS'], kind='nearest', bounds_error=False, fill_value=0)
-        
-        # 🔥 RPM - linéaire car valeur continue
-        if rpm_col and rpm_col in tel1.columns:
-            interp_rpm1 = interp1d(tel1['Distance'], tel1[rpm_col], kind='linear', bounds_error=False, fill_value=10000)
-        else:
-            interp_rpm1 = lambda x: 10000  # Fallback si RPM pas disponible
-        
-        # Interpoler positions GPS (linéaire)
-        interp_x1 = interp1d(tel1['Distance'], tel1['X'], kind='linear', bounds_error=False, fill_value='extrapolate')
-        interp_y1 = interp1d(tel1['Distance'], tel1['Y'], kind='linear', bounds_error=False, fill_value='extrapolate')
-        
-        # ===== DRIVER 2 =====
-        interp_speed2 = interp1d(tel2['Distance'], tel2['Speed'], kind='linear', bounds_error=False, fill_value=0)
-        interp_throttle2 = interp1d(tel2['Distance'], tel2['Throttle'], kind='linear', bounds_error=False, fill_value=0)
-        interp_brake2 = interp1d(tel2['Distance'], tel2['Brake'].astype(int), kind='nearest', bounds_error=False, fill_value=0)
-        interp_gear2 = interp1d(tel2['Distance'], tel2['nGear'], kind='nearest', bounds_error=False, fill_value=0)
-        interp_drs2 = interp1d(tel2['Distance'], tel2['DRS'], kind='nearest', bounds_error=False, fill_value=0)
-        
-        # 🔥 RPM
-        if rpm_col and rpm_col in tel2.columns:
-            interp_rpm2 = interp1d(tel2['Distance'], tel2[rpm_col], kind='linear', bounds_error=False, fill_value=10000)
-        else:
-            interp_rpm2 = lambda x: 10000
-        
-        # ===== CONSTRUIRE TELEMETRY_DATA SYNCHRONISÉ AVEC DELTA =====
-        telemetry_data = []
-        cumulative_time1 = 0.0
-        cumulative_time2 = 0.0
-        prev_speed1 = 0.0
-        prev_speed2 = 0.0
-        
-        for i, dist in enumerate(common_distance):
-            speed1 = float(interp_speed1(dist))
-            speed2 = float(interp_speed2(dist))
-            
-            # 🔥 CALCUL DU DELTA CUMULATIF
-            if i > 0:
-                # Distance parcourue depuis le dernier point
-                segment_distance = dist - common_distance[i-1]
+            sectors_driver1 = {
+                "sector1": float(lap1['Sector1Time'].total_seconds()) if pd.notna(lap1['Sector1Time']) else None,
+                "sector2": float(lap1['Sector2Time'].total_seconds()) if pd.notna(lap1['Sector2Time']) else None,
+                "sector3": float(lap1['Sector3Time'].total_seconds()) if pd.notna(lap1['Sector3Time']) else None,
+            }
+            
+            sectors_driver2 = {
+                "sector1": float(lap2['Sector1Time'].total_seconds()) if pd.notna(lap2['Sector1Time']) else None,
+                "sector2": float(lap2['Sector2Time'].total_seconds()) if pd.notna(lap2['Sector2Time']) else None,
+                "sector3": float(lap2['Sector3Time'].total_seconds()) if pd.notna(lap2['Sector3Time']) else None,
+            }
+            
+            # ✅ RÉCUPÉRATION TÉLÉMÉTRIE BRUTE
+            tel1 = lap1.get_telemetry().add_distance()
+            tel2 = lap2.get_telemetry().add_distance()
+            
+            # 🔍 DEBUG RPM - Vérifier les colonnes disponibles
+            print(f"\n{'='*60}")
+            print(f"🔍 DEBUG RPM - {driver1} vs {driver2}")
+            print(f"{'='*60}")
+            print(f"📋 Colonnes disponibles Driver 1: {tel1.columns.tolist()}")
+            print(f"📋 Colonnes disponibles Driver 2: {tel2.columns.tolist()}")
+            print(f"")
+            
+            # Détecter la colonne RPM (plusieurs noms possibles)
+            rpm_col = None
+            for possible_col in ['RPM', 'nRPM', 'Rpm', 'EngineRPM']:
+                if possible_col in tel1.columns:
+                    rpm_col = possible_col
+                    print(f"✅ Colonne RPM trouvée: '{rpm_col}'")
+                    print(f"   Driver 1 RPM range: {tel1[rpm_col].min():.0f} - {tel1[rpm_col].max():.0f}")
+                    print(f"   Driver 1 RPM mean: {tel1[rpm_col].mean():.0f}")
+                    if rpm_col in tel2.columns:
+                        print(f"   Driver 2 RPM range: {tel2[rpm_col].min():.0f} - {tel2[rpm_col].max():.0f}")
+                        print(f"   Driver 2 RPM mean: {tel2[rpm_col].mean():.0f}")
+                    break
+            
+            if not rpm_col:
+                print(f"❌ Aucune colonne RPM trouvée")
+                print(f"   Fallback à 10000 RPM sera utilisé")
+            
+            print(f"{'='*60}\n")
+            
+            # ✅ INTERPOLATION SUR GRILLE COMMUNE (synchronisation parfaite)
+            import numpy as np
+            from scipy.interpolate import interp1d
+            
+            # Déterminer la plage de distance commune
+            min_distance = max(tel1['Distance'].min(), tel2['Distance'].min())
+            max_distance = min(tel1['Distance'].max(), tel2['Distance'].max())
+            
+            # Créer grille uniforme de 1000 points
+            common_distance = np.linspace(min_distance, max_distance, 1000)
+            
+            # ===== DRIVER 1 =====
+            # Interpolation linéaire pour valeurs continues
+            interp_speed1 = interp1d(tel1['Distance'], tel1['Speed'], kind='linear', bounds_error=False, fill_value=0)
+            interp_throttle1 = interp1d(tel1['Distance'], tel1['Throttle'], kind='linear', bounds_error=False, fill_value=0)
+            
+            # Interpolation nearest pour valeurs discrètes
+            interp_brake1 = interp1d(tel1['Distance'], tel1['Brake'].astype(int), kind='nearest', bounds_error=False, fill_value=0)
+            interp_gear1 = interp1d(tel1['Distance'], tel1['nGear'], kind='nearest', bounds_error=False, fill_value=0)
+            interp_drs1 = interp1d(tel1['Distance'], tel1['DRS'], kind='nearest', bounds_error=False, fill_value=0)
+            
+            # 🔥 RPM - linéaire car valeur continue
+            if rpm_col and rpm_col in tel1.columns:
+                interp_rpm1 = interp1d(tel1['Distance'], tel1[rpm_col], kind='linear', bounds_error=False, fill_value=10000)
+            else:
+                interp_rpm1 = lambda x: 10000  # Fallback si RPM pas disponible
+            
+            # Interpoler positions GPS (linéaire)
+            interp_x1 = interp1d(tel1['Distance'], tel1['X'], kind='linear', bounds_error=False, fill_value='extrapolate')
+            interp_y1 = interp1d(tel1['Distance'], tel1['Y'], kind='linear', bounds_error=False, fill_value='extrapolate')
+            
+            # ===== DRIVER 2 =====
+            interp_speed2 = interp1d(tel2['Distance'], tel2['Speed'], kind='linear', bounds_error=False, fill_value=0)
+            interp_throttle2 = interp1d(tel2['Distance'], tel2['Throttle'], kind='linear', bounds_error=False, fill_value=0)
+            interp_brake2 = interp1d(tel2['Distance'], tel2['Brake'].astype(int), kind='nearest', bounds_error=False, fill_value=0)
+            interp_gear2 = interp1d(tel2['Distance'], tel2['nGear'], kind='nearest', bounds_error=False, fill_value=0)
+            interp_drs2 = interp1d(tel2['Distance'], tel2['DRS'], kind='nearest', bounds_error=False, fill_value=0)
+            
+            # 🔥 RPM
+            if rpm_col and rpm_col in tel2.columns:
+                interp_rpm2 = interp1d(tel2['Distance'], tel2[rpm_col], kind='linear', bounds_error=False, fill_value=10000)
+            else:
+                interp_rpm2 = lambda x: 10000
+            
+            # ===== CONSTRUIRE TELEMETRY_DATA SYNCHRONISÉ AVEC DELTA =====
+            telemetry_data = []
+            cumulative_time1 = 0.0
+            cumulative_time2 = 0.0
+            prev_speed1 = 0.0
+            prev_speed2 = 0.0
+            
+            for i, dist in enumerate(common_distance):
+                speed1 = float(interp_speed1(dist))
+                speed2 = float(interp_speed2(dist))
                 
-                # Vitesse moyenne sur le segment (en m/s)
-                avg_speed1 = (speed1 + prev_speed1) / 2 / 3.6  # km/h → m/s
-                avg_speed2 = (speed2 + prev_speed2) / 2 / 3.6
+                # 🔥 CALCUL DU DELTA CUMULATIF
+                if i > 0:
+                    # Distance parcourue depuis le dernier point
+                    segment_distance = dist - common_distance[i-1]
+                    
+                    # Vitesse moyenne sur le segment (en m/s)
+                    avg_speed1 = (speed1 + prev_speed1) / 2 / 3.6  # km/h → m/s
+                    avg_speed2 = (speed2 + prev_speed2) / 2 / 3.6
+                    
+                    # Temps pour parcourir ce segment
+                    if avg_speed1 > 0:
+                        cumulative_time1 += segment_distance / avg_speed1
+                    if avg_speed2 > 0:
+                        cumulative_time2 += segment_distance / avg_speed2
                 
-                # Temps pour parcourir ce segment
-                if avg_speed1 > 0:
-                    cumulative_time1 += segment_distance / avg_speed1
-                if avg_speed2 > 0:
-                    cumulative_time2 += segment_distance / avg_speed2
-            
-            # Delta = temps Driver2 - temps Driver1 (positif = Driver1 plus rapide)
-            delta = cumulative_time2 - cumulative_time1
-            
-            telemetry_data.append({
-                'distance': float(dist),
-                'speed1': speed1,
-                'speed2': speed2,
-                'throttle1': float(interp_throttle1(dist)),
-                'throttle2': float(interp_throttle2(dist)),
-                'brake1': bool(interp_brake1(dist)),
-                'brake2': bool(interp_brake2(dist)),
-                'gear1': int(interp_gear1(dist)),
-                'gear2': int(interp_gear2(dist)),
-                'drs1': int(interp_drs1(dist)),
-                'drs2': int(interp_drs2(dist)),
-                'x': float(interp_x1(dist)),
-                'y': float(interp_y1(dist)),
-                'delta': float(delta),  # 🔥 Delta cumulatif précis
-                'rpm1': float(interp_rpm1(dist)),  # 🔥 RPM
-                'rpm2': float(interp_rpm2(dist)),  # 🔥 RPM
-            })
-            
-            # Sauvegarder vitesses pour le prochain segment
-            prev_speed1 = speed1
-            prev_speed2 = speed2
-        
-        # 🔍 DEBUG - Vérifier les premières valeurs RPM
-        print(f"🔍 Premières valeurs RPM dans telemetry_data:")
-        for i in range(min(5, len(telemetry_data))):
-            print(f"   [{i}] rpm1={telemetry_data[i]['rpm1']:.0f}, rpm2={telemetry_data[i]['rpm2']:.0f}")
-        print(f"")
-        
-        result = {
-            'telemetry': telemetry_data,
-            'lapTime1': float(lap1['LapTime'].total_seconds()) if pd.notna(lap1['LapTime']) else None,
-            'lapTime2': float(lap2['LapTime'].total_seconds()) if pd.notna(lap2['LapTime']) else None,
-            'sectors1': sectors_driver1,
-            'sectors2': sectors_driver2,
-            'driver1': driver1,
-            'driver2': driver2,
-            'lapNumber1': int(lap1['LapNumber']) if pd.notna(lap1['LapNumber']) else lap_number1,
-            'lapNumber2': int(lap2['LapNumber']) if pd.notna(lap2['LapNumber']) else lap_number2,
-        }
+                # Delta = temps Driver2 - temps Driver1 (positif = Driver1 plus rapide)
+                delta = cumulative_time2 - cumulative_time1
+                
+                telemetry_data.append({
+                    'distance': float(dist),
+                    'speed1': speed1,
+                    'speed2': speed2,
+                    'throttle1': float(interp_throttle1(dist)),
+                    'throttle2': float(interp_throttle2(dist)),
+                    'brake1': bool(interp_brake1(dist)),
+                    'brake2': bool(interp_brake2(dist)),
+                    'gear1': int(interp_gear1(dist)),
+                    'gear2': int(interp_gear2(dist)),
+                    'drs1': int(interp_drs1(dist)),
+                    'drs2': int(interp_drs2(dist)),
+                    'x': float(interp_x1(dist)),
+                    'y': float(interp_y1(dist)),
+                    'delta': float(delta),  # 🔥 Delta cumulatif précis
+                    'rpm1': float(interp_rpm1(dist)),  # 🔥 RPM
+                    'rpm2': float(interp_rpm2(dist)),  # 🔥 RPM
+                })
+                
+                # Sauvegarder vitesses pour le prochain segment
+                prev_speed1 = speed1
+                prev_speed2 = speed2
+            
+            # 🔍 DEBUG - Vérifier les premières valeurs RPM
+            print(f"🔍 Premières valeurs RPM dans telemetry_data:")
+            for i in range(min(5, len(telemetry_data))):
+                print(f"   [{i}] rpm1={telemetry_data[i]['rpm1']:.0f}, rpm2={telemetry_data[i]['rpm2']:.0f}")
+            print(f"")
+            
+            result = {
+                'telemetry': telemetry_data,
+                'lapTime1': float(lap1['LapTime'].total_seconds()) if pd.notna(lap1['LapTime']) else None,
+                'lapTime2': float(lap2['LapTime'].total_seconds()) if pd.notna(lap2['LapTime']) else None,
+                'sectors1': sectors_driver1,
+                'sectors2': sectors_driver2,
+                'driver1': driver1,
+                'driver2': driver2,
+                'lapNumber1': int(lap1['LapNumber']) if pd.notna(lap1['LapNumber']) else lap_number1,
+                'lapNumber2': int(lap2['LapNumber']) if pd.notna(lap2['LapNumber']) else lap_number2,
+            }
+            return result
         
-        # 🔥 ÉTAPE 3 : Sauvegarder dans Redis avec TTL 1h
-        redis_cache.set(cache_key, result, ttl=3600)
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, gp_round, session_type), as_response=True)
         
-        log_success("/api/telemetry", cache_hit=False)
+        log_success("/api/telemetry")
         return result
         
     except Exception as e:
@@ -420,111 +441,107 @@ async def get_session_laps(
         
         # 🔥 ÉTAPE 1 : Vérifier Redis cache
         cache_key = redis_cache.get_cache_key_laps(year, gp_round, session_type, driver)
-        cached_data = redis_cache.get(cache_key)
-        
-        if cached_data:
-            log_success("/api/session-laps", cache_hit=True)
-            return cached_data
-        
-        # 🔥 ÉTAPE 2 : Cache MISS → Calculer avec FastF1
-        # Charger la session
-        session = fastf1.get_session(year, gp_round, session_type)
-        session.load()
-        
-        # 🔥 RÉCUPÉRER TOUS LES LAPS du pilote
-        all_laps = session.laps
-        driver_laps = all_laps[all_laps['Driver'] == driver]
-        
-        if driver_laps.empty:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No laps found for driver {driver}"
-            )
-        
-        # 🔥 RÉCUPÉRER INFOS PILOTE (Team)
-        driver_info = session.get_driver(driver)
-        team_name = driver_info['TeamName'] if driver_info is not None else "Unknown"
-        
-        # 🔥 FASTEST LAP pour IsPersonalBest
-        fastest_lap_time = driver_laps['LapTime'].min()
         
-        laps_data = []
-        for idx, lap in driver_laps.iterrows():
-            lap_time = lap['LapTime']
-            lap_number = lap['LapNumber']
+        async def compute():
+            # 🔥 ÉTAPE 2 : Cache MISS → Calculer avec FastF1
+            # Charger la session
+            session = session_store.get(year, gp_round, session_type)
             
-            # ✅ Vérifier si le lap a de la télémétrie disponible
-            has_telemetry = False
-            try:
-                # Tenter de récupérer la télémétrie
-                telemetry = lap.get_telemetry()
-                has_telemetry = not telemetry.empty
-            except:
+            # 🔥 RÉCUPÉRER TOUS LES LAPS du pilote
+            all_laps = session.laps
+            driver_laps = all_laps[all_laps['Driver'] == driver]
+            
+            if driver_laps.empty:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No laps found for driver {driver}"
+                )
+            
+            # 🔥 RÉCUPÉRER INFOS PILOTE (Team)
+            driver_info = session.get_driver(driver)
+            team_name = driver_info['TeamName'] if driver_info is not None else "Unknown"
+            
+            # 🔥 FASTEST LAP pour IsPersonalBest
+            fastest_lap_time = driver_laps['LapTime'].min()
+            
+            laps_data = []
+            for idx, lap in driver_laps.iterrows():
+                lap_time = lap['LapTime']
+                lap_number = lap['LapNumber']
+                
+                # ✅ Vérifier si le lap a de la télémétrie disponible
                 has_telemetry = False
+                try:
+                    # Tenter de récupérer la télémétrie
+                    telemetry = lap.get_telemetry()
+                    has_telemetry = not telemetry.empty
+                except:
+                    has_telemetry = False
+                
+                # ✅ Inclure TOUS les laps (même ceux sans temps valide)
+                # GP Tempo montre tous les laps, même les outlaps/inlaps
+                
+                # 🔥 SECTEURS
+                sector1 = float(lap['Sector1Time'].total_seconds()) if pd.notna(lap['Sector1Time']) else None
+                sector2 = float(lap['Sector2Time'].total_seconds()) if pd.notna(lap['Sector2Time']) else None
+                sector3 = float(lap['Sector3Time'].total_seconds()) if pd.notna(lap['Sector3Time']) else None
+                
+                # 🔥 LAP TIME en secondes (float)
+                lap_time_seconds = float(lap_time.total_seconds()) if pd.notna(lap_time) else None
+                
+                # 🔥 FLAGS
+                is_personal_best = (lap_time == fastest_lap_time) if pd.notna(lap_time) and pd.notna(fastest_lap_time) else False
+                
+                # IsHotLap = lap avec temps valide et non marqué comme Out/In lap
+                # Dans FastF1, un "hot lap" a généralement un LapTime valide et n'est pas un outlap
+                is_hot_lap = pd.notna(lap_time) and not lap.get('IsAccurate', True) == False
+                
+                # 🔥 WEATHER DATA (si disponible)
+                air_temp = float(lap['AirTemp']) if pd.notna(lap.get('AirTemp')) else None
+                track_temp = float(lap['TrackTemp']) if pd.notna(lap.get('TrackTemp')) else None
+                
+                # 🔥 COMPOUND (pneu)
+                compound = lap['Compound'] if pd.notna(lap.get('Compound')) else None
+                
+                laps_data.append({
+                    # GP Tempo format
+                    "Position": None,  # Position in race (not relevant for practice/quali)
+                    "Id": f"{year}_{gp_round}_{lap_number}_{driver}",  # Unique identifier
+                    "LapNumber": int(lap_number) if pd.notna(lap_number) else None,
+                    "LapTime": lap_time_seconds,  # 🔥 Float en secondes
+                    "Sector1Time": sector1,
+                    "Sector2Time": sector2,
+                    "Sector3Time": sector3,
+                    "IsPersonalBest": bool(is_personal_best),
+                    "IsHotLap": bool(is_hot_lap),
+                    "HasTelemetry": bool(has_telemetry),  # 🔥 FLAG CRUCIAL pour ⊕ icon
+                    "Team": team_name,
+                    "Driver": driver,
+                    "Compound": compound,
+                    "AirTemp": air_temp,
+                    "TrackTemp": track_temp,
+                    "WindSpeed": None  # FastF1 ne fournit pas WindSpeed dans les laps
+                })
             
-            # ✅ Inclure TOUS les laps (même ceux sans temps valide)
-            # GP Tempo montre tous les laps, même les outlaps/inlaps
-            
-            # 🔥 SECTEURS
-            sector1 = float(lap['Sector1Time'].total_seconds()) if pd.notna(lap['Sector1Time']) else None
-            sector2 = float(lap['Sector2Time'].total_seconds()) if pd.notna(lap['Sector2Time']) else None
-            sector3 = float(lap['Sector3Time'].total_seconds()) if pd.notna(lap['Sector3Time']) else None
-            
-            # 🔥 LAP TIME en secondes (float)
-            lap_time_seconds = float(lap_time.total_seconds()) if pd.notna(lap_time) else None
-            
-            # 🔥 FLAGS
-            is_personal_best = (lap_time == fastest_lap_time) if pd.notna(lap_time) and pd.notna(fastest_lap_time) else False
-            
-            # IsHotLap = lap avec temps valide et non marqué comme Out/In lap
-            # Dans FastF1, un "hot lap" a généralement un LapTime valide et n'est pas un outlap
-            is_hot_lap = pd.notna(lap_time) and not lap.get('IsAccurate', True) == False
-            
-            # 🔥 WEATHER DATA (si disponible)
-            air_temp = float(lap['AirTemp']) if pd.notna(lap.get('AirTemp')) else None
-            track_temp = float(lap['TrackTemp']) if pd.notna(lap.get('TrackTemp')) else None
-            
-            # 🔥 COMPOUND (pneu)
-            compound = lap['Compound'] if pd.notna(lap.get('Compound')) else None
-            
-            laps_data.append({
-                # GP Tempo format
-                "Position": None,  # Position in race (not relevant for practice/quali)
-                "Id": f"{year}_{gp_round}_{lap_number}_{driver}",  # Unique identifier
-                "LapNumber": int(lap_number) if pd.notna(lap_number) else None,
-                "LapTime": lap_time_seconds,  # 🔥 Float en secondes
-                "Sector1Time": sector1,
-                "Sector2Time": sector2,
-                "Sector3Time": sector3,
-                "IsPersonalBest": bool(is_personal_best),
-                "IsHotLap": bool(is_hot_lap),
-                "HasTelemetry": bool(has_telemetry),  # 🔥 FLAG CRUCIAL pour ⊕ icon
-                "Team": team_name,
-                "Driver": driver,
-                "Compound": compound,
-                "AirTemp": air_temp,
-                "TrackTemp": track_temp,
-                "WindSpeed": None  # FastF1 ne fournit pas WindSpeed dans les laps
-            })
-        
-        # Trier par numéro de tour
-        laps_data.sort(key=lambda x: x['LapNumber'] if x['LapNumber'] is not None else 0)
-        
-        result = {
-            'driver': driver,
-            'team': team_name,
-            'session': f"{year} R{gp_round} {session_type}",
-            'year': year,
-            'round': gp_round,
-            'sessionType': session_type,
-            'totalLaps': len(laps_data),
-            'laps': laps_data  # 🔥 Format GP Tempo
-        }
+            # Trier par numéro de tour
+            laps_data.sort(key=lambda x: x['LapNumber'] if x['LapNumber'] is not None else 0)
+            
+            result = {
+                'driver': driver,
+                'team': team_name,
+                'session': f"{year} R{gp_round} {session_type}",
+                'year': year,
+                'round': gp_round,
+                'sessionType': session_type,
+                'totalLaps': len(laps_data),
+                'laps': laps_data  # 🔥 Format GP Tempo
+            }
+            return result
         
-        # 🔥 ÉTAPE 3 : Sauvegarder dans Redis avec TTL 1h
-        redis_cache.set(cache_key, result, ttl=3600)
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, gp_round, session_type), as_response=True)
         
-        log_success("/api/session-laps", cache_hit=False)
+        log_success("/api/session-laps")
         return result
         
     except Exception as e:
@@ -547,7 +564,6 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
     """
     try:
         import pandas as pd
-        import fastf1
         from fastapi import HTTPException
         
         log_request("/api/animation-optimized", {
@@ -557,14 +573,13 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
             "driver2": driver2
         })
         
-        cache_key_parts = ['animation_optimized_v2', year, gp_round, driver1, driver2]
+        cache_key_parts = ['animation_optimized_v3', year, gp_round, driver1, driver2]
         cached_data = api_cache.get(*cache_key_parts)
         if cached_data:
             log_success("/api/animation-optimized", cache_hit=True)
             return cached_data
         
-        session = fastf1.get_session(year, gp_round, 'Q')
-        session.load()
+        session = await asyncio.to_thread(session_store.get, year, gp_round, 'Q')
         
         lap1 = session.laps.pick_drivers(driver1).pick_fastest()
         lap2 = session.laps.pick_drivers(driver2).pick_fastest()
@@ -573,6 +588,12 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
             missing_driver = driver1 if lap1 is None else driver2
             raise HTTPException(status_code=404, detail=f"No fastest lap found for {missing_driver}")
         
+        try:
+            track_index = await asyncio.to_thread(get_track_index, year, gp_round, 'Q', session)
+        except Exception as e:
+            print(f"⚠️ Track index unavailable: {e}")
+            track_index = None
+        
         # Secteurs
         sector1_time1 = float(lap1['Sector1Time'].total_seconds()) if pd.notna(lap1['Sector1Time']) else None
         sector2_time1 = float(lap1['Sector2Time'].total_seconds()) if pd.notna(lap1['Sector2Time']) else None
@@ -641,6 +662,13 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
         min_length1 = min(len(tel1), len(pos1))
         step1 = max(1, min_length1 // 500)
         
+        # Progress = position projetée sur la ligne de référence (KD-tree), sinon indice
+        if track_index is not None:
+            track_distance1, _ = track_index.project_lap(pos1['X'].to_numpy()[:min_length1], pos1['Y'].to_numpy()[:min_length1])
+            track_progress1 = np.clip(track_distance1 / track_index.length, 0.0, 1.0)
+        else:
+            track_progress1 = None
+        
         for i in range(0, min_length1, step1):
             if i >= len(tel1) or i >= len(pos1):
                 continue
@@ -654,7 +682,10 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
             rpm_value = float(point_tel[rpm_col]) if rpm_col and pd.notna(point_tel.get(rpm_col)) else 10000
             
             # 🔥 PROGRESS = Position dans le tour (0.0 à 1.0)
-            progress = i / (min_length1 - 1) if min_length1 > 1 else 0.0
+            if track_progress1 is not None and np.isfinite(track_progress1[i]):
+                progress = float(track_progress1[i])
+            else:
+                progress = i / (min_length1 - 1) if min_length1 > 1 else 0.0
             
             driver1_telemetry.append({
                 'x': normalized_x,
@@ -674,6 +705,13 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
         min_length2 = min(len(tel2), len(pos2))
         step2 = max(1, min_length2 // 500)
         
+        # Progress = position projetée sur la ligne de référence (KD-tree), sinon indice
+        if track_index is not None:
+            track_distance2, _ = track_index.project_lap(pos2['X'].to_numpy()[:min_length2], pos2['Y'].to_numpy()[:min_length2])
+            track_progress2 = np.clip(track_distance2 / track_index.length, 0.0, 1.0)
+        else:
+            track_progress2 = None
+        
         for i in range(0, min_length2, step2):
             if i >= len(tel2) or i >= len(pos2):
                 continue
@@ -687,7 +725,10 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
             rpm_value = float(point_tel[rpm_col]) if rpm_col and pd.notna(point_tel.get(rpm_col)) else 10000
             
             # 🔥 PROGRESS = Position dans le tour (0.0 à 1.0)
-            progress = i / (min_length2 - 1) if min_length2 > 1 else 0.0
+            if track_progress2 is not None and np.isfinite(track_progress2[i]):
+                progress = float(track_progress2[i])
+            else:
+                progress = i / (min_length2 - 1) if min_length2 > 1 else 0.0
             
             driver2_telemetry.append({
                 'x': normalized_x,
@@ -754,7 +795,7 @@ async def get_animation_optimized(year: int, gp_round: int, driver1: str, driver
             }
         }
         
-        api_cache.set(result, *cache_key_parts)
+        api_cache.set(result, *cache_key_parts, ttl=redis_cache.get_ttl_by_session_status(year, gp_round, 'Q'))
         log_success("/api/animation-optimized", cache_hit=False)
         return result
         
@@ -935,58 +976,89 @@ async def get_animation_race_full(year: int, gp_round: int, driver1: str, driver
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/race-data/{year}/{gp_round}")
-async def get_race_data(year: int, gp_round: int):
+# 🔥 TABLE DES RELAIS - calculée une seule fois par course (cache fichier)
+
+def get_stint_table(year: int, gp_round: int, session=None) -> pd.DataFrame:
+    """
+    Retourne la table des relais de la course (voir extract_stints).
+    La session n'est chargée qu'en cas de cache MISS.
+    """
+    cache_key_parts = ['stints_v1', year, gp_round, 'R']
+    stints = api_cache.get(*cache_key_parts)
+    if stints is not None:
+        return stints
+    
+    if session is None:
+        session = session_store.get(year, gp_round, 'R')
+    
+    stints = extract_stints(session.laps)
+    api_cache.set(stints, *cache_key_parts, ttl=redis_cache.get_ttl_by_session_status(year, gp_round, 'R'))
+    return stints
+
+
+# 🔥 BUNDLE D'ANALYSE DE COURSE - une seule passe par session (Redis hash)
+
+def compute_race_bundle(year: int, gp_round: int) -> tuple:
+    """(bundle complet, TTL) - chargement de la session et calculs bloquants, à lancer dans un thread"""
+    session = session_store.get(year, gp_round, 'R')
+    
+    stints = get_stint_table(year, gp_round, session)
+    bundle = build_race_bundle(session.laps, session.event, stints)
+    return bundle, redis_cache.get_ttl_by_session_status(year, gp_round, 'R')
+
+
+async def get_race_bundle(year: int, gp_round: int, sections=None) -> dict:
+    """
+    Retourne les sections demandées du bundle de course (voir build_race_bundle).
+    Le bundle est stocké comme UNE entrée Redis (hash), relue section par
+    section via le client asyncio ; le calcul tourne dans un thread.
+    """
+    sections = list(sections or RACE_BUNDLE_SECTIONS)
+    cache_key = f"race_bundle:{year}:{gp_round}"
+    
+    cached_data = await async_redis_cache.get_fields(cache_key, sections)
+    if cached_data is not None:
+        return cached_data
+    
+    bundle, ttl = await asyncio.to_thread(compute_race_bundle, year, gp_round)
+    await async_redis_cache.set_fields(cache_key, bundle, ttl=ttl)
+    
+    return {section: bundle[section] for section in sections}
+
+
+@app.get("/api/race-bundle/{year}/{gp_round}")
+async def get_race_bundle_endpoint(year: int, gp_round: int, sections: str = Query(None)):
+    """
+    Toutes les analyses de la page course en une réponse.
+    ?sections=raceData,pitStops pour ne récupérer que certaines sections.
+    """
     try:
-        import math
-        
-        session = fastf1.get_session(year, gp_round, 'R')
-        session.load()
-        
-        laps = session.laps
+        log_request("/api/race-bundle", {"year": year, "gp_round": gp_round, "sections": sections})
         
-        race_data = []
-        max_lap = int(laps['LapNumber'].max())
+        requested = [s.strip() for s in sections.split(',') if s.strip()] if sections else None
+        unknown = [s for s in requested or [] if s not in RACE_BUNDLE_SECTIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown sections: {', '.join(unknown)}. Available: {', '.join(RACE_BUNDLE_SECTIONS)}"
+            )
         
-        for lap_num in range(1, max_lap + 1):
-            lap_data = laps[laps['LapNumber'] == lap_num]
-            
-            positions = []
-            for _, lap in lap_data.iterrows():
-                try:
-                    lap_time_value = None
-                    if lap['LapTime'] is not None:
-                        lap_time_seconds = float(lap['LapTime'].total_seconds())
-                        if not math.isnan(lap_time_seconds) and not math.isinf(lap_time_seconds):
-                            lap_time_value = lap_time_seconds
-                    
-                    positions.append({
-                        'driver': str(lap['Driver']),
-                        'team': str(lap['Team']) if 'Team' in lap else 'Unknown',
-                        'position': int(lap['Position']) if lap['Position'] is not None and not math.isnan(lap['Position']) else 99,
-                        'lapTime': lap_time_value,
-                        'compound': str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN',
-                        'tyreLife': int(lap['TyreLife']) if lap['TyreLife'] is not None and not math.isnan(lap['TyreLife']) else 0,
-                        'stint': int(lap['Stint']) if 'Stint' in lap and not math.isnan(lap['Stint']) else 1,
-                        'pitOutTime': bool(lap['PitOutTime']) if 'PitOutTime' in lap and lap['PitOutTime'] is not None else False,
-                        'pitInTime': bool(lap['PitInTime']) if 'PitInTime' in lap and lap['PitInTime'] is not None else False,
-                    })
-                except Exception:
-                    continue
-            
-            positions.sort(key=lambda x: x['position'])
-            
-            race_data.append({
-                'lapNumber': lap_num,
-                'positions': positions
-            })
+        result = await get_race_bundle(year, gp_round, requested)
         
-        return {
-            'raceData': race_data,
-            'totalLaps': max_lap,
-            'circuitName': session.event['EventName'],
-            'country': session.event['Country']
-        }
+        log_success("/api/race-bundle")
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/race-data/{year}/{gp_round}")
+async def get_race_data(year: int, gp_round: int):
+    try:
+        return (await get_race_bundle(year, gp_round, ['raceData']))['raceData']
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -996,42 +1068,7 @@ async def get_race_data(year: int, gp_round: int):
 @app.get("/api/pit-stops/{year}/{gp_round}")
 async def get_pit_stops(year: int, gp_round: int):
     try:
-        import math
-        
-        session = fastf1.get_session(year, gp_round, 'R')
-        session.load()
-        
-        laps = session.laps
-        
-        pit_stops = []
-        
-        for driver in laps['Driver'].unique():
-            driver_laps = laps[laps['Driver'] == driver]
-            
-            for _, lap in driver_laps.iterrows():
-                if lap['PitOutTime'] is not None:
-                    try:
-                        pit_duration = None
-                        if lap['PitInTime'] is not None and lap['PitOutTime'] is not None:
-                            duration_seconds = float((lap['PitOutTime'] - lap['PitInTime']).total_seconds())
-                            if not math.isnan(duration_seconds) and not math.isinf(duration_seconds):
-                                pit_duration = duration_seconds
-                        
-                        pit_stops.append({
-                            'driver': str(lap['Driver']),
-                            'team': str(lap['Team']) if 'Team' in lap else 'Unknown',
-                            'lap': int(lap['LapNumber']),
-                            'duration': pit_duration,
-                            'compound': str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN',
-                            'tyreLife': int(lap['TyreLife']) if lap['TyreLife'] is not None else 0,
-                            'stint': int(lap['Stint']) if 'Stint' in lap else 1,
-                        })
-                    except Exception:
-                        continue
-        
-        pit_stops.sort(key=lambda x: x['lap'])
-        
-        return {'pitStops': pit_stops}
+        return (await get_race_bundle(year, gp_round, ['pitStops']))['pitStops']
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1041,101 +1078,7 @@ async def get_pit_stops(year: int, gp_round: int):
 @app.get("/api/race-events/{year}/{gp_round}")
 async def get_race_events(year: int, gp_round: int):
     try:
-        import math
-        
-        session = fastf1.get_session(year, gp_round, 'R')
-        session.load()
-        
-        events = []
-        
-        if hasattr(session, 'laps') and session.laps is not None:
-            laps = session.laps
-            
-            for lap_num in range(2, int(laps['LapNumber'].max()) + 1):
-                prev_lap = laps[laps['LapNumber'] == lap_num - 1]
-                curr_lap = laps[laps['LapNumber'] == lap_num]
-                
-                if not prev_lap.empty and not curr_lap.empty:
-                    prev_leader = prev_lap[prev_lap['Position'] == 1]
-                    curr_leader = curr_lap[curr_lap['Position'] == 1]
-                    
-                    if not prev_leader.empty and not curr_leader.empty:
-                        prev_driver = prev_leader.iloc[0]['Driver']
-                        curr_driver = curr_leader.iloc[0]['Driver']
-                        
-                        if prev_driver != curr_driver:
-                            events.append({
-                                'lap': lap_num,
-                                'type': 'LEAD_CHANGE',
-                                'description': f'{curr_driver} takes the lead from {prev_driver}',
-                                'driver': str(curr_driver),
-                                'severity': 'high'
-                            })
-            
-            max_lap = int(laps['LapNumber'].max())
-            for driver in laps['Driver'].unique():
-                driver_laps = laps[laps['Driver'] == driver]
-                last_lap = int(driver_laps['LapNumber'].max())
-                
-                if last_lap < max_lap - 2:
-                    events.append({
-                        'lap': last_lap,
-                        'type': 'DNF',
-                        'description': f'{driver} retired from the race',
-                        'driver': str(driver),
-                        'severity': 'critical'
-                    })
-            
-            fastest_laps_by_lap = {}
-            for lap_num in range(1, int(laps['LapNumber'].max()) + 1):
-                lap_data = laps[laps['LapNumber'] == lap_num]
-                valid_laps = lap_data[lap_data['LapTime'].notna()]
-                
-                if not valid_laps.empty:
-                    fastest = valid_laps.loc[valid_laps['LapTime'].idxmin()]
-                    fastest_laps_by_lap[lap_num] = {
-                        'driver': str(fastest['Driver']),
-                        'time': float(fastest['LapTime'].total_seconds())
-                    }
-            
-            if fastest_laps_by_lap:
-                overall_fastest_lap = min(fastest_laps_by_lap.items(), key=lambda x: x[1]['time'])
-                events.append({
-                    'lap': overall_fastest_lap[0],
-                    'type': 'FASTEST_LAP',
-                    'description': f'{overall_fastest_lap[1]["driver"]} sets fastest lap: {overall_fastest_lap[1]["time"]:.3f}s',
-                    'driver': overall_fastest_lap[1]['driver'],
-                    'severity': 'info'
-                })
-            
-            for lap_num in range(2, int(laps['LapNumber'].max()) + 1):
-                prev_lap = laps[laps['LapNumber'] == lap_num - 1]
-                curr_lap = laps[laps['LapNumber'] == lap_num]
-                
-                for driver in laps['Driver'].unique():
-                    prev_pos = prev_lap[prev_lap['Driver'] == driver]
-                    curr_pos = curr_lap[curr_lap['Driver'] == driver]
-                    
-                    if not prev_pos.empty and not curr_pos.empty:
-                        prev_position = prev_pos.iloc[0]['Position']
-                        curr_position = curr_pos.iloc[0]['Position']
-                        
-                        if not math.isnan(prev_position) and not math.isnan(curr_position):
-                            prev_position = int(prev_position)
-                            curr_position = int(curr_position)
-                            
-                            if prev_position - curr_position >= 3:
-                                events.append({
-                                    'lap': lap_num,
-                                    'type': 'OVERTAKE',
-                                    'description': f'{driver} gains {prev_position - curr_position} positions (P{prev_position} → P{curr_position})',
-                                    'driver': str(driver),
-                                    'severity': 'medium'
-                                })
-        
-        events.sort(key=lambda x: x['lap'])
-        
-        return {'events': events}
+        return (await get_race_bundle(year, gp_round, ['raceEvents']))['raceEvents']
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1145,46 +1088,7 @@ async def get_race_events(year: int, gp_round: int):
 @app.get("/api/position-evolution/{year}/{gp_round}")
 async def get_position_evolution(year: int, gp_round: int):
     try:
-        import math
-        
-        # Load race session
-        session = fastf1.get_session(year, gp_round, 'R')
-        session.load()
-        
-        laps = session.laps
-        max_lap = int(laps['LapNumber'].max())
-        
-        # ✅ Get ALL drivers who participated in the race with their teams
-        all_drivers = laps['Driver'].unique().tolist()
-        
-        # Get driver to team mapping
-        driver_teams = {}
-        for driver in all_drivers:
-            driver_laps = laps[laps['Driver'] == driver]
-            if not driver_laps.empty:
-                driver_teams[str(driver)] = str(driver_laps.iloc[0]['Team'])
-        
-        evolution_data = []
-        
-        for lap_num in range(1, max_lap + 1):
-            lap_data = laps[laps['LapNumber'] == lap_num]
-            lap_positions = {'lap': lap_num}
-            
-            # Include all drivers for this lap
-            for driver in all_drivers:
-                driver_lap = lap_data[lap_data['Driver'] == driver]
-                if not driver_lap.empty:
-                    position = driver_lap.iloc[0]['Position']
-                    if not math.isnan(position):
-                        lap_positions[str(driver)] = int(position)
-            
-            evolution_data.append(lap_positions)
-        
-        return {
-            'evolution': evolution_data,
-            'drivers': [str(d) for d in all_drivers],
-            'teams': driver_teams
-        }
+        return (await get_race_bundle(year, gp_round, ['positionEvolution']))['positionEvolution']
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1194,45 +1098,7 @@ async def get_position_evolution(year: int, gp_round: int):
 @app.get("/api/strategy-comparison/{year}/{gp_round}")
 async def get_strategy_comparison(year: int, gp_round: int):
     try:
-        session = fastf1.get_session(year, gp_round, 'R')
-        session.load()
-        
-        laps = session.laps
-        strategies = []
-        
-        for driver in laps['Driver'].unique():
-            driver_laps = laps[laps['Driver'] == driver]
-            stints = []
-            
-            current_stint = None
-            for _, lap in driver_laps.iterrows():
-                stint_num = int(lap['Stint']) if 'Stint' in lap and lap['Stint'] is not None else 1
-                compound = str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN'
-                
-                if current_stint is None or current_stint['stint'] != stint_num:
-                    if current_stint is not None:
-                        stints.append(current_stint)
-                    
-                    current_stint = {
-                        'stint': stint_num,
-                        'compound': compound,
-                        'startLap': int(lap['LapNumber']),
-                        'laps': 0
-                    }
-                
-                current_stint['laps'] += 1
-            
-            if current_stint is not None:
-                stints.append(current_stint)
-            
-            strategies.append({
-                'driver': str(driver),
-                'team': str(driver_laps.iloc[0]['Team']) if 'Team' in driver_laps.iloc[0] else 'Unknown',
-                'stints': stints,
-                'totalStops': len(stints) - 1
-            })
-        
-        return {'strategies': strategies}
+        return (await get_race_bundle(year, gp_round, ['strategyComparison']))['strategyComparison']
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1240,130 +1106,148 @@ async def get_strategy_comparison(year: int, gp_round: int):
 
 
 @app.get("/api/race-pace/{year}/{gp_round}/{driver}")
-async def get_race_pace(year: int, gp_round: int, driver: str, show_outliers: bool = False):
+async def get_race_pace(year: int, gp_round: int, driver: str, show_outliers: bool = False, outlier_method: str = 'median'):
     try:
-        import math
+        validate_outlier_method(outlier_method)
+        series = await asyncio.to_thread(get_driver_lap_series, year, gp_round, 'R', driver)
+        laps = series['laps']
+        lap_times = [lap['lapTime'] for lap in laps]
         
-        session = fastf1.get_session(year, gp_round, 'R')
-        session.load()
+        # Filtrer les outliers (masques calculés une fois par session)
+        if not show_outliers and laps:
+            masks = await asyncio.to_thread(get_outlier_masks, year, gp_round, 'R', outlier_method)
+            lap_numbers = [lap['lapNumber'] for lap in laps]
+            lap_times = apply_mask(lap_times, lap_numbers, masks.get('LapTime'), series['driverCode'])
         
-        driver_laps = session.laps.pick_drivers(driver)
-        
-        lap_times = []
-        pace_data_full = []
-        
-        for _, lap in driver_laps.iterrows():
-            lap_time = None
-            if lap['LapTime'] is not None:
-                lap_time_seconds = float(lap['LapTime'].total_seconds())
-                if not math.isnan(lap_time_seconds) and not math.isinf(lap_time_seconds):
-                    lap_time = lap_time_seconds
-            
-            lap_times.append(lap_time)
-            pace_data_full.append({
-                'lapNumber': int(lap['LapNumber']),
-                'lapTime': lap_time,
-                'compound': str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN',
-                'tyreLife': int(lap['TyreLife']) if lap['TyreLife'] is not None and not math.isnan(lap['TyreLife']) else 0,
-                'stint': int(lap['Stint']) if 'Stint' in lap and not math.isnan(lap['Stint']) else 1,
-                'position': int(lap['Position']) if lap['Position'] is not None and not math.isnan(lap['Position']) else 99,
-                'pitOutTime': bool(lap['PitOutTime']) if 'PitOutTime' in lap and lap['PitOutTime'] is not None else False,
-                'pitInTime': bool(lap['PitInTime']) if 'PitInTime' in lap and lap['PitInTime'] is not None else False,
-            })
-        
-        # Filtrer les pit stops
-        filtered_times, original_times = filter_pit_stops(lap_times)
-        
-        # Appliquer le filtre selon show_outliers
         pace_data = []
-        for i, lap_data in enumerate(pace_data_full):
+        for i, lap in enumerate(laps):
             pace_data.append({
-                **lap_data,
-                'lapTime': filtered_times[i] if not show_outliers else original_times[i]
+                'lapNumber': lap['lapNumber'],
+                'lapTime': lap_times[i],
+                'compound': lap['compound'],
+                'tyreLife': lap['tyreLife'],
+                'stint': lap['stint'],
+                'position': lap['position'],
+                'pitOutTime': lap['pitOutTime'],
+                'pitInTime': lap['pitInTime'],
             })
         
         return {
             'driver': driver,
             'paceData': pace_data
         }
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-import numpy as np
+def validate_outlier_method(outlier_method: str):
+    if outlier_method not in OUTLIER_STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown outlier_method '{outlier_method}'. Available: {', '.join(OUTLIER_STRATEGIES)}"
+        )
+
+
+def get_outlier_masks(year: int, gp_round: int, session_type: str, outlier_method: str, session=None) -> dict:
+    """
+    Masques d'outliers pilotes × tours de la session (voir compute_outlier_masks).
+    Calculés une fois par (session, stratégie) puis servis depuis le cache fichier ;
+    la session n'est chargée (session_store) qu'en l'absence de cache.
+    """
+    cache_key_parts = ['outliers_v1', year, gp_round, session_type, outlier_method]
+    masks = api_cache.get(*cache_key_parts)
+    if masks is not None:
+        return masks
+    
+    if session is None:
+        session = session_store.get(year, gp_round, session_type)
+    masks = compute_outlier_masks(session.laps, outlier_method)
+    api_cache.set(masks, *cache_key_parts, ttl=redis_cache.get_ttl_by_session_status(year, gp_round, session_type))
+    return masks
+
 
-def filter_pit_stops(lap_times, threshold_seconds=20):
+def get_driver_lap_series(year: int, gp_round: int, session_type: str, driver: str) -> dict:
     """
-    Filtre les outliers (pit stops) des temps au tour.
+    Séries tour par tour d'un pilote, NON filtrées (temps, secteurs, pneus...),
+    en cache fichier : activer / désactiver show_outliers applique seulement
+    le masque en cache, sans recharger la session.
+    
+    Returns:
+        {'driverCode': str | None, 'laps': [{'lapNumber', 'lapTime', 'sector1', 'sector2', 'sector3',
+                                             'compound', 'tyreLife', 'stint', 'position', 'pitOutTime', 'pitInTime'}, ...]}
     """
-    if not lap_times or len(lap_times) == 0:
-        return lap_times, lap_times
+    import math
     
-    valid_times = [t for t in lap_times if t is not None]
+    cache_key_parts = ['lap_series_v1', year, gp_round, session_type, driver]
+    series = api_cache.get(*cache_key_parts)
+    if series is not None:
+        return series
     
-    if len(valid_times) == 0:
-        return lap_times, lap_times
+    def seconds(value):
+        if value is None:
+            return None
+        value = float(value.total_seconds())
+        return value if not math.isnan(value) and not math.isinf(value) else None
     
-    median_time = np.median(valid_times)
-    threshold = median_time + threshold_seconds
+    session = session_store.get(year, gp_round, session_type)
+    driver_laps = session.laps.pick_drivers(driver)
     
-    filtered = []
-    for t in lap_times:
-        if t is None:
-            filtered.append(None)
-        elif t > threshold:
-            filtered.append(None)  # Outlier (pit stop)
-        else:
-            filtered.append(t)
+    laps = []
+    for _, lap in driver_laps.iterrows():
+        laps.append({
+            'lapNumber': int(lap['LapNumber']),
+            'lapTime': seconds(lap['LapTime']),
+            'sector1': seconds(lap['Sector1Time']),
+            'sector2': seconds(lap['Sector2Time']),
+            'sector3': seconds(lap['Sector3Time']),
+            'compound': str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN',
+            'tyreLife': int(lap['TyreLife']) if lap['TyreLife'] is not None and not math.isnan(lap['TyreLife']) else 0,
+            'stint': int(lap['Stint']) if 'Stint' in lap and not math.isnan(lap['Stint']) else 1,
+            'position': int(lap['Position']) if lap['Position'] is not None and not math.isnan(lap['Position']) else 99,
+            'pitOutTime': bool(lap['PitOutTime']) if 'PitOutTime' in lap and lap['PitOutTime'] is not None else False,
+            'pitInTime': bool(lap['PitInTime']) if 'PitInTime' in lap and lap['PitInTime'] is not None else False,
+        })
     
-    return filtered, lap_times  # Retourne (filtré, original)
+    series = {
+        'driverCode': str(driver_laps['Driver'].iloc[0]) if not driver_laps.empty else None,
+        'laps': laps,
+    }
+    api_cache.set(series, *cache_key_parts, ttl=redis_cache.get_ttl_by_session_status(year, gp_round, session_type))
+    return series
 
 
 @app.get("/api/multi-driver-pace/{year}/{gp_round}/{session_type}")
-async def get_multi_driver_pace(year: int, gp_round: int, session_type: str, drivers: str, show_outliers: bool = False):
+async def get_multi_driver_pace(year: int, gp_round: int, session_type: str, drivers: str, show_outliers: bool = False, outlier_method: str = 'median'):
     try:
-        import math
-        
+        validate_outlier_method(outlier_method)
         driver_list = drivers.split(',')
-        session = fastf1.get_session(year, gp_round, session_type)
-        session.load()
         
         all_drivers_data = {}
+        masks = None if show_outliers else await asyncio.to_thread(get_outlier_masks, year, gp_round, session_type, outlier_method)
         
         for driver in driver_list:
             driver = driver.strip()
-            driver_laps = session.laps.pick_drivers(driver)
-            
-            lap_times = []
-            pace_data_full = []
+            series = await asyncio.to_thread(get_driver_lap_series, year, gp_round, session_type, driver)
+            laps = series['laps']
+            lap_times = [lap['lapTime'] for lap in laps]
             
-            for _, lap in driver_laps.iterrows():
-                lap_time = None
-                if lap['LapTime'] is not None:
-                    lap_time_seconds = float(lap['LapTime'].total_seconds())
-                    if not math.isnan(lap_time_seconds) and not math.isinf(lap_time_seconds):
-                        lap_time = lap_time_seconds
-                
-                lap_times.append(lap_time)
-                pace_data_full.append({
-                    'lapNumber': int(lap['LapNumber']),
-                    'lapTime': lap_time,
-                    'compound': str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN',
-                    'tyreLife': int(lap['TyreLife']) if lap['TyreLife'] is not None and not math.isnan(lap['TyreLife']) else 0,
-                    'stint': int(lap['Stint']) if 'Stint' in lap and not math.isnan(lap['Stint']) else 1,
-                })
+            # Filtrer les outliers selon show_outliers
+            if masks is not None and laps:
+                lap_numbers = [lap['lapNumber'] for lap in laps]
+                lap_times = apply_mask(lap_times, lap_numbers, masks.get('LapTime'), series['driverCode'])
             
-            # Filtrer les pit stops
-            filtered_times, original_times = filter_pit_stops(lap_times)
-            
-            # Créer les données avec et sans outliers
             pace_data_filtered = []
-            for i, lap_data in enumerate(pace_data_full):
+            for i, lap in enumerate(laps):
                 pace_data_filtered.append({
-                    **lap_data,
-                    'lapTime': filtered_times[i] if not show_outliers else original_times[i]
+                    'lapNumber': lap['lapNumber'],
+                    'lapTime': lap_times[i],
+                    'compound': lap['compound'],
+                    'tyreLife': lap['tyreLife'],
+                    'stint': lap['stint'],
                 })
             
             all_drivers_data[driver] = pace_data_filtered
@@ -1372,6 +1256,8 @@ async def get_multi_driver_pace(year: int, gp_round: int, session_type: str, dri
             'drivers': driver_list,
             'data': all_drivers_data
         }
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1381,65 +1267,62 @@ async def get_multi_driver_pace(year: int, gp_round: int, session_type: str, dri
 @app.get("/api/stint-analysis/{year}/{gp_round}/{driver}")
 async def get_stint_analysis(year: int, gp_round: int, driver: str):
     try:
-        import math
-        
         session = fastf1.get_session(year, gp_round, 'R')
         session.load()
         
         driver_laps = session.laps.pick_drivers(driver)
+        if driver_laps.empty:
+            return {'driver': driver, 'stints': []}
         
-        stints = {}
+        driver_code = str(driver_laps['Driver'].iloc[0])
+        stints = get_stint_table(year, gp_round, session)
+        driver_stints = stints[stints['Driver'] == driver_code]
         
-        for _, lap in driver_laps.iterrows():
-            stint_num = int(lap['Stint']) if 'Stint' in lap and not math.isnan(lap['Stint']) else 1
-            
-            if stint_num not in stints:
-                stints[stint_num] = {
-                    'stint': stint_num,
-                    'compound': str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN',
-                    'laps': []
+        # Pente ajustée (s/tour, corrigée carburant) de chaque relais
+        degradation = get_degradation_table(year, gp_round, session=session)
+        degradation_rates = degradation[degradation['Driver'] == driver_code].set_index('Stint')['Slope']
+        
+        # Colonnes du pilote en arrays (pas d'iterrows)
+        lap_numbers = driver_laps['LapNumber'].to_numpy(dtype=float)
+        lap_times = driver_laps['LapTime'].dt.total_seconds().to_numpy(dtype=float)
+        tyre_life = pd.to_numeric(driver_laps['TyreLife'], errors='coerce').fillna(0).to_numpy(dtype=int)
+        
+        stint_analysis = []
+        for stint in driver_stints.itertuples(index=False):
+            in_stint = (lap_numbers >= stint.StartLap) & (lap_numbers <= stint.EndLap)
+            times = lap_times[in_stint]
+            
+            laps = [
+                {
+                    'lapNumber': int(n),
+                    'lapTime': float(t) if np.isfinite(t) else None,
+                    'tyreLife': int(life),
                 }
+                for n, t, life in zip(lap_numbers[in_stint], times, tyre_life[in_stint])
+            ]
             
-            lap_time = None
-            if lap['LapTime'] is not None:
-                lap_time_seconds = float(lap['LapTime'].total_seconds())
-                if not math.isnan(lap_time_seconds) and not math.isinf(lap_time_seconds):
-                    lap_time = lap_time_seconds
+            valid_times = times[np.isfinite(times)]
+            if len(valid_times) == 0:
+                continue
             
-            stints[stint_num]['laps'].append({
-                'lapNumber': int(lap['LapNumber']),
-                'lapTime': lap_time,
-                'tyreLife': int(lap['TyreLife']) if lap['TyreLife'] is not None and not math.isnan(lap['TyreLife']) else 0,
+            third = len(valid_times) // 3
+            if third > 0:
+                stint_degradation = float(valid_times[-third:].mean() - valid_times[:third].mean())
+            else:
+                stint_degradation = 0
+            
+            stint_analysis.append({
+                'stint': int(stint.Stint),
+                'compound': stint.Compound,
+                'laps': laps,
+                'totalLaps': len(laps),
+                'avgLapTime': float(valid_times.mean()),
+                'bestLapTime': float(valid_times.min()),
+                'worstLapTime': float(valid_times.max()),
+                'degradation': stint_degradation,
+                'degradationRate': float(degradation_rates[stint.Stint]) if pd.notna(degradation_rates.get(stint.Stint)) else None
             })
         
-        stint_analysis = []
-        for stint_num, stint_data in stints.items():
-            valid_laps = [lap for lap in stint_data['laps'] if lap['lapTime'] is not None]
-            
-            if len(valid_laps) > 0:
-                avg_lap_time = sum(lap['lapTime'] for lap in valid_laps) / len(valid_laps)
-                best_lap_time = min(lap['lapTime'] for lap in valid_laps)
-                worst_lap_time = max(lap['lapTime'] for lap in valid_laps)
-                
-                third = len(valid_laps) // 3
-                if third > 0:
-                    early_avg = sum(lap['lapTime'] for lap in valid_laps[:third]) / third
-                    late_avg = sum(lap['lapTime'] for lap in valid_laps[-third:]) / third
-                    degradation = late_avg - early_avg
-                else:
-                    degradation = 0
-                
-                stint_analysis.append({
-                    'stint': stint_num,
-                    'compound': stint_data['compound'],
-                    'laps': stint_data['laps'],
-                    'totalLaps': len(stint_data['laps']),
-                    'avgLapTime': avg_lap_time,
-                    'bestLapTime': best_lap_time,
-                    'worstLapTime': worst_lap_time,
-                    'degradation': degradation
-                })
-        
         return {
             'driver': driver,
             'stints': stint_analysis
@@ -1450,75 +1333,155 @@ async def get_stint_analysis(year: int, gp_round: int, driver: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/sector-evolution/{year}/{gp_round}/{driver}")
-async def get_sector_evolution(year: int, gp_round: int, driver: str, show_outliers: bool = False):
+# 🔥 MODÈLES DE DÉGRADATION - tous les relais de la course en une passe
+
+def get_degradation_table(year: int, gp_round: int, fuel_correction: bool = True, session=None) -> pd.DataFrame:
+    """
+    Retourne les ajustements de dégradation de la course (voir fit_degradation).
+    Calculés une fois par (course, correction carburant) puis servis depuis le cache fichier.
+    """
+    cache_key_parts = ['degradation_v1', year, gp_round, 'R', fuel_correction]
+    degradation = api_cache.get(*cache_key_parts)
+    if degradation is not None:
+        return degradation
+    
+    if session is None:
+        session = session_store.get(year, gp_round, 'R')
+    
+    stints = get_stint_table(year, gp_round, session)
+    degradation = fit_degradation(session.laps, stints, fuel_correction=fuel_correction)
+    api_cache.set(degradation, *cache_key_parts, ttl=redis_cache.get_ttl_by_session_status(year, gp_round, 'R'))
+    return degradation
+
+
+@app.get("/api/degradation/{year}/{gp_round}")
+async def get_degradation(year: int, gp_round: int, fuel_correction: bool = True):
+    """
+    Dégradation pneus de TOUT le plateau : pente (s/tour) par relais + synthèse par composé.
+    """
     try:
-        import math
+        log_request("/api/degradation", {"year": year, "gp_round": gp_round, "fuel_correction": fuel_correction})
         
-        session = fastf1.get_session(year, gp_round, 'R')
-        session.load()
+        degradation = get_degradation_table(year, gp_round, fuel_correction)
         
-        driver_laps = session.laps.pick_drivers(driver)
-        
-        sector1_times = []
-        sector2_times = []
-        sector3_times = []
-        sector_data_full = []
-        
-        for _, lap in driver_laps.iterrows():
-            sector1 = None
-            sector2 = None
-            sector3 = None
-            
-            if lap['Sector1Time'] is not None:
-                s1 = float(lap['Sector1Time'].total_seconds())
-                if not math.isnan(s1) and not math.isinf(s1):
-                    sector1 = s1
-            
-            if lap['Sector2Time'] is not None:
-                s2 = float(lap['Sector2Time'].total_seconds())
-                if not math.isnan(s2) and not math.isinf(s2):
-                    sector2 = s2
-            
-            if lap['Sector3Time'] is not None:
-                s3 = float(lap['Sector3Time'].total_seconds())
-                if not math.isnan(s3) and not math.isinf(s3):
-                    sector3 = s3
-            
-            sector1_times.append(sector1)
-            sector2_times.append(sector2)
-            sector3_times.append(sector3)
-            
-            sector_data_full.append({
-                'lapNumber': int(lap['LapNumber']),
-                'sector1': sector1,
-                'sector2': sector2,
-                'sector3': sector3,
-                'compound': str(lap['Compound']) if 'Compound' in lap else 'UNKNOWN',
-                'tyreLife': int(lap['TyreLife']) if lap['TyreLife'] is not None and not math.isnan(lap['TyreLife']) else 0,
-            })
+        log_success("/api/degradation")
+        return {
+            'year': year,
+            'round': gp_round,
+            'fuelCorrected': fuel_correction,
+            'fuelEffectPerLap': FUEL_EFFECT_PER_LAP if fuel_correction else 0.0,
+            'drivers': degradation_to_records(degradation),
+            'compounds': compound_summary(degradation)
+        }
+    except Exception as e:
+        log_error("/api/degradation", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/strategy-simulator/{year}/{gp_round}")
+async def get_strategy_simulator(
+    year: int,
+    gp_round: int,
+    max_stops: int = Query(2, ge=1, le=3),
+    min_stint: int = Query(5, ge=1),
+    top: int = Query(10, ge=1, le=50),
+    pit_loss: float = Query(None, gt=0)
+):
+    """
+    🧠 SIMULATEUR DE STRATÉGIE - toutes les combinaisons (tours d'arrêt × composés)
+    évaluées en NumPy à partir des rythmes/dégradations ajustés de la course.
+    """
+    try:
+        log_request("/api/strategy-simulator", {"year": year, "gp_round": gp_round, "max_stops": max_stops, "min_stint": min_stint, "pit_loss": pit_loss})
+        
+        cache_key = f"strategy_sim:{year}:{gp_round}:{max_stops}:{min_stint}:{top}:{pit_loss}"
+        
+        async def compute():
+            session = session_store.get(year, gp_round, 'R')
+            stints = get_stint_table(year, gp_round, session)
+            degradation = get_degradation_table(year, gp_round, session=session)
+            
+            models = build_compound_models(degradation)
+            if not models:
+                raise HTTPException(status_code=404, detail="No dry compound could be modelled for this race")
+            
+            estimated_loss = estimate_pit_loss(session.laps, stints)
+            loss = pit_loss or estimated_loss or DEFAULT_PIT_LOSS
+            total_laps = int(pd.to_numeric(session.laps['LapNumber'], errors='coerce').max())
+            
+            start = time.perf_counter()
+            simulation = simulate_strategies(total_laps, models, pit_loss=loss, max_stops=max_stops, min_stint=min_stint, top=top)
+            elapsed = time.perf_counter() - start
+            
+            result = {
+                'year': year,
+                'round': gp_round,
+                'totalLaps': total_laps,
+                'pitLoss': round(float(loss), 3),
+                'pitLossSource': 'query' if pit_loss else ('estimated' if estimated_loss else 'default'),
+                'compounds': {
+                    compound: {'baseLapTime': base, 'degradation': deg}
+                    for compound, (base, deg) in models.items()
+                },
+                'candidates': simulation['candidates'],
+                'elapsedMs': round(elapsed * 1000, 1),
+                'best': simulation['best'],
+                'pareto': simulation['pareto']
+            }
+            return result
         
-        # Filtrer les outliers pour chaque secteur
-        filtered_s1, original_s1 = filter_pit_stops(sector1_times, threshold_seconds=10)
-        filtered_s2, original_s2 = filter_pit_stops(sector2_times, threshold_seconds=10)
-        filtered_s3, original_s3 = filter_pit_stops(sector3_times, threshold_seconds=10)
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, gp_round, 'R'))
+        log_success("/api/strategy-simulator")
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error("/api/strategy-simulator", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/sector-evolution/{year}/{gp_round}/{driver}")
+async def get_sector_evolution(year: int, gp_round: int, driver: str, show_outliers: bool = False, outlier_method: str = 'median'):
+    try:
+        validate_outlier_method(outlier_method)
+        series = await asyncio.to_thread(get_driver_lap_series, year, gp_round, 'R', driver)
+        laps = series['laps']
+        
+        sector1_times = [lap['sector1'] for lap in laps]
+        sector2_times = [lap['sector2'] for lap in laps]
+        sector3_times = [lap['sector3'] for lap in laps]
+        
+        # Filtrer les outliers pour chaque secteur (masques de la session)
+        if not show_outliers and laps:
+            masks = await asyncio.to_thread(get_outlier_masks, year, gp_round, 'R', outlier_method)
+            lap_numbers = [lap['lapNumber'] for lap in laps]
+            driver_code = series['driverCode']
+            sector1_times = apply_mask(sector1_times, lap_numbers, masks.get('Sector1Time'), driver_code)
+            sector2_times = apply_mask(sector2_times, lap_numbers, masks.get('Sector2Time'), driver_code)
+            sector3_times = apply_mask(sector3_times, lap_numbers, masks.get('Sector3Time'), driver_code)
         
-        # Appliquer le filtre selon show_outliers
         sector_data = []
-        for i, lap_data in enumerate(sector_data_full):
+        for i, lap in enumerate(laps):
             sector_data.append({
-                'lapNumber': lap_data['lapNumber'],
-                'sector1': filtered_s1[i] if not show_outliers else original_s1[i],
-                'sector2': filtered_s2[i] if not show_outliers else original_s2[i],
-                'sector3': filtered_s3[i] if not show_outliers else original_s3[i],
-                'compound': lap_data['compound'],
-                'tyreLife': lap_data['tyreLife'],
+                'lapNumber': lap['lapNumber'],
+                'sector1': sector1_times[i],
+                'sector2': sector2_times[i],
+                'sector3': sector3_times[i],
+                'compound': lap['compound'],
+                'tyreLife': lap['tyreLife'],
             })
         
         return {
             'driver': driver,
             'sectorData': sector_data
         }
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1579,62 +1542,151 @@ async def get_multi_driver_sectors(year: int, gp_round: int, session_type: str,
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/championship/{year}/drivers")
-async def get_driver_standings(year: int):
+# 🔥 TÉLÉMÉTRIE RÉÉCHANTILLONNÉE - un tour par pilote sur une grille commune
+
+def get_lap_grid(year: int, gp_round: int, session_type: str, lap_number: int = None, session=None) -> dict:
+    """
+    Retourne la grille de télémétrie d'un tour par pilote (voir build_telemetry_grid),
+    avec numéro/temps de tour par pilote : meilleur tour par défaut, ou le tour
+    lap_number de chaque pilote. Calculée une fois par session (cache fichier).
+    """
+    session_type = session_type.upper()
+    cache_key_parts = ['lap_grid_v1', year, gp_round, session_type, lap_number or 'fastest']
+    grid = api_cache.get(*cache_key_parts)
+    if grid is not None:
+        return grid
+    
+    if session is None:
+        session = session_store.get(year, gp_round, session_type)
+    
+    telemetries = {}
+    lap_info = {}
+    for driver in session.laps['Driver'].dropna().unique():
+        driver_laps = session.laps.pick_drivers(driver)
+        if lap_number is not None:
+            selected = driver_laps[driver_laps['LapNumber'] == lap_number]
+            lap = selected.iloc[0] if not selected.empty else None
+        else:
+            lap = driver_laps.pick_fastest()
+        if lap is None or pd.isna(lap.get('LapTime')):
+            continue
+        try:
+            telemetries[str(driver)] = lap.get_telemetry().add_distance()
+        except Exception as e:
+            print(f"⚠️ Telemetry unavailable for {driver}: {e}")
+            continue
+        lap_info[str(driver)] = {
+            'lapNumber': int(lap['LapNumber']),
+            'lapTime': float(lap['LapTime'].total_seconds()),
+            'compound': str(lap['Compound']) if pd.notna(lap['Compound']) else 'UNKNOWN'
+        }
+    
+    grid = build_telemetry_grid(telemetries)
+    if grid is None:
+        raise HTTPException(status_code=404, detail="No telemetry data available")
+    
+    grid['laps'] = {driver: lap_info[driver] for driver in grid['drivers']}
+    api_cache.set(grid, *cache_key_parts, ttl=redis_cache.get_ttl_by_session_status(year, gp_round, session_type))
+    return grid
+
+
+@app.get("/api/minisectors/{year}/{gp_round}/{session_type}")
+async def get_minisectors(
+    year: int,
+    gp_round: int,
+    session_type: str,
+    segments: int = Query(DEFAULT_MINISECTORS, ge=3, le=MAX_MINISECTORS)
+):
+    """
+    🗺️ DOMINATION PAR MINI-SECTEURS - circuit découpé en N segments de même longueur,
+    pilote le plus rapide par segment et tour théorique (meilleurs tours de chaque pilote).
+    """
     try:
-        url = f"http://api.jolpi.ca/ergast/f1/{year}/driverStandings.json"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        
-        standings_list = data['MRData']['StandingsTable']['StandingsLists']
-        
-        if not standings_list:
-            return {'standings': []}
-        
-        drivers = standings_list[-1]['DriverStandings']
-        
-        standings = []
-        for driver in drivers:
-            standings.append({
-                'position': int(driver['position']),
-                'driver': f"{driver['Driver']['givenName']} {driver['Driver']['familyName']}",
-                'code': driver['Driver']['code'] if 'code' in driver['Driver'] else driver['Driver']['familyName'][:3].upper(),
-                'team': driver['Constructors'][0]['name'],
-                'points': float(driver['points']),
-                'wins': int(driver['wins'])
-            })
+        log_request("/api/minisectors", {"year": year, "gp_round": gp_round, "session_type": session_type, "segments": segments})
+        
+        cache_key = f"minisectors:{year}:{gp_round}:{session_type.upper()}:{segments}"
         
-        return {'standings': standings}
+        async def compute():
+            grid = get_lap_grid(year, gp_round, session_type)
+            dominance = minisector_dominance(grid, segments)
+            
+            for row in dominance['drivers']:
+                row.update(grid['laps'][row['driver']])
+            
+            result = {
+                'year': year,
+                'round': gp_round,
+                'sessionType': session_type.upper(),
+                **dominance
+            }
+            return result
+        
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, gp_round, session_type))
+        log_success("/api/minisectors")
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
+        log_error("/api/minisectors", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/championship/{year}/constructors")
-async def get_constructor_standings(year: int):
+@app.get("/api/sector-stats/{year}/{gp_round}/{session_type}")
+async def get_sector_stats(year: int, gp_round: int, session_type: str):
+    """
+    🟣 SECTEURS DE LA SESSION - meilleurs secteurs personnels / absolus (violets),
+    tour théorique et écart au meilleur tour, pour tous les pilotes et tout type de session.
+    """
     try:
-        url = f"http://api.jolpi.ca/ergast/f1/{year}/constructorStandings.json"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        
-        standings_list = data['MRData']['StandingsTable']['StandingsLists']
+        log_request("/api/sector-stats", {"year": year, "gp_round": gp_round, "session_type": session_type})
         
-        if not standings_list:
-            return {'standings': []}
+        cache_key = f"sector_stats:{year}:{gp_round}:{session_type.upper()}"
         
-        constructors = standings_list[-1]['ConstructorStandings']
-        
-        standings = []
-        for constructor in constructors:
-            standings.append({
-                'position': int(constructor['position']),
-                'team': constructor['Constructor']['name'],
-                'points': float(constructor['points']),
-                'wins': int(constructor['wins'])
-            })
+        async def compute():
+            session = session_store.get(year, gp_round, session_type)
+            if session.laps is None or session.laps.empty:
+                raise HTTPException(status_code=404, detail="No laps available for this session")
+            
+            result = {
+                'year': year,
+                'round': gp_round,
+                'sessionType': session_type.upper(),
+                **sector_statistics(session.laps)
+            }
+            return result
         
-        return {'standings': standings}
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, gp_round, session_type))
+        log_success("/api/sector-stats")
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error("/api/sector-stats", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/championship/{year}/drivers")
+async def get_driver_standings(year: int):
+    try:
+        await ergast_mirror.ensure_season(year)
+        return {'standings': ergast_mirror.driver_standings(year)}
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/championship/{year}/constructors")
+async def get_constructor_standings(year: int):
+    try:
+        await ergast_mirror.ensure_season(year)
+        return {'standings': ergast_mirror.constructor_standings(year)}
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1644,40 +1696,8 @@ async def get_constructor_standings(year: int):
 @app.get("/api/championship/{year}/{gp_round}/results")
 async def get_race_results(year: int, gp_round: int):
     try:
-        url = f"http://api.jolpi.ca/ergast/f1/{year}/{gp_round}/results.json"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        
-        races = data['MRData']['RaceTable']['Races']
-        
-        if not races:
-            return {'results': []}
-        
-        results_data = races[0]['Results']
-        
-        results = []
-        for result in results_data:
-            lap_time = None
-            if 'Time' in result:
-                lap_time = result['Time']['time']
-            
-            results.append({
-                'position': int(result['position']),
-                'driver': f"{result['Driver']['givenName']} {result['Driver']['familyName']}",
-                'code': result['Driver']['code'] if 'code' in result['Driver'] else result['Driver']['familyName'][:3].upper(),
-                'team': result['Constructor']['name'],
-                'grid': int(result['grid']),
-                'points': float(result['points']),
-                'status': result['status'],
-                'time': lap_time
-            })
-        
-        return {
-            'results': results,
-            'raceName': races[0]['raceName'],
-            'circuitName': races[0]['Circuit']['circuitName'],
-            'date': races[0]['date']
-        }
+        await ergast_mirror.ensure_season(year)
+        return ergast_mirror.race_results(year, gp_round) or {'results': []}
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1687,44 +1707,10 @@ async def get_race_results(year: int, gp_round: int):
 @app.get("/api/championship/{year}/{gp_round}/standings")
 async def get_standings_after_race(year: int, gp_round: int):
     try:
-        driver_url = f"http://api.jolpi.ca/ergast/f1/{year}/{gp_round}/driverStandings.json"
-        constructor_url = f"http://api.jolpi.ca/ergast/f1/{year}/{gp_round}/constructorStandings.json"
-        
-        driver_response = requests.get(driver_url, timeout=10)
-        constructor_response = requests.get(constructor_url, timeout=10)
-        
-        driver_data = driver_response.json()
-        constructor_data = constructor_response.json()
-        
-        driver_standings_list = driver_data['MRData']['StandingsTable']['StandingsLists']
-        constructor_standings_list = constructor_data['MRData']['StandingsTable']['StandingsLists']
-        
-        drivers = []
-        constructors = []
-        
-        if driver_standings_list:
-            for driver in driver_standings_list[0]['DriverStandings']:
-                drivers.append({
-                    'position': int(driver['position']),
-                    'driver': f"{driver['Driver']['givenName']} {driver['Driver']['familyName']}",
-                    'code': driver['Driver']['code'] if 'code' in driver['Driver'] else driver['Driver']['familyName'][:3].upper(),
-                    'team': driver['Constructors'][0]['name'],
-                    'points': float(driver['points']),
-                    'wins': int(driver['wins'])
-                })
-        
-        if constructor_standings_list:
-            for constructor in constructor_standings_list[0]['ConstructorStandings']:
-                constructors.append({
-                    'position': int(constructor['position']),
-                    'team': constructor['Constructor']['name'],
-                    'points': float(constructor['points']),
-                    'wins': int(constructor['wins'])
-                })
-        
+        await ergast_mirror.ensure_season(year)
         return {
-            'drivers': drivers,
-            'constructors': constructors
+            'drivers': ergast_mirror.driver_standings(year, gp_round),
+            'constructors': ergast_mirror.constructor_standings(year, gp_round)
         }
     except Exception as e:
         import traceback
@@ -1732,6 +1718,110 @@ async def get_standings_after_race(year: int, gp_round: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/championship/{year}/progression")
+async def get_standings_progression(year: int):
+    """
+    Classements pilotes / constructeurs après chaque manche en une réponse
+    (sommes cumulées locales, sprints inclus). En cache par saison et par
+    dernière manche synchronisée : invalidé seulement par une nouvelle manche.
+    """
+    try:
+        await ergast_mirror.ensure_season(year)
+        state = ergast_mirror.sync_state(year)
+        cache_key = f"standings_progression_v2:{year}:{state['last_round'] if state else 0}"
+        
+        async def compute():
+            result = standings_progression(ergast_mirror.season_points(year), ergast_mirror.official_standings(year))
+            race_names = {race['round']: race['raceName'] for race in ergast_mirror.season_races(year)}
+            result['rounds'] = [{'round': r, 'raceName': race_names.get(r)} for r in result['rounds']]
+            result['year'] = year
+            return result
+        
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year))
+        return result
+    except Exception as e:
+        log_error("/api/championship/progression", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/championship/{year}/simulation")
+async def get_championship_simulation(
+    year: int,
+    scenarios: int = Query(DEFAULT_SCENARIOS, ge=1000, le=MAX_SCENARIOS)
+):
+    """
+    Probabilités de titre pilotes / constructeurs par Monte Carlo du reste de
+    la saison (forme récente, calendrier restant, sprints), avec les conditions
+    exactes de titre et d'élimination. En cache par manche synchronisée.
+    """
+    try:
+        log_request("/api/championship/simulation", {"year": year, "scenarios": scenarios})
+        
+        progression = await get_standings_progression(year)
+        if not progression['drivers']:
+            raise HTTPException(status_code=404, detail=f"No results for {year}")
+        
+        state = ergast_mirror.sync_state(year)
+        last_round = state['last_round'] if state else 0
+        cache_key = f"championship_sim_v2:{year}:{last_round}:{scenarios}"
+        
+        async def compute():
+            rows = ergast_mirror.season_points(year)
+            race_rounds = [row['round'] for row in rows if row['kind'] == 'race']
+            latest_round = max(race_rounds, default=0)
+            active_ids = {row['driver_id'] for row in rows if row['kind'] == 'race' and row['round'] == latest_round}
+            sprints_done = {row['round'] for row in rows if row['kind'] == 'sprint'}
+            
+            drivers = [
+                {'driverId': d['driverId'], 'code': d['code'], 'driver': d['driver'], 'team': d['team'],
+                 'points': d['points'][-1], 'active': d['driverId'] in active_ids}
+                for d in progression['drivers']
+            ]
+            constructors = [{'team': c['team'], 'points': c['points'][-1]} for c in progression['constructors']]
+            
+            # Calendrier restant : manches sans résultat de course, sprint si pas encore couru
+            schedule = fastf1.get_event_schedule(year)
+            remaining = [
+                {
+                    'round': int(event['RoundNumber']),
+                    'name': str(event['EventName']),
+                    'sprint': 'sprint' in str(event['EventFormat']).lower() and int(event['RoundNumber']) not in sprints_done,
+                }
+                for _, event in schedule.iterrows()
+                if int(event['RoundNumber']) > latest_round
+            ]
+            
+            form = recent_form(rows, [d['driverId'] for d in drivers if d['active']])
+            simulation = simulate_championship(
+                drivers, constructors, form, remaining, points_system(year),
+                scenarios=scenarios, seed=year * 100 + last_round
+            )
+            
+            result = {
+                'year': year,
+                'afterRound': latest_round,
+                'scenarios': scenarios,
+                'remainingRounds': remaining,
+                **simulation,
+            }
+            return result
+        
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year))
+        log_success("/api/championship/simulation")
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error("/api/championship/simulation", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/circuits/{year}")
 async def get_circuits(year: int):
     try:
@@ -1753,12 +1843,28 @@ async def get_circuits(year: int):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def decimated_positions(telemetry: pd.DataFrame, tolerance: float, max_points: int) -> list:
+    """Points X/Y/Speed d'un tour après décimation RDP (XY) + LTTB (vitesse)"""
+    arrays = telemetry_arrays(telemetry)
+    kept = decimate_indices(arrays['x'], arrays['y'], arrays['distance'], arrays['speed'], tolerance, max_points)
+    return [
+        {"X": x, "Y": y, "Speed": speed}
+        for x, y, speed in zip(arrays['x'][kept].tolist(), arrays['y'][kept].tolist(), arrays['speed'][kept].tolist())
+    ]
+
+
 @app.get("/racing-line")
-async def get_racing_line(year: int, round: int, session: str, driver1: str, driver2: str = None):
+async def get_racing_line(
+    year: int,
+    round: int,
+    session: str,
+    driver1: str,
+    driver2: str = None,
+    tolerance: float = Query(DEFAULT_TOLERANCE, ge=0),
+    max_points: int = Query(DEFAULT_SPEED_POINTS, ge=0)
+):
     try:
-        event = fastf1.get_event(year, round)
-        session_obj = event.get_session(session)
-        session_obj.load()
+        session_obj = session_store.get(year, round, session)
         
         # Driver 1
         driver1_lap = session_obj.laps.pick_drivers(driver1).pick_fastest()
@@ -1768,7 +1874,7 @@ async def get_racing_line(year: int, round: int, session: str, driver1: str, dri
             "driver1": {
                 "abbreviation": driver1,
                 "lap_time": str(driver1_lap['LapTime']),
-                "positions": driver1_telemetry[['X', 'Y', 'Speed']].to_dict('records')
+                "positions": decimated_positions(driver1_telemetry, tolerance, max_points)
             }
         }
         
@@ -1779,7 +1885,7 @@ async def get_racing_line(year: int, round: int, session: str, driver1: str, dri
             result["driver2"] = {
                 "abbreviation": driver2,
                 "lap_time": str(driver2_lap['LapTime']),
-                "positions": driver2_telemetry[['X', 'Y', 'Speed']].to_dict('records')
+                "positions": decimated_positions(driver2_telemetry, tolerance, max_points)
             }
         
         return result
@@ -1829,73 +1935,55 @@ async def get_drivers(year: int, round: int):
         raise HTTPException(status_code=500, detail=f"Error loading drivers: {str(e)}")
 
 @app.get("/battles")
-async def get_battles(year: int, round: int):
+async def get_battles(year: int, round: int, limit: int = Query(10), mode: str = Query("position")):
+    """
+    Top des batailles de la course (mode "position" ou "time").
+    🔥 Détection vectorisée sur la matrice pilotes × tours + REDIS CACHE par session
+    """
     try:
-        event = fastf1.get_event(year, round)
-        session = event.get_session('R')
-        session.load()
+        if mode not in ("position", "time"):
+            raise HTTPException(status_code=400, detail="mode must be 'position' or 'time'")
         
-        battles = []
-        drivers = session.drivers
+        cache_key = f"battles:{year}:{round}:{mode}"
         
-        for i, driver1 in enumerate(drivers):
-            for driver2 in drivers[i+1:]:
-                driver1_laps = session.laps.pick_driver(driver1)
-                driver2_laps = session.laps.pick_driver(driver2)
-                
-                if driver1_laps.empty or driver2_laps.empty:
-                    continue
-                
-                overtakes = 0
-                min_gap = float('inf')
-                
-                for lap_num in range(1, min(len(driver1_laps), len(driver2_laps))):
-                    try:
-                        pos1 = driver1_laps.iloc[lap_num]['Position']
-                        pos2 = driver2_laps.iloc[lap_num]['Position']
-                        prev_pos1 = driver1_laps.iloc[lap_num-1]['Position']
-                        prev_pos2 = driver2_laps.iloc[lap_num-1]['Position']
-                        
-                        if pd.notna(pos1) and pd.notna(pos2) and pd.notna(prev_pos1) and pd.notna(prev_pos2):
-                            gap = abs(pos1 - pos2)
-                            min_gap = min(min_gap, gap)
-                            
-                            if (prev_pos1 > prev_pos2 and pos1 < pos2) or (prev_pos1 < prev_pos2 and pos1 > pos2):
-                                overtakes += 1
-                    except:
-                        continue
-                
-                if overtakes > 0 or min_gap <= 2:
-                    driver1_info = session.get_driver(driver1)
-                    driver2_info = session.get_driver(driver2)
-                    
-                    battles.append({
-                        "driver1": {
-                            "abbreviation": driver1,
-                            "name": f"{driver1_info['FirstName']} {driver1_info['LastName']}"
-                        },
-                        "driver2": {
-                            "abbreviation": driver2,
-                            "name": f"{driver2_info['FirstName']} {driver2_info['LastName']}"
-                        },
-                        "overtakes": overtakes,
-                        "min_gap": float(min_gap) if min_gap != float('inf') else 0,
-                        "intensity": min(overtakes * 2 + (3 - min_gap if min_gap < 3 else 0), 10)
-                    })
+        async def compute():
+            event = fastf1.get_event(year, round)
+            session = event.get_session('R')
+            session.load()
+            
+            battles = detect_battles(session.laps, session.drivers, mode=mode)
+            
+            for battle in battles:
+                for key in ("driver1", "driver2"):
+                    driver_info = session.get_driver(battle[key])
+                    battle[key] = {
+                        "abbreviation": battle[key],
+                        "name": f"{driver_info['FirstName']} {driver_info['LastName']}"
+                    }
+            return battles
         
-        battles.sort(key=lambda x: x['intensity'], reverse=True)
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        battles = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, round, 'R'))
         
-        return {"battles": battles[:10]}
+        return {"battles": battles[:limit]}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading battles: {str(e)}")
 
 @app.get("/api/racing-line/{year}/{gp_round}/{session_type}/{driver}")
-async def get_racing_line(year: int, gp_round: int, session_type: str, driver: str):
+async def get_racing_line(
+    year: int,
+    gp_round: int,
+    session_type: str,
+    driver: str,
+    tolerance: float = Query(DEFAULT_TOLERANCE, ge=0),
+    max_points: int = Query(DEFAULT_SPEED_POINTS, ge=0)
+):
     try:
-        # Charger la session
-        session = fastf1.get_session(year, gp_round, session_type)
-        session.load()
+        # Charger la session (hors event loop)
+        session = await asyncio.to_thread(session_store.get, year, gp_round, session_type)
         
         # Récupérer le pilote
         driver_laps = session.laps.pick_driver(driver)
@@ -1912,15 +2000,22 @@ async def get_racing_line(year: int, gp_round: int, session_type: str, driver: s
         if telemetry.empty:
             raise HTTPException(status_code=404, detail="No telemetry data available")
         
-        # Extraire les données GPS
-        gps_data = []
-        for idx, row in telemetry.iterrows():
-            gps_data.append({
-                "x": float(row['X']) if pd.notna(row['X']) else 0,
-                "y": float(row['Y']) if pd.notna(row['Y']) else 0,
-                "speed": float(row['Speed']) if pd.notna(row['Speed']) else 0,
-                "distance": float(row['Distance']) if pd.notna(row['Distance']) else 0
-            })
+        # Extraire les données GPS (décimées : RDP sur XY + LTTB sur la vitesse)
+        arrays = telemetry_arrays(telemetry)
+        kept = decimate_indices(arrays['x'], arrays['y'], arrays['distance'], arrays['speed'], tolerance, max_points)
+        gps_data = gps_points(arrays, kept)
+        
+        # Position réelle sur la piste (projection sur la ligne de référence du circuit)
+        try:
+            track_index = await asyncio.to_thread(get_track_index, year, gp_round, session_type, session)
+        except Exception as e:
+            print(f"⚠️ Track index unavailable: {e}")
+            track_index = None
+        if track_index is not None:
+            track_distance, offset = track_index.project_lap(arrays['x'], arrays['y'])
+            for point, d, o in zip(gps_data, track_distance[kept].tolist(), offset[kept].tolist()):
+                point['trackDistance'] = round(d, 1)
+                point['offset'] = round(o, 2)
         
         # Infos du tour
         lap_info = {
@@ -1933,9 +2028,13 @@ async def get_racing_line(year: int, gp_round: int, session_type: str, driver: s
         return {
             "lap_info": lap_info,
             "gps_data": gps_data,
-            "total_points": len(gps_data)
+            "total_points": len(gps_data),
+            "original_points": len(arrays['x']),
+            "track_length": round(track_index.length, 1) if track_index is not None else None
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in racing line: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1944,16 +2043,145 @@ async def get_racing_line(year: int, gp_round: int, session_type: str, driver: s
 # COPIER CE CODE À LA FIN DE backend/main.py
 # ============================================
 
+# 🔥 CATALOGUE DES VIRAGES - un par circuit/tracé, persisté (voir CornerCatalogueStore)
+
+def get_corner_catalogue(year: int, gp_round: int, session_type: str = 'Q', session=None) -> dict:
+    """
+    Retourne le catalogue des virages du tracé de ce Grand Prix.
+    Construit une seule fois à partir du meilleur tour de la session
+    (+ circuit_info FastF1 pour les numéros officiels), puis réutilisé.
+    """
+    layout_cache_key = f"corner_layout:{year}:{gp_round}"
+    layout = redis_cache.get(layout_cache_key)
+    if layout:
+        catalogue = corner_catalogue_store.get(layout)
+        if catalogue is not None:
+            return catalogue
+    
+    if session is None:
+        session = session_store.get(year, gp_round, session_type)
+    
+    reference_lap = session.laps.pick_fastest()
+    if reference_lap is None or pd.isna(reference_lap.get('LapTime')):
+        raise HTTPException(status_code=404, detail="No reference lap available for corner catalogue")
+    
+    arrays = telemetry_arrays(reference_lap.get_telemetry().add_distance())
+    if len(arrays['distance']) < 10:
+        raise HTTPException(status_code=404, detail="No telemetry data available")
+    
+    layout = corner_catalogue_store.layout_key(session.event['Location'], float(arrays['distance'].max()))
+    
+    def build():
+        try:
+            official = session.get_circuit_info().corners
+        except Exception as e:
+            print(f"⚠️ Circuit info unavailable: {e}")
+            official = None
+        
+        catalogue = build_corner_catalogue(arrays, official)
+        catalogue.update({
+            'circuit': str(session.event['Location']),
+            'reference': {
+                'year': year,
+                'round': gp_round,
+                'session': session_type,
+                'driver': str(reference_lap['Driver']),
+                'lapNumber': int(reference_lap['LapNumber'])
+            }
+        })
+        return catalogue
+    
+    catalogue = corner_catalogue_store.get_or_build(layout, build)
+    redis_cache.set(layout_cache_key, layout, ttl=redis_cache.get_ttl_by_session_status(year, gp_round, session_type))
+    return catalogue
+
+
+def get_track_index(year: int, gp_round: int, session_type: str = 'Q', session=None):
+    """KD-tree de la ligne de référence du circuit (partagé par tracé), None si indisponible"""
+    catalogue = get_corner_catalogue(year, gp_round, session_type, session)
+    return corner_catalogue_store.track_index(catalogue['layout'])
+
+
+@app.get("/api/corner-catalogue/{year}/{gp_round}")
+async def get_corner_catalogue_endpoint(year: int, gp_round: int, session_type: str = 'Q'):
+    """
+    📐 CATALOGUE DES VIRAGES - distances entrée/apex/sortie et noms canoniques du circuit
+    """
+    try:
+        log_request("/api/corner-catalogue", {"year": year, "gp_round": gp_round, "session_type": session_type})
+        
+        catalogue = await asyncio.to_thread(get_corner_catalogue, year, gp_round, session_type)
+        
+        log_success("/api/corner-catalogue")
+        return catalogue
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error("/api/corner-catalogue", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/corner-comparison/{year}/{gp_round}/{session_type}")
+async def get_corner_comparison(year: int, gp_round: int, session_type: str, lap_number: int = Query(None)):
+    """
+    🏎️ COMPARAISON VIRAGE PAR VIRAGE - tout le plateau (meilleur tour, ou le tour lap_number) :
+    vitesses d'entrée/mini/sortie, freinage, reprise des gaz et temps perdu par virage.
+    """
+    try:
+        log_request("/api/corner-comparison", {"year": year, "gp_round": gp_round, "session_type": session_type, "lap_number": lap_number})
+        
+        cache_key = f"corner_comparison:{year}:{gp_round}:{session_type.upper()}:{lap_number or 'fastest'}"
+        
+        async def compute():
+            session = await asyncio.to_thread(session_store.get, year, gp_round, session_type)
+            catalogue = await asyncio.to_thread(get_corner_catalogue, year, gp_round, session_type, session)
+            grid = await asyncio.to_thread(get_lap_grid, year, gp_round, session_type, lap_number, session)
+            
+            comparison = corner_comparison(grid, catalogue)
+            for row in comparison['drivers']:
+                row.update(grid['laps'][row['driver']])
+            
+            result = {
+                'year': year,
+                'round': gp_round,
+                'sessionType': session_type.upper(),
+                'lapNumber': lap_number,
+                'layout': catalogue.get('layout'),
+                **comparison
+            }
+            return result
+        
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, gp_round, session_type))
+        log_success("/api/corner-comparison")
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error("/api/corner-comparison", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/racing-line-analyzer")
-async def get_racing_line_analyzer(year: int, round: int, session: str, driver: str):
+async def get_racing_line_analyzer(
+    year: int,
+    round: int,
+    session: str,
+    driver: str,
+    tolerance: float = Query(DEFAULT_TOLERANCE, ge=0),
+    max_points: int = Query(DEFAULT_SPEED_POINTS, ge=0)
+):
     """
     Endpoint dédié pour Racing Line Analyzer
     """
     try:
         log_request("/racing-line-analyzer", {"year": year, "round": round, "session": session, "driver": driver})
         
-        session_obj = fastf1.get_session(year, round, session)
-        session_obj.load()
+        session_obj = await asyncio.to_thread(session_store.get, year, round, session)
         
         driver_laps = session_obj.laps.pick_drivers(driver)
         if driver_laps.empty:
@@ -1965,58 +2193,20 @@ async def get_racing_line_analyzer(year: int, round: int, session: str, driver:
         if telemetry.empty:
             raise HTTPException(status_code=404, detail="No telemetry data available")
         
-        gps_data = []
-        for idx, row in telemetry.iterrows():
-            if pd.notna(row['X']) and pd.notna(row['Y']) and pd.notna(row['Speed']):
-                gps_data.append({
-                    "x": float(row['X']),
-                    "y": float(row['Y']),
-                    "speed": float(row['Speed']),
-                    "distance": float(row['Distance']) if pd.notna(row['Distance']) else 0.0
-                })
+        # 🔥 Canaux en tableaux NumPy → virages du catalogue du circuit (mêmes virages pour tous les pilotes)
+        arrays = telemetry_arrays(telemetry)
         
-        corners = []
-        threshold = 15
-        corner_id = 1
-        i = 20
+        catalogue = await asyncio.to_thread(get_corner_catalogue, year, round, session, session_obj)
+        corners = slice_corners(catalogue, arrays) if catalogue['corners'] else detect_corners(arrays)
         
-        while i < len(gps_data) - 20:
-            prev_speed = gps_data[i - 10]['speed']
-            current_speed = gps_data[i]['speed']
-            next_speed = gps_data[i + 10]['speed']
-            
-            if prev_speed - current_speed > threshold and current_speed < prev_speed and current_speed < next_speed:
-                min_speed = current_speed
-                apex_idx = i
-                end_idx = i
-                
-                for j in range(i, min(i + 30, len(gps_data))):
-                    if gps_data[j]['speed'] < min_speed:
-                        min_speed = gps_data[j]['speed']
-                        apex_idx = j
-                    if gps_data[j]['speed'] > current_speed + threshold:
-                        end_idx = j
-                        break
-                
-                start_idx = max(0, i - 20)
-                end_idx = min(len(gps_data) - 1, end_idx + 20)
-                corner_data = gps_data[start_idx:end_idx]
-                avg_speed = sum(p['speed'] for p in corner_data) / len(corner_data) if corner_data else 0
-                
-                corners.append({
-                    "id": corner_id,
-                    "name": f"T{corner_id}",
-                    "startIdx": start_idx,
-                    "endIdx": end_idx,
-                    "apexIdx": apex_idx,
-                    "avgSpeed": avg_speed,
-                    "minSpeed": min_speed
-                })
-                
-                corner_id += 1
-                i = end_idx
-            else:
-                i += 1
+        # Décimation avant sérialisation : entrée/apex/sortie des virages toujours conservés
+        corner_points = [corner[key] for corner in corners for key in ('startIdx', 'apexIdx', 'endIdx')]
+        kept = decimate_indices(arrays['x'], arrays['y'], arrays['distance'], arrays['speed'], tolerance, max_points, protected=corner_points)
+        gps_data = gps_points(arrays, kept)
+        
+        for corner in corners:
+            for key in ('startIdx', 'apexIdx', 'endIdx'):
+                corner[key] = int(remap_indices(corner[key], kept))
         
         result = {
             "driver": driver,
@@ -2030,6 +2220,8 @@ async def get_racing_line_analyzer(year: int, round: int, session: str, driver:
         log_success("/racing-line-analyzer")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         log_error("/racing-line-analyzer", e)
         import traceback
@@ -2123,65 +2315,73 @@ async def get_qualifying_data(
     try:
         log_request("/api/studio/qualifying", {"year": year, "round": round})
         
-        # Charger la session de qualifications
-        session = fastf1.get_session(year, round, 'Q')
-        session.load()
+        # 🔥 Vérifier Redis cache
+        cache_key = f"studio_qualifying:{year}:{round}"
         
-        results = []
-        
-        # Pour chaque pilote, récupérer son meilleur temps
-        for driver_code in session.drivers:
-            try:
-                driver_info = session.get_driver(driver_code)
-                driver_laps = session.laps.pick_driver(driver_code)
-                
-                if driver_laps.empty:
-                    continue
-                
-                # Meilleur tour
-                fastest_lap = driver_laps.pick_fastest()
-                
-                if fastest_lap is None or fastest_lap.empty or pd.isna(fastest_lap['LapTime']):
+        async def compute():
+            # Charger la session de qualifications
+            session = session_store.get(year, round, 'Q')
+            
+            results = []
+            
+            # Pour chaque pilote, récupérer son meilleur temps
+            for driver_code in session.drivers:
+                try:
+                    driver_info = session.get_driver(driver_code)
+                    driver_laps = session.laps.pick_driver(driver_code)
+                    
+                    if driver_laps.empty:
+                        continue
+                    
+                    # Meilleur tour
+                    fastest_lap = driver_laps.pick_fastest()
+                    
+                    if fastest_lap is None or fastest_lap.empty or pd.isna(fastest_lap['LapTime']):
+                        continue
+                    
+                    best_time = float(fastest_lap['LapTime'].total_seconds())
+                    
+                    # ✅ CORRECTION : Utiliser Abbreviation au lieu de driver_code
+                    driver_abbreviation = str(driver_info['Abbreviation']) if 'Abbreviation' in driver_info else str(driver_code)
+                    
+                    results.append({
+                        "driver": f"{driver_info['FirstName']} {driver_info['LastName']}",
+                        "driverCode": driver_abbreviation,  # ✅ NOR, VER, etc.
+                        "team": str(driver_info['TeamName']),
+                        "time": best_time
+                    })
+                    
+                except Exception as e:
+                    print(f"⚠️ Error processing driver {driver_code}: {str(e)}")
                     continue
+            
+            # Trier par temps (du plus rapide au plus lent)
+            results.sort(key=lambda x: x['time'])
+            
+            # Attribuer les positions
+            for i, result in enumerate(results):
+                result['position'] = i + 1
                 
-                best_time = float(fastest_lap['LapTime'].total_seconds())
-                
-                # ✅ CORRECTION : Utiliser Abbreviation au lieu de driver_code
-                driver_abbreviation = str(driver_info['Abbreviation']) if 'Abbreviation' in driver_info else str(driver_code)
-                
-                results.append({
-                    "driver": f"{driver_info['FirstName']} {driver_info['LastName']}",
-                    "driverCode": driver_abbreviation,  # ✅ NOR, VER, etc.
-                    "team": str(driver_info['TeamName']),
-                    "time": best_time
-                })
-                
-            except Exception as e:
-                print(f"⚠️ Error processing driver {driver_code}: {str(e)}")
-                continue
-        
-        # Trier par temps (du plus rapide au plus lent)
-        results.sort(key=lambda x: x['time'])
-        
-        # Attribuer les positions
-        for i, result in enumerate(results):
-            result['position'] = i + 1
+                # Gap par rapport au pole
+                if i > 0:
+                    result['gap'] = result['time'] - results[0]['time']
+                else:
+                    result['gap'] = None
             
-            # Gap par rapport au pole
-            if i > 0:
-                result['gap'] = result['time'] - results[0]['time']
-            else:
-                result['gap'] = None
+            result = {
+                "year": year,
+                "round": round,
+                "raceName": session.event['EventName'],
+                "circuitName": session.event['Location'],
+                "results": results
+            }
+            return result
         
-        log_success("/api/studio/qualifying")
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, round, 'Q'))
         
-        return {
-            "year": year,
-            "round": round,
-            "raceName": session.event['EventName'],
-            "circuitName": session.event['Location'],
-            "results": results
-        }
+        log_success("/api/studio/qualifying")
+        return result
         
     except Exception as e:
         log_error("/api/studio/qualifying", e)
@@ -2190,118 +2390,125 @@ async def get_qualifying_data(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/studio/race-results")
-async def get_race_results(
+async def get_studio_race_results(
     year: int = Query(...),
     round: int = Query(...)
 ):
     try:
         log_request("/api/studio/race-results", {"year": year, "round": round})
         
-        # Charger la session de course
-        session = fastf1.get_session(year, round, 'R')
-        session.load()
-        
-        results = []
+        # 🔥 Vérifier Redis cache
+        cache_key = f"studio_race_results:{year}:{round}"
         
-        # Pour chaque pilote
-        for driver_code in session.drivers:
-            try:
-                driver_info = session.get_driver(driver_code)
-                driver_laps = session.laps.pick_driver(driver_code)
-                
-                if driver_laps.empty:
-                    continue
-                
-                # Position finale
-                last_lap = driver_laps.iloc[-1]
-                position = int(last_lap['Position']) if pd.notna(last_lap['Position']) else 99
-                
-                # Meilleur tour
-                fastest_lap = driver_laps.pick_fastest()
-                best_lap_time = None
-                if fastest_lap is not None and not fastest_lap.empty and pd.notna(fastest_lap['LapTime']):
-                    best_lap_time = float(fastest_lap['LapTime'].total_seconds())
-                
-                # Nombre de pit stops
-                pit_stops = len(driver_laps[driver_laps['PitInTime'].notna()])
-                
-                # Stratégie pneus (stints)
-                compounds = driver_laps['Compound'].dropna().unique().tolist()
-                tire_strategy = [str(c) for c in compounds if str(c) not in ['nan', 'None']]
-                
-                # Total des temps de tour (pour calculer le gap)
-                race_time = None
-                if len(driver_laps) > 0:
-                    # Somme de tous les temps de tour
-                    valid_times = driver_laps['LapTime'].dropna()
-                    if not valid_times.empty:
-                        race_time = float(valid_times.sum().total_seconds())
-                
-                # Nombre de tours complétés
-                total_laps = len(driver_laps)
-                
-                # Code pilote
-                driver_abbreviation = str(driver_info['Abbreviation']) if 'Abbreviation' in driver_info else str(driver_code)
-                
-                results.append({
-                    "position": position,
-                    "driver": f"{driver_info['FirstName']} {driver_info['LastName']}",
-                    "driverCode": driver_abbreviation,
-                    "team": str(driver_info['TeamName']),
-                    "bestLapTime": best_lap_time,
-                    "pitStops": pit_stops,
-                    "tireStrategy": tire_strategy,
-                    "totalLaps": total_laps,
-                    "raceTime": race_time,  # ✅ Temps total de course
-                })
-                
-            except Exception as e:
-                print(f"⚠️ Error processing driver {driver_code}: {str(e)}")
-                continue
-        
-        # Trier par position
-        results.sort(key=lambda x: x['position'])
-        
-        # ✅ CALCULER LES GAPS PAR RAPPORT AU VAINQUEUR
-        if results:
-            winner_laps = results[0]['totalLaps']
-            winner_time = results[0]['raceTime']
+        async def compute():
+            # Charger la session de course
+            session = session_store.get(year, round, 'R')
             
-            for i, result in enumerate(results):
-                if i == 0:
-                    # Le vainqueur n'a pas de gap
-                    result['gap'] = None
-                    result['gapType'] = 'winner'
-                    result['status'] = 'Finished'
-                else:
-                    laps_diff = winner_laps - result['totalLaps']
+            stints = get_stint_table(year, round, session)
+            results = []
+            
+            # Pour chaque pilote
+            for driver_code in session.drivers:
+                try:
+                    driver_info = session.get_driver(driver_code)
+                    driver_laps = session.laps.pick_driver(driver_code)
+                    
+                    if driver_laps.empty:
+                        continue
+                    
+                    # Position finale
+                    last_lap = driver_laps.iloc[-1]
+                    position = int(last_lap['Position']) if pd.notna(last_lap['Position']) else 99
+                    
+                    # Meilleur tour
+                    fastest_lap = driver_laps.pick_fastest()
+                    best_lap_time = None
+                    if fastest_lap is not None and not fastest_lap.empty and pd.notna(fastest_lap['LapTime']):
+                        best_lap_time = float(fastest_lap['LapTime'].total_seconds())
+                    
+                    # Nombre de pit stops + stratégie pneus (table des relais)
+                    driver_stints = stints[stints['Driver'] == str(driver_laps['Driver'].iloc[0])]
+                    pit_stops = int(driver_stints['PitInTime'].notna().sum())
+                    tire_strategy = list(dict.fromkeys(c for c in driver_stints['Compound'] if c != 'UNKNOWN'))
+                    
+                    # Total des temps de tour (pour calculer le gap)
+                    race_time = None
+                    if len(driver_laps) > 0:
+                        # Somme de tous les temps de tour
+                        valid_times = driver_laps['LapTime'].dropna()
+                        if not valid_times.empty:
+                            race_time = float(valid_times.sum().total_seconds())
+                    
+                    # Nombre de tours complétés
+                    total_laps = len(driver_laps)
                     
-                    if laps_diff > 0:
-                        # Pilote en retard de X tours
-                        result['gap'] = laps_diff
-                        result['gapType'] = 'laps'
-                        result['status'] = f"+{laps_diff} lap{'s' if laps_diff > 1 else ''}"
+                    # Code pilote
+                    driver_abbreviation = str(driver_info['Abbreviation']) if 'Abbreviation' in driver_info else str(driver_code)
+                    
+                    results.append({
+                        "position": position,
+                        "driver": f"{driver_info['FirstName']} {driver_info['LastName']}",
+                        "driverCode": driver_abbreviation,
+                        "team": str(driver_info['TeamName']),
+                        "bestLapTime": best_lap_time,
+                        "pitStops": pit_stops,
+                        "tireStrategy": tire_strategy,
+                        "totalLaps": total_laps,
+                        "raceTime": race_time,  # ✅ Temps total de course
+                    })
+                    
+                except Exception as e:
+                    print(f"⚠️ Error processing driver {driver_code}: {str(e)}")
+                    continue
+            
+            # Trier par position
+            results.sort(key=lambda x: x['position'])
+            
+            # ✅ CALCULER LES GAPS PAR RAPPORT AU VAINQUEUR
+            if results:
+                winner_laps = results[0]['totalLaps']
+                winner_time = results[0]['raceTime']
+                
+                for i, result in enumerate(results):
+                    if i == 0:
+                        # Le vainqueur n'a pas de gap
+                        result['gap'] = None
+                        result['gapType'] = 'winner'
+                        result['status'] = 'Finished'
                     else:
-                        # Même nombre de tours → calculer le gap en temps
-                        if result['raceTime'] and winner_time:
-                            time_gap = result['raceTime'] - winner_time
-                            result['gap'] = time_gap
-                            result['gapType'] = 'time'
-                            result['status'] = 'Finished'
+                        laps_diff = winner_laps - result['totalLaps']
+                        
+                        if laps_diff > 0:
+                            # Pilote en retard de X tours
+                            result['gap'] = laps_diff
+                            result['gapType'] = 'laps'
+                            result['status'] = f"+{laps_diff} lap{'s' if laps_diff > 1 else ''}"
                         else:
-                            result['gap'] = None
-                            result['gapType'] = 'unknown'
-                            result['status'] = 'Finished'
+                            # Même nombre de tours → calculer le gap en temps
+                            if result['raceTime'] and winner_time:
+                                time_gap = result['raceTime'] - winner_time
+                                result['gap'] = time_gap
+                                result['gapType'] = 'time'
+                                result['status'] = 'Finished'
+                            else:
+                                result['gap'] = None
+                                result['gapType'] = 'unknown'
+                                result['status'] = 'Finished'
+            
+            result = {
+                "year": year,
+                "round": round,
+                "raceName": session.event['EventName'],
+                "circuitName": session.event['Location'],
+                "results": results
+            }
+            return result
         
-        log_success("/api/studio/race-results")
+        # 🔥 Cache Redis : copie servie même périmée (recalcul en arrière-plan), calcul si absente
+        result = await response_cache.get_or_compute(cache_key, compute, ttl=partial(redis_cache.get_ttl_by_session_status, year, round, 'R'))
         
-        return {
-            "year": year,
-            "round": round,
-            "raceName": session.event['EventName'],
-            "circuitName": session.event['Location'],
-            "results": results
-        }
+        log_success("/api/studio/race-results")
+        return result
         
     except Exception as e:
         log_error("/api/studio/race-results", e)
@@ -2309,6 +2516,38 @@ async def get_race_results(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+
+async def build_driver_season(year: int, driver_id: str) -> dict:
+    """Document (saison, pilote) depuis le miroir local (courses et qualifs en parallèle)"""
+    races, qualifying = await asyncio.gather(
+        asyncio.to_thread(ergast_mirror.driver_races, year, driver_id),
+        asyncio.to_thread(ergast_mirror.driver_qualifying, year, driver_id),
+    )
+    return driver_season(races, qualifying)
+
+
+async def get_driver_seasons(year: int, driver_ids: list) -> list:
+    """
+    Documents (saison, pilote) de résultats, en cache Redis jusqu'à la prochaine course.
+    La clé inclut la dernière manche du miroir : une nouvelle manche synchronisée
+    invalide d'elle-même les documents de la saison.
+    
+    Lecture en un MGET, documents manquants construits puis écrits en un pipeline.
+    """
+    state = ergast_mirror.sync_state(year)
+    keys = [f"driver_season:{year}:{state['last_round'] if state else 0}:{driver_id}" for driver_id in driver_ids]
+    documents = await async_redis_cache.mget(keys)
+    
+    missing = [i for i, document in enumerate(documents) if not document]
+    if missing:
+        built = await asyncio.gather(*(build_driver_season(year, driver_ids[i]) for i in missing))
+        for i, document in zip(missing, built):
+            documents[i] = document
+        await async_redis_cache.set_many({keys[i]: documents[i] for i in missing}, ttl=redis_cache.get_ttl_by_session_status(year))
+    
+    return documents
+
+
 @app.get("/api/studio/head-to-head")
 async def get_head_to_head(
     year: int = Query(...),
@@ -2318,14 +2557,9 @@ async def get_head_to_head(
     try:
         log_request("/api/studio/head-to-head", {"year": year, "driver1": driver1, "driver2": driver2})
         
-        jolpica_base = "https://api.jolpi.ca/ergast/f1"
-        
-        print(f"\n🔍 Fetching data for {year} - {driver1} vs {driver2}")
-        
-        # ✅ ÉTAPE 1 : RÉCUPÉRER LE DRIVER ID DEPUIS LE CODE
-        drivers_response = requests.get(f"{jolpica_base}/{year}/drivers.json")
-        drivers_info = drivers_response.json()
-        drivers_list = drivers_info['MRData']['DriverTable']['Drivers']
+        # ✅ ÉTAPE 1 : RÉCUPÉRER LE DRIVER ID DEPUIS LE CODE (miroir local)
+        await ergast_mirror.ensure_season(year)
+        drivers_list = ergast_mirror.season_drivers(year)
         
         driver1_info = next((d for d in drivers_list if d['code'] == driver1), None)
         driver2_info = next((d for d in drivers_list if d['code'] == driver2), None)
@@ -2333,273 +2567,197 @@ async def get_head_to_head(
         if not driver1_info or not driver2_info:
             raise HTTPException(status_code=404, detail=f"Drivers {driver1} or {driver2} not found in {year}")
         
-        driver1_id = driver1_info['driverId']
-        driver2_id = driver2_info['driverId']
-        
-        print(f"✅ Driver IDs: {driver1} = {driver1_id}, {driver2} = {driver2_id}")
-        
-        # ✅ ÉTAPE 2 : UTILISER LES DRIVER IDs POUR LES REQUÊTES
-        
-        # Résultats de course pour driver1
-        driver1_races_url = f"{jolpica_base}/{year}/drivers/{driver1_id}/results.json?limit=100"
-        print(f"📡 Fetching {driver1} races: {driver1_races_url}")
-        driver1_races_response = requests.get(driver1_races_url)
-        driver1_races_data = driver1_races_response.json()
-        driver1_races = driver1_races_data['MRData']['RaceTable']['Races']
-        print(f"✅ Found {len(driver1_races)} races for {driver1}")
-        
-        # Résultats de course pour driver2
-        driver2_races_url = f"{jolpica_base}/{year}/drivers/{driver2_id}/results.json?limit=100"
-        print(f"📡 Fetching {driver2} races: {driver2_races_url}")
-        driver2_races_response = requests.get(driver2_races_url)
-        driver2_races_data = driver2_races_response.json()
-        driver2_races = driver2_races_data['MRData']['RaceTable']['Races']
-        print(f"✅ Found {len(driver2_races)} races for {driver2}")
-        
-        # Qualifications pour driver1
-        driver1_quali_url = f"{jolpica_base}/{year}/drivers/{driver1_id}/qualifying.json?limit=100"
-        print(f"📡 Fetching {driver1} qualifying: {driver1_quali_url}")
-        driver1_quali_response = requests.get(driver1_quali_url)
-        driver1_quali_data = driver1_quali_response.json()
-        driver1_quali_races = driver1_quali_data['MRData']['RaceTable']['Races']
-        print(f"✅ Found {len(driver1_quali_races)} qualifying sessions for {driver1}")
-        
-        # Qualifications pour driver2
-        driver2_quali_url = f"{jolpica_base}/{year}/drivers/{driver2_id}/qualifying.json?limit=100"
-        print(f"📡 Fetching {driver2} qualifying: {driver2_quali_url}")
-        driver2_quali_response = requests.get(driver2_quali_url)
-        driver2_quali_data = driver2_quali_response.json()
-        driver2_quali_races = driver2_quali_data['MRData']['RaceTable']['Races']
-        print(f"✅ Found {len(driver2_quali_races)} qualifying sessions for {driver2}")
-        
-        # Initialiser les stats
-        driver1_stats = {
-            'wins': 0,
-            'podiums': 0,
-            'poles': 0,
-            'points': 0,
-            'dnfs': 0,
-            'raceFinishes': [],
-            'qualiPositions': [],
-            'qualiWins': 0,
-            'raceWins': 0,
-            'fastestLaps': 0,
-        }
-        
-        driver2_stats = {
-            'wins': 0,
-            'podiums': 0,
-            'poles': 0,
-            'points': 0,
-            'dnfs': 0,
-            'raceFinishes': [],
-            'qualiPositions': [],
-            'qualiWins': 0,
-            'raceWins': 0,
-            'fastestLaps': 0,
-        }
-        
-        # Créer un dict pour mapper les rounds
-        driver2_results_by_round = {}
-        for race in driver2_races:
-            round_num = race['round']
-            if race['Results']:
-                driver2_results_by_round[round_num] = race['Results'][0]
-        
-        driver2_quali_by_round = {}
-        for quali_race in driver2_quali_races:
-            round_num = quali_race['round']
-            if quali_race['QualifyingResults']:
-                driver2_quali_by_round[round_num] = quali_race['QualifyingResults'][0]
-        
-        # Traiter les résultats de driver1
-        for race in driver1_races:
-            round_num = race['round']
-            race_name = race['raceName']
-            
-            if not race['Results']:
-                continue
-                
-            driver1_result = race['Results'][0]
-            position = int(driver1_result['position'])
-            points = float(driver1_result['points'])
-            status = driver1_result['status']
-            
-            print(f"\n🏁 Round {round_num}: {race_name}")
-            print(f"  {driver1}: P{position} - {points} pts - Status: {status}")
-            
-            driver1_stats['points'] += points
-            
-            if position == 1:
-                driver1_stats['wins'] += 1
-                print(f"    ✅ {driver1} WIN!")
-                
-            if position <= 3:
-                driver1_stats['podiums'] += 1
-                print(f"    🏆 {driver1} PODIUM!")
-            
-            # Fastest lap
-            if 'FastestLap' in driver1_result:
-                if 'rank' in driver1_result['FastestLap'] and driver1_result['FastestLap']['rank'] == '1':
-                    driver1_stats['fastestLaps'] += 1
-                    print(f"    ⚡ {driver1} FASTEST LAP!")
-            
-            # Vérifier si le pilote a fini
-            if any(keyword in status for keyword in ['Finished', 'Lap', '+']):
-                driver1_stats['raceFinishes'].append(position)
-            else:
-                driver1_stats['dnfs'] += 1
-                print(f"    ❌ {driver1} DNF: {status}")
-            
-            # Comparer avec driver2 pour ce round
-            if round_num in driver2_results_by_round:
-                driver2_result = driver2_results_by_round[round_num]
-                pos2 = int(driver2_result['position'])
-                status2 = driver2_result['status']
-                
-                print(f"  {driver2}: P{pos2} - {driver2_result['points']} pts - Status: {status2}")
-                
-                # H2H en course
-                if any(keyword in status for keyword in ['Finished', 'Lap', '+']) and \
-                   any(keyword in status2 for keyword in ['Finished', 'Lap', '+']):
-                    if position < pos2:
-                        driver1_stats['raceWins'] += 1
-                        print(f"    ⚔️ {driver1} beats {driver2} in race ({position} vs {pos2})")
-                    elif pos2 < position:
-                        driver2_stats['raceWins'] += 1
-                        print(f"    ⚔️ {driver2} beats {driver1} in race ({pos2} vs {position})")
-        
-        # Traiter les résultats de driver2
-        for race in driver2_races:
-            if not race['Results']:
-                continue
-                
-            driver2_result = race['Results'][0]
-            position = int(driver2_result['position'])
-            points = float(driver2_result['points'])
-            status = driver2_result['status']
-            
-            driver2_stats['points'] += points
-            
-            if position == 1:
-                driver2_stats['wins'] += 1
-                
-            if position <= 3:
-                driver2_stats['podiums'] += 1
-            
-            if 'FastestLap' in driver2_result:
-                if 'rank' in driver2_result['FastestLap'] and driver2_result['FastestLap']['rank'] == '1':
-                    driver2_stats['fastestLaps'] += 1
-            
-            if any(keyword in status for keyword in ['Finished', 'Lap', '+']):
-                driver2_stats['raceFinishes'].append(position)
-            else:
-                driver2_stats['dnfs'] += 1
-        
-        # Traiter les qualifications
-        print(f"\n🏎️ Processing qualifying sessions...")
-        
-        for quali_race in driver1_quali_races:
-            round_num = quali_race['round']
-            
-            if not quali_race['QualifyingResults']:
-                continue
-                
-            driver1_quali_result = quali_race['QualifyingResults'][0]
-            position = int(driver1_quali_result['position'])
-            
-            driver1_stats['qualiPositions'].append(position)
-            
-            if position == 1:
-                driver1_stats['poles'] += 1
-                print(f"  Round {round_num}: {driver1} POLE!")
-            
-            # Comparer avec driver2
-            if round_num in driver2_quali_by_round:
-                driver2_quali_result = driver2_quali_by_round[round_num]
-                pos2 = int(driver2_quali_result['position'])
-                
-                if position < pos2:
-                    driver1_stats['qualiWins'] += 1
-                else:
-                    driver2_stats['qualiWins'] += 1
-        
-        # Traiter les qualifs de driver2
-        for quali_race in driver2_quali_races:
-            if not quali_race['QualifyingResults']:
-                continue
-                
-            driver2_quali_result = quali_race['QualifyingResults'][0]
-            position = int(driver2_quali_result['position'])
-            
-            driver2_stats['qualiPositions'].append(position)
-            
-            if position == 1:
-                driver2_stats['poles'] += 1
-                print(f"  Round {quali_race['round']}: {driver2} POLE!")
-        
-        # Calculer moyennes
-        if driver1_stats['raceFinishes']:
-            driver1_stats['avgRacePosition'] = round(sum(driver1_stats['raceFinishes']) / len(driver1_stats['raceFinishes']), 1)
-        else:
-            driver1_stats['avgRacePosition'] = 20.0
-        
-        if driver2_stats['raceFinishes']:
-            driver2_stats['avgRacePosition'] = round(sum(driver2_stats['raceFinishes']) / len(driver2_stats['raceFinishes']), 1)
-        else:
-            driver2_stats['avgRacePosition'] = 20.0
-        
-        if driver1_stats['qualiPositions']:
-            driver1_stats['avgQualiPosition'] = round(sum(driver1_stats['qualiPositions']) / len(driver1_stats['qualiPositions']), 1)
-        else:
-            driver1_stats['avgQualiPosition'] = 20.0
-        
-        if driver2_stats['qualiPositions']:
-            driver2_stats['avgQualiPosition'] = round(sum(driver2_stats['qualiPositions']) / len(driver2_stats['qualiPositions']), 1)
-        else:
-            driver2_stats['avgQualiPosition'] = 20.0
-        
-        # Équipes
-        driver1_team = "Unknown"
-        driver2_team = "Unknown"
-        
-        if driver1_races and len(driver1_races) > 0:
-            last_race = driver1_races[-1]
-            if last_race['Results']:
-                driver1_team = last_race['Results'][0]['Constructor']['name']
-        
-        if driver2_races and len(driver2_races) > 0:
-            last_race = driver2_races[-1]
-            if last_race['Results']:
-                driver2_team = last_race['Results'][0]['Constructor']['name']
+        # ✅ ÉTAPE 2 : DOCUMENTS DES DEUX PILOTES (un MGET Redis, construits en parallèle si absents)
+        document1, document2 = await get_driver_seasons(year, [driver1_info['driverId'], driver2_info['driverId']])
         
-        # Log final
-        print(f"\n📊 FINAL STATS:")
-        print(f"{driver1}: {driver1_stats}")
-        print(f"{driver2}: {driver2_stats}")
+        # ✅ ÉTAPE 3 : STATS + DUELS
+        driver1_stats, driver2_stats = head_to_head(document1, document2)
         
         log_success("/api/studio/head-to-head")
         
         return {
             "year": year,
-            "totalRaces": len(driver1_races),
+            "totalRaces": len(document1['races']),
             "driver1": {
                 "code": driver1,
                 "name": f"{driver1_info['givenName']} {driver1_info['familyName']}",
-                "team": driver1_team,
+                "team": document1['team'],
                 "stats": driver1_stats,
             },
             "driver2": {
                 "code": driver2,
                 "name": f"{driver2_info['givenName']} {driver2_info['familyName']}",
-                "team": driver2_team,
+                "team": document2['team'],
                 "stats": driver2_stats,
             },
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         log_error("/api/studio/head-to-head", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
-        
\ No newline at end of file
+
+
+@app.get("/api/studio/teammate-matrix")
+async def get_teammate_matrix(
+    year: int = Query(...),
+    teammates_only: bool = Query(False)
+):
+    """
+    Tous les duels de la grille d'une saison en une réponse : stats individuelles
+    de chaque pilote + duels course/qualification pour chaque paire
+    (`teammates_only` : seulement les coéquipiers).
+    """
+    try:
+        log_request("/api/studio/teammate-matrix", {"year": year, "teammates_only": teammates_only})
+        
+        await ergast_mirror.ensure_season(year)
+        drivers_list = ergast_mirror.season_drivers(year)
+        if not drivers_list:
+            raise HTTPException(status_code=404, detail=f"No results for {year}")
+        
+        documents = await get_driver_seasons(year, [d['driverId'] for d in drivers_list])
+        by_driver = {d['driverId']: document for d, document in zip(drivers_list, documents)}
+        
+        drivers = [
+            {
+                "driverId": d['driverId'],
+                "code": d['code'],
+                "name": f"{d['givenName']} {d['familyName']}",
+                "team": document['team'],
+                "stats": season_stats(document),
+            }
+            for d, document in zip(drivers_list, documents)
+        ]
+        drivers.sort(key=lambda d: -d['stats']['points'])
+        
+        log_success("/api/studio/teammate-matrix")
+        
+        return {
+            "year": year,
+            "drivers": drivers,
+            "pairings": duel_matrix(by_driver, teammates_only),
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        log_error("/api/studio/teammate-matrix", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================
+# 🔄 PRÉCALCUL APRÈS CHAQUE SESSION
+# ============================================
+
+def build_precompute_steps(year: int, gp_round: int, session_type: str) -> list:
+    """
+    Étapes de précalcul d'une session terminée (voir PrecomputeScheduler).
+    La session est chargée une seule fois ici puis partagée via session_store.
+    """
+    try:
+        session = session_store.get(year, gp_round, session_type)
+    except Exception as e:
+        raise SessionNotReady(str(e))
+    
+    if session.laps is None or session.laps.empty:
+        session_store.discard(year, gp_round, session_type)
+        raise SessionNotReady("no laps published yet")
+    
+    laps = session.laps
+    drivers = [str(d) for d in laps['Driver'].dropna().unique()]
+    
+    # Top 10 au meilleur tour → toutes les paires de télémétrie
+    best_laps = laps.dropna(subset=['LapTime']).groupby('Driver')['LapTime'].min().sort_values()
+    top10 = [str(d) for d in best_laps.index[:10]]
+    
+    steps = []
+    for driver in drivers:
+        steps.append((f"laps {driver}", partial(get_session_laps, year, gp_round, session_type, driver)))
+    
+    for driver1, driver2 in combinations(top10, 2):
+        steps.append((
+            f"telemetry {driver1}-{driver2}",
+            partial(get_telemetry_comparison, year, gp_round, session_type, driver1, driver2, lap_number1=None, lap_number2=None)
+        ))
+    
+    steps.append(("corner comparison", partial(get_corner_comparison, year, gp_round, session_type, lap_number=None)))
+    steps.append(("sector stats", partial(get_sector_stats, year, gp_round, session_type)))
+    steps.append(("minisectors", partial(get_minisectors, year, gp_round, session_type, segments=DEFAULT_MINISECTORS)))
+    
+    if session_type == 'Q':
+        steps.append(("qualifying results", partial(get_qualifying_data, year=year, round=gp_round)))
+        steps.append(("results mirror", partial(ergast_mirror.sync_round, year, gp_round)))
+    
+    if session_type == 'R':
+        steps.append(("race bundle", partial(get_race_bundle, year, gp_round)))
+        steps.append(("race results", partial(get_studio_race_results, year=year, round=gp_round)))
+        steps.append(("results mirror", partial(ergast_mirror.sync_round, year, gp_round)))
+    
+    return steps
+
+
+precompute_scheduler = PrecomputeScheduler(build_precompute_steps)
+
+
+@app.on_event("startup")
+async def start_precompute_scheduler():
+    precompute_scheduler.start()
+    async_redis_cache.start_invalidation_listener()
+
+
+@app.on_event("shutdown")
+async def stop_precompute_scheduler():
+    await precompute_scheduler.stop()
+    await async_redis_cache.stop_invalidation_listener()
+    await response_cache.aclose()
+    await http_client.aclose()
+    await async_redis_cache.aclose()
+
+
+@app.get("/api/precompute/status")
+async def get_precompute_status():
+    """Progression du précalcul (sessions traitées, étapes, erreurs)"""
+    return precompute_scheduler.status()
+
+
+@app.get("/api/http/status")
+async def get_http_status():
+    """Métriques du client HTTP partagé (requêtes, retries, échecs, latence par hôte) et du cache upstream"""
+    return {**http_client.status(), 'upstreamCache': upstream_cache.status()}
+
+
+@app.post("/api/ergast-mirror/{year}/sync")
+async def sync_ergast_mirror(year: int, x_admin_key: str = Header(None)):
+    """Resynchronisation complète d'une saison du miroir local Jolpica (admin : en-tête X-Admin-Key)"""
+    admin_key = os.getenv('ERGAST_MIRROR_ADMIN_KEY')
+    if not admin_key:
+        raise HTTPException(status_code=403, detail="Mirror sync disabled (ERGAST_MIRROR_ADMIN_KEY not set)")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, admin_key):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+    
+    try:
+        last_round = await ergast_mirror.resync_season(year)
+        return {'year': year, 'lastRound': last_round}
+    except Exception as e:
+        log_error("/api/ergast-mirror/sync", e)
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/ergast-mirror/status")
+async def get_ergast_mirror_status():
+    """Saisons présentes dans le miroir local et date de dernière synchro"""
+    return ergast_mirror.status()
+
+
+@app.get("/api/cache/status")
+async def get_cache_status():
+    """État du cache (coupe-circuit Redis, hits local / Redis, niveau local par namespace, stale-while-revalidate)"""
+    return {**async_redis_cache.status(), 'responseCache': response_cache.status()}
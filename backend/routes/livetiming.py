@@ -8,6 +8,8 @@ from fastapi import APIRouter, HTTPException
 import httpx
 import logging
 
+from app.utils.services.http_client import http_client
+
 router = APIRouter(prefix="/api/livetiming", tags=["livetiming"])
 logger = logging.getLogger(__name__)
 
@@ -31,14 +33,10 @@ async def negotiate_f1_connection():
         
         logger.info(f"🔄 Negotiating F1 SignalR connection...")
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✅ F1 negotiation successful: {data.get('ConnectionId')}")
-            
-            return data
+        data = await http_client.get_json(url, params=params, timeout=30.0)
+        logger.info(f"✅ F1 negotiation successful: {data.get('ConnectionId')}")
+        
+        return data
             
     except httpx.HTTPError as e:
         logger.error(f"❌ F1 negotiation failed: {e}")
@@ -54,12 +52,11 @@ async def check_f1_status():
     Check if F1 Live Timing API is available
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{F1_BASE_URL}/negotiate")
-            return {
-                "status": "online" if response.status_code == 200 else "offline",
-                "status_code": response.status_code
-            }
+        response = await http_client.request("GET", f"{F1_BASE_URL}/negotiate", retries=0, timeout=10.0)
+        return {
+            "status": "online" if response.status_code == 200 else "offline",
+            "status_code": response.status_code
+        }
     except Exception as e:
         return {
             "status": "offline",
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.services.cache_codec import COMPRESSORS, CacheCodec, _id
+
+
+@pytest.mark.skipif(_id(COMPRESSORS, 'zstd') is None, reason="zstandard not installed")
+def test_zstd_round_trip_from_many_threads():
+    codec = CacheCodec('json', 'zstd', threshold=0)
+    payloads = [{'round': i, 'distance': list(range(i * 50, i * 50 + 5000))} for i in range(32)]
+
+    def round_trip(payload):
+        return all(codec.decode(codec.encode(payload)) == payload for _ in range(20))
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        assert all(executor.map(round_trip, payloads))
+
+
+def test_legacy_json_text_still_decodes():
+    codec = CacheCodec()
+    assert codec.decode('{"points": 25}') == codec.decode(b'{"points": 25}') == {'points': 25}
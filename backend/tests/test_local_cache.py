@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.utils.services.local_cache import LocalCache
+from app.utils.services.redis_cache import AsyncRedisCache
+
+
+@pytest.fixture
+def workers():
+    """Deux "workers" (AsyncRedisCache + niveau local) partageant un même Redis fakeredis"""
+    server = fakeredis.FakeServer()
+    pair = []
+    for _ in range(2):
+        worker = AsyncRedisCache(url="redis://fake", local=LocalCache(ttl=60))
+        worker._new_client = lambda **options: fakeredis.FakeAsyncRedis(server=server)
+        pair.append(worker)
+    return pair
+
+
+def run(workers, scenario):
+    async def main():
+        for worker in workers:
+            worker.start_invalidation_listener()
+        try:
+            await until(lambda: all(worker.status()['listening'] for worker in workers))
+            await asyncio.sleep(0.1)
+            await scenario(*workers)
+        finally:
+            for worker in workers:
+                await worker.stop_invalidation_listener()
+                await worker.aclose()
+
+    asyncio.run(main())
+
+
+async def until(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.05)
+
+
+def test_lru_eviction_is_bounded_per_namespace():
+    cache = LocalCache(limits={'laps': 10_000, 'drivers': 10_000}, ttl=60)
+    for i in range(10):
+        cache.put(f"laps:{i}", b"x" * 3000)
+    cache.put("drivers:2024", b"x" * 3000)
+    cache.put("races:2024", b"x" * 3000)
+
+    namespaces = cache.status()['namespaces']
+    assert namespaces['laps']['entries'] == 3
+    assert namespaces['laps']['evictions'] == 7
+    assert namespaces['laps']['bytes'] <= namespaces['laps']['limitBytes']
+    # Le budget d'un namespace n'affecte pas les autres ; les namespaces non configurés ne sont pas gardés
+    assert namespaces['drivers']['entries'] == 1 and namespaces['drivers']['evictions'] == 0
+    assert 'races' not in namespaces and not cache.tracks("races:2024")
+
+    # LRU : une lecture protège l'entrée de la prochaine éviction
+    assert cache.get("laps:7", bytes) == b"x" * 3000
+    cache.put("laps:10", b"x" * 3000)
+    assert cache.get("laps:7", bytes) is not None
+    assert cache.get("laps:8", bytes) is None
+
+
+def test_entry_larger_than_budget_is_not_kept():
+    cache = LocalCache(limits={'telemetry': 1000}, ttl=60)
+    cache.put("telemetry:big", b"x" * 5000)
+    assert cache.status()['namespaces']['telemetry']['entries'] == 0
+
+
+def test_hit_rate_metrics(workers):
+    async def scenario(a, b):
+        telemetry = {'driver1': {'speed': [float(v % 330) for v in range(20000)]}}
+        await a.set("telemetry:test:1", telemetry)
+
+        # Premier accès de b : Redis ; suivants : niveau local (sans aller-retour)
+        assert await b.get("telemetry:test:1") == telemetry
+        for _ in range(9):
+            assert await b.get("telemetry:test:1") == telemetry
+        assert b.metrics['redisHits'] == 1 and b.metrics['localHits'] == 9
+
+        assert await b.get("telemetry:missing") is None
+        namespace = b.local.status()['namespaces']['telemetry']
+        assert namespace['hits'] == 9 and namespace['misses'] == 2
+        assert namespace['hitRate'] == round(9 / 11, 4)
+
+    run(workers, scenario)
+
+
+def test_write_on_one_worker_invalidates_the_other(workers):
+    async def scenario(a, b):
+        await a.set("grands_prix:test", {'grandsPrix': [1, 2, 3]})
+        assert await b.get("grands_prix:test") == {'grandsPrix': [1, 2, 3]}
+
+        # Écriture sur a → b invalide sa copie locale et relit la nouvelle valeur
+        await a.set("grands_prix:test", {'grandsPrix': [4]})
+        await until(lambda: b.local.status()['namespaces']['grands_prix']['invalidations'] == 1)
+        assert await b.get("grands_prix:test") == {'grandsPrix': [4]}
+        # a ignore ses propres messages
+        assert a.local.status()['namespaces']['grands_prix']['invalidations'] == 0
+
+        await a.delete_pattern("grands_prix:*")
+        await until(lambda: b.local.status()['namespaces']['grands_prix']['invalidations'] == 2)
+        assert await b.get("grands_prix:test") is None
+        assert b.metrics['invalidationsReceived'] >= 2
+
+    run(workers, scenario)
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.utils.services.http_client import HttpClient
+from app.utils.services.upstream_cache import UpstreamCache
+
+
+class Stub:
+    """État du faux serveur Jolpica : version servie, mode (ok / slow / down), compteurs"""
+
+    def __init__(self):
+        self.version = 1
+        self.mode = 'ok'
+        self.hits = 0
+        self.not_modified = 0
+
+
+@pytest.fixture
+def stub():
+    state = Stub()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state.hits += 1
+            if state.mode == 'down':
+                self.send_response(503)
+                self.end_headers()
+                return
+            if state.mode == 'slow':
+                time.sleep(1.0)
+
+            etag = f'"v{state.version}"'
+            if self.headers.get('If-None-Match') == etag:
+                state.not_modified += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            payload = json.dumps({'version': state.version}).encode()
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.url = f"http://127.0.0.1:{server.server_port}/2024/driverStandings.json"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def run(scenario):
+    """Exécute scenario(upstream) dans une event loop, avec un client HTTP sans retry"""
+    async def main():
+        client = HttpClient(retries=0, timeout=2)
+        upstream = UpstreamCache(client=client, cache=None, max_age=0, max_stale=3600)
+        upstream.revalidate_timeout = 0.3
+        try:
+            return await scenario(upstream)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_unchanged_copy_is_revalidated_with_304(stub):
+    async def scenario(upstream):
+        assert await upstream.get_json(stub.url) == {'version': 1}
+        assert await upstream.get_json(stub.url, stale_while_revalidate=False) == {'version': 1}
+        return upstream.status()
+
+    status = run(scenario)
+    assert stub.not_modified == 1
+    assert status['revalidated'] == 1 and status['modified'] == 0
+
+
+def test_fresh_copy_is_served_without_request(stub):
+    async def scenario(upstream):
+        await upstream.get_json(stub.url)
+        return await upstream.get_json(stub.url, max_age=60)
+
+    assert run(scenario) == {'version': 1}
+    assert stub.hits == 1
+
+
+def test_stale_while_revalidate_serves_old_copy_then_new(stub):
+    async def scenario(upstream):
+        await upstream.get_json(stub.url)
+        stub.version = 2
+        stale = await upstream.get_json(stub.url)
+        await asyncio.gather(*upstream._refreshing.values())
+        return stale, await upstream.get_json(stub.url, max_age=60)
+
+    assert run(scenario) == ({'version': 1}, {'version': 2})
+
+
+@pytest.mark.parametrize('mode', ['slow', 'down'])
+def test_stale_copy_served_when_upstream_fails(stub, mode):
+    async def scenario(upstream):
+        await upstream.get_json(stub.url)
+        stub.mode = mode
+        start = time.perf_counter()
+        body = await upstream.get_json(stub.url, stale_while_revalidate=False)
+        return body, time.perf_counter() - start, upstream.status()
+
+    body, elapsed, status = run(scenario)
+    assert body == {'version': 1}
+    assert elapsed < 0.9, "revalidation must time out before the slow upstream answers"
+    assert status['failOpen'] == 1
+
+
+def test_error_raised_without_copy(stub):
+    stub.mode = 'down'
+
+    async def scenario(upstream):
+        await upstream.get_json(stub.url)
+
+    with pytest.raises(Exception):
+        run(scenario)